@@ -0,0 +1,164 @@
+"""
+Dependency-light model artifacts.
+
+Training exports each model next to its pickle in a form that only needs
+NumPy to evaluate:
+
+- match_outcome.json: logistic regression coefficients and intercept
+  (match_online.json: the same for the online model)
+- player_kills.npz: the random forest flattened into node arrays
+  (feature, threshold, left, right, value, one root per tree), evaluated
+  by walking every tree for every row at once
+
+Loaders are cached by file mtime, so a retrain is picked up on the next
+call and an unchanged file is parsed once per process.
+"""
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+MATCH_ARTIFACT = 'match_outcome.json'
+KILLS_ARTIFACT = 'player_kills.npz'
+# Incrementally updated match model (see online)
+ONLINE_ARTIFACT = 'match_online.json'
+
+# path -> (mtime, loaded artifact)
+_CACHE: Dict[str, Tuple[float, object]] = {}
+
+
+class LogisticArtifact:
+    """Binary logistic model; predict_proba matches sklearn's LogisticRegression."""
+
+    def __init__(self, coef: Sequence[float], intercept: float, features: List[str]):
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+        self.features = list(features)
+        self.n_features_in_ = len(self.coef)
+
+    def predict_proba(self, X) -> np.ndarray:
+        z = np.asarray(X, dtype=float) @ self.coef + self.intercept
+        p = 1.0 / (1.0 + np.exp(-z))
+        return np.column_stack([1.0 - p, p])
+
+
+class ForestArtifact:
+    """Regression forest as flat node arrays; predict matches sklearn's RandomForestRegressor."""
+
+    def __init__(self, feature, threshold, left, right, value, roots, features: List[str]):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=float)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.value = np.asarray(value, dtype=float)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.features = list(features)
+        self.n_features_in_ = len(self.features)
+        self.is_leaf = self.left < 0
+        # (node, go_right) -> next node; leaves are never followed
+        self.children = np.column_stack([self.left, self.right])
+
+    def predict(self, X) -> np.ndarray:
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(float)
+        n_rows, n_trees = len(X), len(self.roots)
+        flat_x = X.ravel()
+        node = np.tile(self.roots, n_rows)
+        base = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        # Walk only the (row, tree) pairs that haven't reached a leaf yet
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            current = node[active]
+            go_right = flat_x[base[active] + self.feature[current]] > self.threshold[current]
+            current = self.children[current, go_right.view(np.int8)]
+            node[active] = current
+            active = active[~self.is_leaf[current]]
+        return self.value[node].reshape(n_rows, n_trees).mean(axis=1)
+
+
+def export_logistic(model, path: str, features: List[str], scaler=None) -> None:
+    """
+    Write a fitted binary LogisticRegression / SGDClassifier as JSON.
+
+    Args:
+        model: Fitted classifier (coef_, intercept_)
+        path: Output .json path
+        features: Feature names, in column order
+        scaler: StandardScaler the model was fitted behind; folded into the
+                coefficients so the artifact takes raw features
+    """
+    coef = model.coef_.ravel().astype(float)
+    intercept = float(np.ravel(model.intercept_)[0])
+    if scaler is not None:
+        coef = coef / scaler.scale_
+        intercept -= float(np.dot(coef, scaler.mean_))
+    with open(path, 'w') as f:
+        json.dump({
+            'type': 'logistic',
+            'features': list(features),
+            'coef': [float(c) for c in coef],
+            'intercept': intercept,
+        }, f, indent=2)
+
+
+def export_forest(model, path: str, features: List[str]) -> None:
+    """Flatten a fitted RandomForestRegressor into a .npz of node arrays."""
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset = 0
+    for est in model.estimators_:
+        tree = est.tree_
+        leaf = tree.children_left < 0
+        roots.append(offset)
+        feature.append(tree.feature)
+        threshold.append(tree.threshold)
+        # Children become global node indices; leaves keep -1
+        left.append(np.where(leaf, -1, tree.children_left + offset))
+        right.append(np.where(leaf, -1, tree.children_right + offset))
+        value.append(tree.value[:, 0, 0])
+        offset += tree.node_count
+    np.savez_compressed(
+        path,
+        feature=np.concatenate(feature).astype(np.int32),
+        threshold=np.concatenate(threshold),
+        left=np.concatenate(left).astype(np.int32),
+        right=np.concatenate(right).astype(np.int32),
+        value=np.concatenate(value),
+        roots=np.asarray(roots, dtype=np.int32),
+        features=np.asarray(features),
+    )
+
+
+def _load(path: str):
+    if path.endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        return LogisticArtifact(data['coef'], data['intercept'], data['features'])
+    with np.load(path) as data:
+        return ForestArtifact(
+            data['feature'], data['threshold'], data['left'], data['right'], data['value'], data['roots'],
+            [str(f) for f in data['features']],
+        )
+
+
+def load_artifact(path: str) -> Optional[object]:
+    """
+    Load an exported model, reusing the parsed copy while the file's mtime is unchanged.
+
+    Args:
+        path: Path to a .json (logistic) or .npz (forest) artifact
+
+    Returns:
+        LogisticArtifact / ForestArtifact, or None if the file doesn't exist
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        _CACHE.pop(path, None)
+        return None
+    cached = _CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, _load(path))
+        _CACHE[path] = cached
+    return cached[1]
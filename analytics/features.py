@@ -0,0 +1,315 @@
+import hashlib
+import os
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DB_PATH = 'valorant_esports.db'
+CACHE_DIR = os.path.join('models', 'cache')
+
+# Bump when the feature definitions change so cached frames are rebuilt
+FEATURES_VERSION = 1
+
+# Matches used for rolling form features
+FORM_WINDOW = 5
+
+START_ELO = 1500.0
+
+MATCH_FEATURES = [
+    'elo_a_pre', 'elo_b_pre', 'elo_diff',
+    'win_form_a', 'win_form_b',
+    'map_diff_form_a', 'map_diff_form_b',
+    'round_diff_form_a', 'round_diff_form_b',
+]
+MATCH_TARGET = 'team_a_win'
+
+PLAYER_FEATURES = [
+    'player_elo_pre', 'maps',
+    'kills_form', 'deaths_form', 'acs_form', 'rating_form',
+    'team_elo_pre', 'opp_elo_pre',
+]
+PLAYER_TARGET = 'kills'
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(db_path)
+
+
+def _has_table(con: sqlite3.Connection, name: str) -> bool:
+    return con.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def data_version(con: sqlite3.Connection) -> str:
+    """
+    Short key identifying the data the feature frames are built from.
+
+    Combines the ChangeLog sequence (moves on every scraped insert, update or
+    delete) with a checksum of the published Elo history (moves when Elo is
+    recomputed, e.g. after a config change). Databases without a ChangeLog
+    fall back to the file's modification time.
+
+    Args:
+        con: Database connection
+
+    Returns:
+        Hex digest; equal digests mean the same input data
+    """
+    if _has_table(con, 'ChangeLog'):
+        row = con.execute("SELECT seq FROM sqlite_sequence WHERE name = 'ChangeLog'").fetchone()
+        data = f"seq={row[0] if row else 0}"
+    else:
+        path = con.execute("PRAGMA database_list").fetchone()[2]
+        data = f"mtime={os.path.getmtime(path) if path else 0}"
+    elo = con.execute("SELECT COUNT(*), TOTAL(post_rating) FROM Elo_History_Fact").fetchone()
+    player_elo = con.execute("SELECT COUNT(*), TOTAL(post_rating) FROM Player_Elo_History_Fact").fetchone()
+    key = f"v{FEATURES_VERSION}:w{FORM_WINDOW}:{data}:elo={elo[0]},{elo[1]:.6f}:pelo={player_elo[0]},{player_elo[1]:.6f}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _rolling_prev(df: pd.DataFrame, key: str, cols: Iterable[str], window: int = FORM_WINDOW) -> pd.DataFrame:
+    """
+    Mean of each column over the previous `window` rows of the same key (current row excluded).
+
+    df must already be in chronological order. Rows without history get NaN.
+    """
+    cols = list(cols)
+    prev = df.groupby(key, sort=False)[cols].shift(1)
+    prev[key] = df[key]
+    rolled = prev.groupby(key, sort=False)[cols].rolling(window, min_periods=1).mean()
+    return rolled.reset_index(level=0, drop=True).reindex(df.index)
+
+
+def _fill_pre_ratings(df: pd.DataFrame, key: str) -> pd.Series:
+    """
+    Pre-match rating per row: the history's pre_rating, else the key's last
+    post_rating, else START_ELO (matches the Elo replay skipped, e.g. showmatches).
+    """
+    last_post = df.groupby(key, sort=False)['post_rating'].transform(lambda s: s.ffill().shift(1))
+    return df['pre_rating'].fillna(last_post).fillna(START_ELO)
+
+
+def _load_matches(con: sqlite3.Connection) -> pd.DataFrame:
+    matches = pd.read_sql(
+        """
+        SELECT m.match_id, m.match_epoch, m.season, m.tournament,
+               m.team_a, m.team_b, m.team_a_key, m.team_b_key,
+               m.team_a_score, m.team_b_score,
+               mp.rounds_a, mp.rounds_b, mp.n_maps
+        FROM Matches m
+        LEFT JOIN (
+            SELECT match_id, SUM(team_a_score) AS rounds_a, SUM(team_b_score) AS rounds_b, COUNT(*) AS n_maps
+            FROM Maps
+            GROUP BY match_id
+        ) mp ON mp.match_id = m.match_id
+        WHERE m.team_a_key IS NOT NULL AND m.team_b_key IS NOT NULL
+          AND m.team_a_score IS NOT NULL AND m.team_b_score IS NOT NULL
+          AND m.team_a_score != m.team_b_score
+        ORDER BY m.match_epoch IS NULL, m.match_epoch / 86400, m.match_id
+        """,
+        con,
+    )
+    matches['order'] = np.arange(len(matches))
+    return matches
+
+
+def _team_frame(con: sqlite3.Connection, matches: pd.DataFrame) -> pd.DataFrame:
+    """One row per (match, side) in match order, with pre-match Elo and rolling form."""
+    sides = []
+    for side, opp in (('a', 'b'), ('b', 'a')):
+        sides.append(pd.DataFrame({
+            'match_id': matches['match_id'],
+            'order': matches['order'],
+            'side': side,
+            'team_key': matches[f'team_{side}_key'],
+            'opp_key': matches[f'team_{opp}_key'],
+            'win': (matches[f'team_{side}_score'] > matches[f'team_{opp}_score']).astype(float),
+            'map_diff': (matches[f'team_{side}_score'] - matches[f'team_{opp}_score']).astype(float),
+            'round_diff': (matches[f'rounds_{side}'] - matches[f'rounds_{opp}']) / matches['n_maps'],
+        }))
+    teams = pd.concat(sides, ignore_index=True).sort_values(['order', 'side'], kind='stable', ignore_index=True)
+
+    history = pd.read_sql("SELECT match_id, team_key, pre_rating, post_rating FROM Elo_History", con)
+    history = history.drop_duplicates(['match_id', 'team_key'])
+    teams = teams.merge(history, on=['match_id', 'team_key'], how='left')
+    teams['elo_pre'] = _fill_pre_ratings(teams, 'team_key')
+
+    form = _rolling_prev(teams, 'team_key', ['win', 'map_diff', 'round_diff'])
+    teams['win_form'] = form['win'].fillna(0.5)
+    teams['map_diff_form'] = form['map_diff'].fillna(0.0)
+    teams['round_diff_form'] = form['round_diff'].fillna(0.0)
+    return teams
+
+
+def _match_frame(matches: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
+    cols = ['match_id', 'elo_pre', 'win_form', 'map_diff_form', 'round_diff_form']
+    df = matches[['match_id', 'match_epoch', 'season', 'tournament', 'team_a', 'team_b', 'team_a_key', 'team_b_key']]
+    for side in ('a', 'b'):
+        part = teams.loc[teams['side'] == side, cols]
+        df = df.merge(part.rename(columns={c: f'{c}_{side}' for c in cols[1:]}), on='match_id', how='left')
+    df = df.rename(columns={'elo_pre_a': 'elo_a_pre', 'elo_pre_b': 'elo_b_pre'})
+    df['elo_diff'] = df['elo_a_pre'] - df['elo_b_pre']
+    df[MATCH_TARGET] = (matches['team_a_score'].values > matches['team_b_score'].values).astype(int)
+    return df
+
+
+def _player_frame(con: sqlite3.Connection, matches: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
+    """One row per (match, player): match totals, pre-match Elo and rolling per-map form."""
+    players = pd.read_sql(
+        """
+        SELECT match_id, player_id, MIN(player) AS player, MIN(team_key) AS team_key,
+               SUM(kills) AS kills, SUM(deaths) AS deaths, SUM(assists) AS assists,
+               AVG(acs) AS acs, AVG(rating) AS rating,
+               SUM(first_kills) AS first_kills, SUM(first_deaths) AS first_deaths,
+               COUNT(*) AS maps
+        FROM Player_Stats
+        WHERE player_id IS NOT NULL
+        GROUP BY match_id, player_id
+        """,
+        con,
+    )
+    players = players.merge(matches[['match_id', 'order', 'match_epoch']], on='match_id')
+    players = players.sort_values(['order', 'player_id'], kind='stable', ignore_index=True)
+
+    history = pd.read_sql("SELECT match_id, player_id, pre_rating, post_rating FROM Player_Elo_History_Fact", con)
+    history = history.drop_duplicates(['match_id', 'player_id'])
+    players = players.merge(history, on=['match_id', 'player_id'], how='left')
+    players['player_elo_pre'] = _fill_pre_ratings(players, 'player_id')
+
+    side = teams[['match_id', 'team_key', 'opp_key', 'elo_pre']].drop_duplicates(['match_id', 'team_key'])
+    players = players.merge(side.rename(columns={'elo_pre': 'team_elo_pre'}), on=['match_id', 'team_key'], how='left')
+    opp = side[['match_id', 'team_key', 'elo_pre']].rename(columns={'team_key': 'opp_key', 'elo_pre': 'opp_elo_pre'})
+    players = players.merge(opp, on=['match_id', 'opp_key'], how='left')
+    players[['team_elo_pre', 'opp_elo_pre']] = players[['team_elo_pre', 'opp_elo_pre']].fillna(START_ELO)
+
+    per_map = pd.DataFrame({
+        'player_id': players['player_id'],
+        'kills': players['kills'] / players['maps'],
+        'deaths': players['deaths'] / players['maps'],
+        'acs': players['acs'],
+        'rating': players['rating'],
+    })
+    form = _rolling_prev(per_map, 'player_id', ['kills', 'deaths', 'acs', 'rating'])
+    for col in ('kills', 'deaths', 'acs', 'rating'):
+        players[f'{col}_form'] = form[col].fillna(per_map[col].mean())
+    return players
+
+
+_parquet_warned = False
+
+
+def _cache_path(name: str, version: str) -> str:
+    return os.path.join(CACHE_DIR, f'{name}-{version}.parquet')
+
+
+def _read_cache(version: str) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    paths = [_cache_path(name, version) for name in ('match_features', 'player_features')]
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    try:
+        return pd.read_parquet(paths[0]), pd.read_parquet(paths[1])
+    except ImportError:
+        return None
+
+
+def _write_cache(version: str, frames: Tuple[pd.DataFrame, pd.DataFrame]) -> None:
+    """Store the frames as Parquet and drop other versions; skipped without a Parquet engine."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        for name, frame in zip(('match_features', 'player_features'), frames):
+            frame.to_parquet(_cache_path(name, version), index=False)
+    except ImportError:
+        global _parquet_warned
+        if not _parquet_warned:
+            print("Feature cache disabled (install pyarrow to cache feature frames as Parquet)")
+            _parquet_warned = True
+        return
+    for fname in os.listdir(CACHE_DIR):
+        if fname.endswith('.parquet') and not fname.endswith(f'-{version}.parquet'):
+            os.remove(os.path.join(CACHE_DIR, fname))
+
+
+def build_datasets(db_path: str = DB_PATH, use_cache: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build the match-outcome and player-kills training frames.
+
+    Loads Matches, Maps, Player_Stats and the published Elo history with a few
+    bulk queries; pre-match ratings come from Elo_History /
+    Player_Elo_History_Fact and form features are rolling means over each
+    team's / player's previous FORM_WINDOW matches. Frames are cached as
+    Parquet under CACHE_DIR keyed by data_version(), so an unchanged database
+    is loaded from disk.
+
+    Args:
+        db_path: Path to database file
+        use_cache: Read and write the Parquet cache (needs pyarrow)
+
+    Returns:
+        Tuple of (match_df, player_df), chronological; MATCH_FEATURES /
+        MATCH_TARGET and PLAYER_FEATURES / PLAYER_TARGET name the model columns
+    """
+    con = _connect(db_path)
+    try:
+        version = data_version(con)
+        if use_cache:
+            cached = _read_cache(version)
+            if cached is not None:
+                return cached
+        matches = _load_matches(con)
+        teams = _team_frame(con, matches)
+        frames = (_match_frame(matches, teams), _player_frame(con, matches, teams))
+    finally:
+        con.close()
+    if use_cache:
+        _write_cache(version, frames)
+    return frames
+
+
+def current_state(db_path: str = DB_PATH) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Every team's and player's features as of now (what their next match would see).
+
+    Args:
+        db_path: Path to database file
+
+    Returns:
+        Tuple of (teams, players):
+          - teams indexed by team_key: team, elo, win_form, map_diff_form, round_diff_form
+          - players indexed by player name: player_id, team_key, elo, kills_form,
+            deaths_form, acs_form, rating_form
+    """
+    con = _connect(db_path)
+    try:
+        matches = _load_matches(con)
+        teams = _team_frame(con, matches)
+        players = _player_frame(con, matches, teams)
+    finally:
+        con.close()
+
+    names = pd.concat([
+        matches[['order', 'team_a_key', 'team_a']].set_axis(['order', 'team_key', 'team'], axis=1),
+        matches[['order', 'team_b_key', 'team_b']].set_axis(['order', 'team_key', 'team'], axis=1),
+    ]).sort_values('order', kind='stable').groupby('team_key')['team'].last()
+    teams['elo'] = teams['post_rating'].fillna(teams['elo_pre'])
+    recent = teams.groupby('team_key', sort=False).tail(FORM_WINDOW)
+    team_state = recent.groupby('team_key')[['win', 'map_diff', 'round_diff']].mean().add_suffix('_form')
+    team_state['round_diff_form'] = team_state['round_diff_form'].fillna(0.0)
+    team_state.insert(0, 'elo', teams.groupby('team_key')['elo'].last())
+    team_state.insert(0, 'team', names)
+
+    players['elo'] = players['post_rating'].fillna(players['player_elo_pre'])
+    per_map = players[['player_id', 'player', 'team_key', 'elo', 'acs', 'rating']].copy()
+    per_map['kills'] = players['kills'] / players['maps']
+    per_map['deaths'] = players['deaths'] / players['maps']
+    recent = per_map.groupby('player_id', sort=False).tail(FORM_WINDOW)
+    player_state = recent.groupby('player_id')[['kills', 'deaths', 'acs', 'rating']].mean().add_suffix('_form')
+    last = per_map.groupby('player_id')[['player', 'team_key', 'elo']].last()
+    player_state = last.join(player_state).reset_index().set_index('player')
+    return team_state, player_state
+
+
+def feature_matrix(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Model input matrix for the given feature columns (float64, in column order)."""
+    return df[columns].to_numpy(dtype=float)
@@ -1,128 +1,340 @@
 import os
 import sqlite3
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-import joblib
+import pandas as pd
+
+from loadDB.normalizers.team import team_key
+from .artifacts import KILLS_ARTIFACT, MATCH_ARTIFACT, ONLINE_ARTIFACT, load_artifact
+from .features import MATCH_FEATURES, PLAYER_FEATURES, START_ELO, current_state
 
 
 MODELS_DIR = 'models'
 
+# Model files in order of preference
+_MATCH_MODELS = (ONLINE_ARTIFACT, MATCH_ARTIFACT, 'match_outcome.pkl')
+_KILLS_MODELS = (KILLS_ARTIFACT, 'player_kills.pkl')
+
+
+def elo_expected(elo_a: np.ndarray, elo_b: np.ndarray) -> np.ndarray:
+    """Elo expected score of A against B, elementwise."""
+    return 1.0 / (1.0 + 10.0 ** (-(np.asarray(elo_a, dtype=float) - np.asarray(elo_b, dtype=float)) / 400.0))
+
+
+def _match_features(a: pd.DataFrame, b: pd.DataFrame) -> np.ndarray:
+    """MATCH_FEATURES matrix for A vs B from aligned current_state() team rows."""
+    cols = {'elo_a_pre': a['elo'].to_numpy(), 'elo_b_pre': b['elo'].to_numpy()}
+    cols['elo_diff'] = cols['elo_a_pre'] - cols['elo_b_pre']
+    for col in ('win_form', 'map_diff_form', 'round_diff_form'):
+        cols[f'{col}_a'] = a[col].to_numpy()
+        cols[f'{col}_b'] = b[col].to_numpy()
+    return pd.DataFrame(cols)[MATCH_FEATURES].to_numpy(dtype=float)
+
 
 class Predictor:
     """
     Machine learning predictor for match outcomes and player performance.
-    
+
     Uses trained models to predict:
-    - Match win probabilities based on team Elo ratings
-    - Expected player kills based on player Elo and stats
+    - Match win probabilities based on team Elo ratings and recent form
+    - Expected player kills based on player Elo and recent form
+
+    Ratings and form are loaded once per instance (call refresh() after new
+    ingests); the batch methods build one feature matrix and call the model once.
+
+    Models are read on first use from the exported artifacts (see artifacts),
+    which need no scikit-learn, and reloaded when the files change. Older
+    model directories with only the pickles fall back to joblib.
     """
-    
-    def __init__(self, db_path: str = 'valorant_esports.db'):
+
+    def __init__(self, db_path: str = 'valorant_esports.db', models_dir: str = MODELS_DIR):
         """
-        Initialize predictor and load trained models.
-        
+        Initialize predictor (models are loaded lazily).
+
         Args:
             db_path: Path to database file
+            models_dir: Directory holding the trained models
         """
         self.db_path = db_path
-        self.match_model = None
-        self.kills_model = None
-        self._load_models()
-
-    def _load_models(self):
-        """Load trained models from disk if they exist."""
-        mm = os.path.join(MODELS_DIR, 'match_outcome.pkl')
-        km = os.path.join(MODELS_DIR, 'player_kills.pkl')
-        if os.path.exists(mm):
-            self.match_model = joblib.load(mm)
-        if os.path.exists(km):
-            self.kills_model = joblib.load(km)
+        self.models_dir = models_dir
+        self._teams: Optional[pd.DataFrame] = None
+        self._players: Optional[pd.DataFrame] = None
+
+    def _model_path(self, *names: str) -> Optional[str]:
+        """The first of the given model files that exists, else None."""
+        for name in names:
+            path = os.path.join(self.models_dir, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _load_model(self, names: Tuple[str, ...], n_features: int):
+        path = self._model_path(*names)
+        if path is None:
+            return None
+        if path.endswith('.pkl'):
+            model = _load_pickle(path)
+        else:
+            model = load_artifact(path)
+        # Models trained on an older feature layout are ignored until retrained
+        if getattr(model, 'n_features_in_', n_features) != n_features:
+            return None
+        return model
+
+    @property
+    def match_model(self):
+        """Match outcome classifier (predict_proba), or None if not trained; the online model (see online) wins."""
+        return self._load_model(_MATCH_MODELS, len(MATCH_FEATURES))
+
+    @property
+    def kills_model(self):
+        """Player kills regressor (predict), or None if not trained."""
+        return self._load_model(_KILLS_MODELS, len(PLAYER_FEATURES))
+
+    @property
+    def model_version(self) -> str:
+        """Identifies what produced match probabilities: the model file's mtime, or 'elo'."""
+        if self.match_model is None:
+            return 'elo'
+        path = self._model_path(*_MATCH_MODELS)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return f'{name}@{int(os.path.getmtime(path))}'
 
     def _connect(self):
         """Get database connection."""
         return sqlite3.connect(self.db_path)
 
+    def _state(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Current per-team and per-player features (see features.current_state), loaded once."""
+        if self._teams is None:
+            self._teams, self._players = current_state(self.db_path)
+        return self._teams, self._players
+
+    def refresh(self) -> None:
+        """Drop the loaded ratings so the next prediction reads the database again."""
+        self._teams = self._players = None
+
     def team_elos(self) -> Dict[str, float]:
         """
-        Get current team Elo ratings from database.
-        
+        Get current team Elo ratings from the published Elo history.
+
         Returns:
             Dictionary mapping team names to Elo ratings
         """
-        con = self._connect()
-        cur = con.cursor()
-        cur.execute("SELECT team_name, COALESCE(team_elo, 1500.0) FROM Teams")
-        m = {n: float(e) for n, e in cur.fetchall()}
-        con.close()
-        return m
+        teams, _ = self._state()
+        return dict(zip(teams['team'], teams['elo'].astype(float)))
 
     def player_elos(self) -> Dict[str, float]:
         """
-        Get current player Elo ratings from database.
-        
+        Get current player Elo ratings from the published Elo history.
+
         Returns:
             Dictionary mapping player names to Elo ratings
         """
-        con = self._connect()
-        cur = con.cursor()
-        cur.execute("SELECT player_name, COALESCE(player_elo, 1500.0) FROM Players")
-        m = {n: float(e) for n, e in cur.fetchall()}
-        con.close()
-        return m
+        _, players = self._state()
+        return players['elo'].astype(float).to_dict()
+
+    def match_probs(self, keys_a: Sequence[str], keys_b: Sequence[str]) -> pd.DataFrame:
+        """
+        Win probabilities of A over B for aligned key sequences, in one model call.
+
+        The model is scored on both orientations and averaged, so swapping A
+        and B gives the complementary probability.
+
+        Returns:
+            Frame with elo_a, elo_b, p_team_a (NaN where a team is unrated or
+            there is no model; see elo_expected for the Elo-only estimate)
+        """
+        teams, _ = self._state()
+        a = teams.reindex(list(keys_a))
+        b = teams.reindex(list(keys_b))
+        out = pd.DataFrame({'elo_a': a['elo'].to_numpy(), 'elo_b': b['elo'].to_numpy()})
+        out['p_team_a'] = np.nan
+        known = out[['elo_a', 'elo_b']].notna().all(axis=1).to_numpy()
+        model = self.match_model
+        if model is None or not known.any():
+            return out
+        x_ab = _match_features(a, b)[known]
+        x_ba = _match_features(b, a)[known]
+        # The model isn't symmetric in A/B: average both orientations so p(a, b) + p(b, a) == 1
+        p = model.predict_proba(np.vstack([x_ab, x_ba]))[:, 1]
+        n = len(x_ab)
+        out.loc[known, 'p_team_a'] = (p[:n] + 1.0 - p[n:]) / 2.0
+        return out
+
+    def predict_matches(self, pairs: Iterable[Tuple[str, str]]) -> List[Dict]:
+        """
+        Predict outcome probabilities for many matchups at once.
+
+        Args:
+            pairs: (team1_name, team2_name) tuples
+
+        Returns:
+            One dict per pair, as predict_match returns
+        """
+        pairs = list(pairs)
+        probs = self.match_probs([team_key(a) for a, _ in pairs], [team_key(b) for _, b in pairs])
+        results = []
+        for (t1, t2), r1, r2, p in zip(pairs, probs['elo_a'], probs['elo_b'], probs['p_team_a']):
+            results.append({
+                'team1_name': t1,
+                'team2_name': t2,
+                'team1_elo': None if pd.isna(r1) else float(r1),
+                'team2_elo': None if pd.isna(r2) else float(r2),
+                'team1_win_prob': None if pd.isna(p) else float(p),
+            })
+        return results
 
     def predict_match(self, team1_name: str, team2_name: str):
         """
         Predict match outcome probability.
-        
+
         Args:
             team1_name: Name of first team
             team2_name: Name of second team
-        
+
         Returns:
             Dictionary with team names, Elo ratings, and team1 win probability
         """
-        teams = self.team_elos()
-        r1 = teams.get(team1_name)
-        r2 = teams.get(team2_name)
-        if r1 is None or r2 is None or self.match_model is None:
-            return {
-                'team1_name': team1_name,
-                'team2_name': team2_name,
-                'team1_elo': r1,
-                'team2_elo': r2,
-                'team1_win_prob': None
-            }
-        x = np.array([[r1, r2, r1 - r2]])
-        prob = float(self.match_model.predict_proba(x)[:, 1][0])
-        return {
-            'team1_name': team1_name,
-            'team2_name': team2_name,
-            'team1_elo': r1,
-            'team2_elo': r2,
-            'team1_win_prob': prob
-        }
-
-    def predict_kills(self, player_name: str):
+        return self.predict_matches([(team1_name, team2_name)])[0]
+
+    def matchup_matrix(self, keys: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Win probability for every ordered pair of teams, in one model call.
+
+        Falls back to the Elo expected score when no match model is trained.
+
+        Args:
+            keys: Team keys to include (default: every rated team; unrated keys are skipped)
+
+        Returns:
+            Frame with team_a_key, team_b_key, p_team_a, elo_a, elo_b (N*(N-1) rows)
+        """
+        teams, _ = self._state()
+        keys = list(teams.index) if keys is None else [k for k in keys if k in teams.index]
+        keys = np.asarray(keys, dtype=object)
+        n = len(keys)
+        ia, ib = np.nonzero(~np.eye(n, dtype=bool))
+        probs = self.match_probs(keys[ia], keys[ib])
+        if probs['p_team_a'].isna().all():
+            probs['p_team_a'] = elo_expected(probs['elo_a'], probs['elo_b'])
+        probs.insert(0, 'team_b_key', keys[ib])
+        probs.insert(0, 'team_a_key', keys[ia])
+        return probs[['team_a_key', 'team_b_key', 'p_team_a', 'elo_a', 'elo_b']]
+
+    def predict_kills_many(
+        self,
+        players: Iterable[str],
+        maps: int = 2,
+        opponents: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Dict]:
+        """
+        Predict expected kills for many players at once.
+
+        Args:
+            players: Player names
+            maps: Maps played in the match
+            opponents: Opposing team name per player (None entries, or no list,
+                       assume an even matchup: opponent rated like the player's team)
+
+        Returns:
+            One dict per player, as predict_kills returns
+        """
+        teams, state = self._state()
+        names = list(players)
+        p = state.reindex(names)
+        team_elo = teams['elo'].reindex(p['team_key']).fillna(START_ELO).to_numpy()
+        opp_keys = [team_key(o) if o else None for o in (opponents or [None] * len(names))]
+        opp_elo = teams['elo'].reindex(opp_keys).to_numpy()
+        opp_elo = np.where(np.isnan(opp_elo), team_elo, opp_elo)
+
+        preds = np.full(len(names), np.nan)
+        known = p['elo'].notna().to_numpy()
+        model = self.kills_model
+        if model is not None and known.any():
+            x = pd.DataFrame({
+                'player_elo_pre': p['elo'].to_numpy(), 'maps': float(maps),
+                'kills_form': p['kills_form'].to_numpy(), 'deaths_form': p['deaths_form'].to_numpy(),
+                'acs_form': p['acs_form'].to_numpy(), 'rating_form': p['rating_form'].to_numpy(),
+                'team_elo_pre': team_elo, 'opp_elo_pre': opp_elo,
+            })[PLAYER_FEATURES].to_numpy(dtype=float)[known]
+            preds[known] = model.predict(x)
+
+        results = []
+        for name, elo, y in zip(names, p['elo'], preds):
+            if np.isnan(y):
+                results.append({'player_name': name, 'expected_kills': None})
+            else:
+                results.append({'player_name': name, 'player_elo': float(elo), 'expected_kills': float(y)})
+        return results
+
+    def predict_kills(self, player_name: str, maps: int = 2, opponent: Optional[str] = None):
         """
         Predict expected kills for a player.
-        
-        Uses neutral baseline context (zeros) with player Elo as the primary feature.
-        
+
+        Uses the player's current Elo and recent per-map form; without an
+        opponent the matchup is assumed even (opponent rated like the player's team).
+
         Args:
             player_name: Name of player
-        
+            maps: Maps played in the match
+            opponent: Optional opposing team name
+
         Returns:
             Dictionary with player name, Elo rating, and expected kills
         """
-        con = self._connect()
-        cur = con.cursor()
-        cur.execute("SELECT player_id, COALESCE(player_elo, 1500.0) FROM Players WHERE player_name = ?", (player_name,))
-        row = cur.fetchone()
-        con.close()
-        if row is None or self.kills_model is None:
-            return {'player_name': player_name, 'expected_kills': None}
-        pid, p_elo = int(row[0]), float(row[1])
-        x = np.array([[p_elo, 0, 0, 0, 1.0, 0, 0, 0]])
-        y = float(self.kills_model.predict(x)[0])
-        return {'player_name': player_name, 'player_elo': p_elo, 'expected_kills': y}
+        return self.predict_kills_many([player_name], maps=maps, opponents=[opponent])[0]
+
+
+# path -> (mtime, unpickled model), for model directories without artifacts
+_PICKLES: Dict[str, Tuple[float, object]] = {}
+
+
+def _load_pickle(path: str):
+    """Unpickle a scikit-learn model (imports joblib lazily), cached by mtime."""
+    mtime = os.path.getmtime(path)
+    cached = _PICKLES.get(path)
+    if cached is None or cached[0] != mtime:
+        import joblib
+
+        cached = (mtime, joblib.load(path))
+        _PICKLES[path] = cached
+    return cached[1]
+
+
+def write_matchup_probs(conn: sqlite3.Connection, predictor: Predictor, keys: Optional[Sequence[str]] = None) -> int:
+    """
+    Write predictor.matchup_matrix() to Matchup_Probs (caller commits).
+
+    Args:
+        conn: Database connection
+        predictor: Predictor to score with
+        keys: Team keys to include (default: every rated team). Only the pairs
+              among these keys are replaced; other rows are kept.
+
+    Returns:
+        Number of rows written
+    """
+    matrix = predictor.matchup_matrix(keys)
+    version = predictor.model_version
+    if keys is None:
+        conn.execute("DELETE FROM Matchup_Probs")
+    else:
+        keys = list(keys)
+        placeholders = ",".join("?" * len(keys))
+        conn.execute(
+            f"DELETE FROM Matchup_Probs WHERE team_a_key IN ({placeholders}) AND team_b_key IN ({placeholders})",
+            keys + keys,
+        )
+    conn.executemany(
+        """
+        INSERT INTO Matchup_Probs (team_a_key, team_b_key, p_team_a, elo_a, elo_b, model_version)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (a, b, float(p), float(ea), float(eb), version)
+            for a, b, p, ea, eb in matrix.itertuples(index=False)
+        ],
+    )
+    return len(matrix)
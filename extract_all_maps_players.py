@@ -1,12 +1,13 @@
 """Extract maps and player stats for all matches"""
 import asyncio
 import sqlite3
-from loadDB.db_utils import get_conn, upsert_match, upsert_maps, upsert_player_stats
+from loadDB.db_utils import get_conn, ensure_matches_columns, upsert_match, upsert_maps, upsert_player_stats
 from loadDB.vlr_ingest import scrape_match
 
 async def extract_all_data():
     """Re-scrape all matches to extract maps and player stats"""
     conn = get_conn()
+    ensure_matches_columns(conn)
     cur = conn.cursor()
     
     # Get all match IDs
@@ -4,108 +4,118 @@ import { NextResponse } from 'next/server';
 import db from '@/app/lib/db.js';
 import { isOlderThanSixMonths, inferTeamRegion } from '@/app/lib/region-utils.js';
 import { isShowmatchTeam, normalizeTeamName } from '@/app/lib/team-utils.js';
-import { getPlayerLastMatchDate, getPlayerTeams } from '@/app/lib/db/activity.js';
+import { getMatchesDateMeta, getMatchDateExpr, hasSeasonStats } from '@/app/lib/db/schema.js';
 import { getTeamLogoUrl } from '@/app/lib/logos.js';
 
+// Every player's teams with the last date they played for each (one grouped query)
+function getAllPlayerTeams() {
+  const dateExpr = getMatchDateExpr(getMatchesDateMeta(db), 'm') || 'NULL';
+  const rows = db.prepare(`
+    SELECT
+      ps.player as player_name,
+      ps.team as team_name,
+      MAX(${dateExpr}) as last_match_date
+    FROM Player_Stats ps
+    LEFT JOIN Matches m ON ps.match_id = m.match_id
+    WHERE ps.player IS NOT NULL AND ps.player != ''
+    GROUP BY ps.player, ps.team
+    ORDER BY ps.player, last_match_date DESC
+  `).all();
+
+  // player -> normalized team names, most recent first
+  const teamsByPlayer = new Map();
+  for (const row of rows) {
+    if (!teamsByPlayer.has(row.player_name)) {
+      teamsByPlayer.set(row.player_name, []);
+    }
+    if (!row.team_name) continue;
+    const teams = teamsByPlayer.get(row.player_name);
+    const normalizedTeam = normalizeTeamName(row.team_name);
+    if (!teams.includes(normalizedTeam)) {
+      teams.push(normalizedTeam);
+    }
+  }
+  return teamsByPlayer;
+}
+
+// Year stats for every player: one read of Player_Season_Stats when the loader
+// maintains it, otherwise one aggregate query per player.
+function getYearStats(playerNames, year) {
+  const statsByPlayer = new Map();
+
+  if (hasSeasonStats(db)) {
+    const rows = db.prepare(`
+      SELECT
+        player,
+        avg_rating,
+        avg_kills,
+        avg_assists,
+        first_kills as total_first_kills,
+        first_deaths as total_first_deaths,
+        maps_played
+      FROM Player_Season_Stats
+      WHERE season = ?
+    `).all(parseInt(year));
+    for (const row of rows) {
+      statsByPlayer.set(row.player, row);
+    }
+    return statsByPlayer;
+  }
+
+  const statsQuery = db.prepare(`
+    SELECT
+      AVG(ps.rating) as avg_rating,
+      AVG(ps.kills) as avg_kills,
+      AVG(ps.assists) as avg_assists,
+      SUM(ps.first_kills) as total_first_kills,
+      SUM(ps.first_deaths) as total_first_deaths,
+      COUNT(DISTINCT ps.map_id) as maps_played
+    FROM Player_Stats ps
+    JOIN Maps mp ON ps.map_id = mp.id
+    JOIN Matches m ON mp.match_id = m.match_id
+    WHERE ps.player = ?
+      AND m.match_date >= ?
+      AND m.match_date < ?
+  `);
+  for (const playerName of playerNames) {
+    statsByPlayer.set(
+      playerName,
+      statsQuery.get(playerName, `${year}-01-01`, `${parseInt(year) + 1}-01-01`),
+    );
+  }
+  return statsByPlayer;
+}
+
 export async function GET(request) {
   try {
     const { searchParams } = new URL(request.url);
     const year = searchParams.get('year') || '2026'; // Default to 2026
-    // Get all players with all their teams
-    const allPlayerData = db.prepare(`
-      SELECT DISTINCT 
-        ps.player as player_name,
-        ps.team as team_name
-      FROM Player_Stats ps
-      WHERE ps.player IS NOT NULL AND ps.player != ''
-      ORDER BY ps.player
-    `).all();
-    
-    // Group by player name and collect all teams
-    const playersMap = new Map();
-    
-    allPlayerData.forEach(row => {
-      const normalizedTeam = normalizeTeamName(row.team_name);
-      
-      // Skip showmatch teams
-      if (isShowmatchTeam(normalizedTeam)) {
-        return;
-      }
-      
-      if (!playersMap.has(row.player_name)) {
-        playersMap.set(row.player_name, {
-          player_name: row.player_name,
-          teams: [],
-        });
-      }
-      
-      // Add team if not already in list
-      const player = playersMap.get(row.player_name);
-      if (!player.teams.some(t => t.team_name === normalizedTeam)) {
-        player.teams.push({ team_name: normalizedTeam });
-      }
-    });
-    
-    // For each player, get their most recent team and all teams
-    const players = Array.from(playersMap.values()).map(player => {
-      // Get all teams with dates
-      const allTeams = getPlayerTeams(db, player.player_name);
-      
-      // Filter out showmatch teams
-      const validTeams = allTeams.filter(t => !isShowmatchTeam(t.team_name));
-      
-      // Determine most recent valid team (if any)
-      const mostRecentTeam = validTeams[0] || null; // getPlayerTeams already sorts by date DESC
 
-      // Get player statistics for the specified year
-      const stats = db.prepare(`
-        SELECT 
-          AVG(ps.rating) as avg_rating,
-          AVG(ps.kills) as avg_kills,
-          AVG(ps.assists) as avg_assists,
-          SUM(ps.first_kills) as total_first_kills,
-          SUM(ps.first_deaths) as total_first_deaths,
-          COUNT(DISTINCT ps.map_id) as maps_played
-        FROM Player_Stats ps
-        JOIN Maps mp ON ps.map_id = mp.id
-        JOIN Matches m ON mp.match_id = m.match_id
-        WHERE ps.player = ?
-          AND m.match_date >= ?
-          AND m.match_date < ?
-      `).get(player.player_name, `${year}-01-01`, `${parseInt(year) + 1}-01-01`);
+    const teamsByPlayer = getAllPlayerTeams();
+
+    // Filter out showmatch teams; players who only played for showmatch teams aren't listed
+    const playerTeams = Array.from(teamsByPlayer.entries())
+      .map(([playerName, allTeams]) => [playerName, allTeams.filter(t => !isShowmatchTeam(t))])
+      .filter(([, validTeams]) => validTeams.length > 0);
+    const statsByPlayer = getYearStats(playerTeams.map(([playerName]) => playerName), year);
+
+    const players = playerTeams.map(([playerName, validTeams]) => {
+      // Most recent valid team; teams are sorted by date DESC
+      const mostRecentTeam = validTeams[0];
+
+      const stats = statsByPlayer.get(playerName);
 
       // Determine inactivity based on whether they played in the selected year
       const hasPlayedInYear = stats?.maps_played > 0;
       const isInactive = !hasPlayedInYear;
 
-      // If no valid teams remain after filtering (e.g., only showmatch teams), treat as Free Agent
-      if (!mostRecentTeam) {
-        return {
-          player_name: player.player_name,
-          team_name: null,
-          all_teams: [],
-          is_inactive: isInactive,
-          team_logo: null,
-          region: 'UNKNOWN',
-          avg_rating: stats?.avg_rating || 0,
-          avg_kills: stats?.avg_kills || 0,
-          avg_assists: stats?.avg_assists || 0,
-          total_first_kills: stats?.total_first_kills || 0,
-          total_first_deaths: stats?.total_first_deaths || 0,
-          maps_played: stats?.maps_played || 0,
-        };
-      }
-      
-      // Ensure team name is normalized for logo/region lookups
-      const normalizedTeamName = normalizeTeamName(mostRecentTeam.team_name);
-      
       return {
-        player_name: player.player_name,
-        team_name: normalizedTeamName,
-        all_teams: validTeams.map(t => normalizeTeamName(t.team_name)),
+        player_name: playerName,
+        team_name: mostRecentTeam,
+        all_teams: validTeams,
         is_inactive: isInactive,
-        team_logo: getTeamLogoUrl(normalizedTeamName, 'small'),
-        region: inferTeamRegion(db, normalizedTeamName),
+        team_logo: getTeamLogoUrl(mostRecentTeam, 'small'),
+        region: inferTeamRegion(db, mostRecentTeam),
         avg_rating: stats?.avg_rating || 0,
         avg_kills: stats?.avg_kills || 0,
         avg_assists: stats?.avg_assists || 0,
@@ -114,7 +124,7 @@ export async function GET(request) {
         maps_played: stats?.maps_played || 0,
       };
     });
-    
+
     return NextResponse.json(players);
   } catch (error) {
     console.error('Error fetching players:', error);
@@ -2,10 +2,12 @@
 
 import { NextResponse } from 'next/server';
 import db from '@/app/lib/db.js';
-import { normalizeTeamName } from '@/app/lib/team-utils.js';
+import { normalizeTeamName, teamKey } from '@/app/lib/team-utils.js';
+import { hasTable, hasTeamKeys, hasVetoes } from '@/app/lib/db/schema.js';
 
 /**
- * Parse bans/picks string and extract individual actions.
+ * Parse bans/picks string and extract individual actions (fallback for
+ * databases without the Vetoes table).
  * Example: "ENVY ban Haven; EG ban Bind; ENVY pick Abyss; EG pick Corrode; ENVY ban Pearl; EG ban Split; Bind remains"
  * Returns: { bans: [{ team, map }, ...], picks: [{ team, map }, ...] }
  */
@@ -56,43 +58,80 @@ export async function GET(request, { params }) {
 
     const decodedName = decodeURIComponent(team_id);
     const canonicalName = normalizeTeamName(decodedName);
+    const canonicalKey = teamKey(canonicalName);
+
+    // Compare on the indexed canonical keys when present (older DBs: LOWER() of the names)
+    const useKeys = hasTeamKeys(db);
+    const teamValue = useKeys ? canonicalKey : canonicalName.toLowerCase();
+    const teamA = useKeys ? 'team_a_key' : 'LOWER(team_a)';
+    const teamB = useKeys ? 'team_b_key' : 'LOWER(team_b)';
+    const matTeamA = useKeys ? 'mat.team_a_key' : 'LOWER(mat.team_a)';
+    const matTeamB = useKeys ? 'mat.team_b_key' : 'LOWER(mat.team_b)';
     
-    // Query all matches for this team in the given year that have bans_picks data
-    const matches = db.prepare(`
-      SELECT bans_picks FROM Matches
-      WHERE bans_picks IS NOT NULL AND bans_picks != ''
-        AND match_date >= ? AND match_date < ?
-        AND (LOWER(team_a) = LOWER(?) OR LOWER(team_b) = LOWER(?))
-    `).all(`${year}-01-01`, `${parseInt(year) + 1}-01-01`, canonicalName, canonicalName);
+    const yearStart = `${year}-01-01`;
+    const yearEnd = `${parseInt(year) + 1}-01-01`;
 
     // Aggregate bans and picks
     const bansCounts = new Map(); // map -> count
     const picksCounts = new Map();
-    
-    for (const match of matches) {
-      const { bans, picks } = parseBansPicks(match.bans_picks);
-      
-      for (const ban of bans) {
-        // Normalize team name from veto string and compare
-        const normalizedBanTeam = normalizeTeamName(ban.team);
-        
-        // Only count if this team banned it
-        if (normalizedBanTeam.toLowerCase() === canonicalName.toLowerCase()) {
-          const map = ban.map.toLowerCase();
-          bansCounts.set(map, (bansCounts.get(map) || 0) + 1);
-        }
+    let totalMatchesWithVeto;
+
+    if (useKeys && hasVetoes(db)) {
+      // Veto steps are parsed at ingestion: one indexed GROUP BY on (team_key, action)
+      const counts = db.prepare(`
+        SELECT v.action, LOWER(v.map) as map, COUNT(*) as count
+        FROM Vetoes v
+        JOIN Matches mat ON mat.match_id = v.match_id
+        WHERE v.team_key = ? AND v.action IN ('ban', 'pick')
+          AND mat.match_date >= ? AND mat.match_date < ?
+        GROUP BY v.action, LOWER(v.map)
+      `).all(canonicalKey, yearStart, yearEnd);
+
+      for (const row of counts) {
+        (row.action === 'ban' ? bansCounts : picksCounts).set(row.map, row.count);
       }
-      
-      for (const pick of picks) {
-        // Normalize team name from veto string and compare
-        const normalizedPickTeam = normalizeTeamName(pick.team);
-        
-        // Only count if this team picked it
-        if (normalizedPickTeam.toLowerCase() === canonicalName.toLowerCase()) {
-          const map = pick.map.toLowerCase();
-          picksCounts.set(map, (picksCounts.get(map) || 0) + 1);
+
+      totalMatchesWithVeto = db.prepare(`
+        SELECT COUNT(*) as count FROM Matches mat
+        WHERE (mat.team_a_key = ? OR mat.team_b_key = ?)
+          AND mat.match_date >= ? AND mat.match_date < ?
+          AND EXISTS (SELECT 1 FROM Vetoes v WHERE v.match_id = mat.match_id)
+      `).get(canonicalKey, canonicalKey, yearStart, yearEnd).count;
+    } else {
+      // Query all matches for this team in the given year that have bans_picks data
+      const matches = db.prepare(`
+        SELECT bans_picks FROM Matches
+        WHERE bans_picks IS NOT NULL AND bans_picks != ''
+          AND match_date >= ? AND match_date < ?
+          AND (${teamA} = ? OR ${teamB} = ?)
+      `).all(yearStart, yearEnd, teamValue, teamValue);
+
+      for (const match of matches) {
+        const { bans, picks } = parseBansPicks(match.bans_picks);
+
+        for (const ban of bans) {
+          // Normalize team name from veto string and compare keys
+          const banTeamKey = teamKey(normalizeTeamName(ban.team));
+
+          // Only count if this team banned it
+          if (banTeamKey === canonicalKey) {
+            const map = ban.map.toLowerCase();
+            bansCounts.set(map, (bansCounts.get(map) || 0) + 1);
+          }
+        }
+
+        for (const pick of picks) {
+          // Normalize team name from veto string and compare keys
+          const pickTeamKey = teamKey(normalizeTeamName(pick.team));
+
+          // Only count if this team picked it
+          if (pickTeamKey === canonicalKey) {
+            const map = pick.map.toLowerCase();
+            picksCounts.set(map, (picksCounts.get(map) || 0) + 1);
+          }
         }
       }
+      totalMatchesWithVeto = matches.length;
     }
 
     // Query map winrates with detailed match info for this team in the given year
@@ -106,30 +145,30 @@ export async function GET(request, { params }) {
         m.team_b_score,
         mat.match_date,
         CASE 
-          WHEN LOWER(mat.team_a) = LOWER(?) THEN mat.team_b
-          WHEN LOWER(mat.team_b) = LOWER(?) THEN mat.team_a
+          WHEN ${matTeamA} = ? THEN mat.team_b
+          WHEN ${matTeamB} = ? THEN mat.team_a
           ELSE NULL
         END as opponent,
         CASE 
-          WHEN (LOWER(mat.team_a) = LOWER(?) AND m.team_a_score > m.team_b_score) OR 
-               (LOWER(mat.team_b) = LOWER(?) AND m.team_b_score > m.team_a_score) THEN 'W'
+          WHEN (${matTeamA} = ? AND m.team_a_score > m.team_b_score) OR 
+               (${matTeamB} = ? AND m.team_b_score > m.team_a_score) THEN 'W'
           ELSE 'L'
         END as result,
         CASE 
-          WHEN LOWER(mat.team_a) = LOWER(?) THEN m.team_a_score
+          WHEN ${matTeamA} = ? THEN m.team_a_score
           ELSE m.team_b_score
         END as team_score,
         CASE 
-          WHEN LOWER(mat.team_a) = LOWER(?) THEN m.team_b_score
+          WHEN ${matTeamA} = ? THEN m.team_b_score
           ELSE m.team_a_score
         END as opponent_score
       FROM Maps m
       JOIN Matches mat ON m.match_id = mat.match_id
-      WHERE (LOWER(mat.team_a) = LOWER(?) OR LOWER(mat.team_b) = LOWER(?))
+      WHERE (${matTeamA} = ? OR ${matTeamB} = ?)
         AND mat.match_date >= ? AND mat.match_date < ?
         AND m.map IS NOT NULL AND m.map != ''
       ORDER BY LOWER(m.map), mat.match_date DESC
-    `).all(canonicalName, canonicalName, canonicalName, canonicalName, canonicalName, canonicalName, canonicalName, canonicalName, `${year}-01-01`, `${parseInt(year) + 1}-01-01`);
+    `).all(teamValue, teamValue, teamValue, teamValue, teamValue, teamValue, teamValue, teamValue, yearStart, yearEnd);
 
     // Organize matches by map
     const matchesByMap = new Map();
@@ -146,24 +185,31 @@ export async function GET(request, { params }) {
       });
     }
 
-    // Query map winrates for this team in the given year
-    const mapWinrates = db.prepare(`
-      SELECT 
-        LOWER(m.map) as map_name,
-        COUNT(*) as total_maps,
-        SUM(CASE 
-          WHEN (LOWER(mat.team_a) = LOWER(?) AND m.team_a_score > m.team_b_score) OR 
-               (LOWER(mat.team_b) = LOWER(?) AND m.team_b_score > m.team_a_score) THEN 1 
-          ELSE 0 
-        END) as wins
-      FROM Maps m
-      JOIN Matches mat ON m.match_id = mat.match_id
-      WHERE (LOWER(mat.team_a) = LOWER(?) OR LOWER(mat.team_b) = LOWER(?))
-        AND mat.match_date >= ? AND mat.match_date < ?
-        AND m.map IS NOT NULL AND m.map != ''
-      GROUP BY LOWER(m.map)
-      ORDER BY total_maps DESC, wins DESC
-    `).all(canonicalName, canonicalName, canonicalName, canonicalName, `${year}-01-01`, `${parseInt(year) + 1}-01-01`);
+    // Query map winrates for this team in the given year (materialized per season by the loader)
+    const mapWinrates = useKeys && hasTable(db, 'Team_Map_Stats')
+      ? db.prepare(`
+          SELECT LOWER(map) as map_name, played as total_maps, won as wins
+          FROM Team_Map_Stats
+          WHERE team_key = ? AND season = ? AND played > 0
+          ORDER BY total_maps DESC, wins DESC
+        `).all(canonicalKey, parseInt(year))
+      : db.prepare(`
+          SELECT 
+            LOWER(m.map) as map_name,
+            COUNT(*) as total_maps,
+            SUM(CASE 
+              WHEN (${matTeamA} = ? AND m.team_a_score > m.team_b_score) OR 
+                   (${matTeamB} = ? AND m.team_b_score > m.team_a_score) THEN 1 
+              ELSE 0 
+            END) as wins
+          FROM Maps m
+          JOIN Matches mat ON m.match_id = mat.match_id
+          WHERE (${matTeamA} = ? OR ${matTeamB} = ?)
+            AND mat.match_date >= ? AND mat.match_date < ?
+            AND m.map IS NOT NULL AND m.map != ''
+          GROUP BY LOWER(m.map)
+          ORDER BY total_maps DESC, wins DESC
+        `).all(teamValue, teamValue, teamValue, teamValue, yearStart, yearEnd);
 
     // Convert winrates to structured format with percentages
     const mapWinratesByName = new Map();
@@ -206,7 +252,7 @@ export async function GET(request, { params }) {
       bans,
       picks,
       map_winrates: allMapWinrates,
-      total_matches_with_veto: matches.length,
+      total_matches_with_veto: totalMatchesWithVeto,
     });
   } catch (error) {
     console.error('Error fetching bans/picks:', error);
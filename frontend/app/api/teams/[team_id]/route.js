@@ -3,10 +3,10 @@
 import { NextResponse } from 'next/server';
 import db from '@/app/lib/db.js';
 import { inferTeamRegion, isOlderThanSixMonths } from '@/app/lib/region-utils.js';
-import { normalizeTeamName, getTeamNameVariants } from '@/app/lib/team-utils.js';
+import { normalizeTeamName, getTeamNameVariants, getTeamKeys } from '@/app/lib/team-utils.js';
 import { getTeamLastMatchDate, buildTeamVariants } from '@/app/lib/db/activity.js';
 import { getTeamLogoUrl } from '@/app/lib/logos.js';
-import { getMatchesDateMeta, getMatchDateExpr, getMatchDateNonEmptyWhere } from '@/app/lib/db/schema.js';
+import { getMatchesDateMeta, getMatchDateExpr, getMatchDateNonEmptyWhere, hasTeamKeys } from '@/app/lib/db/schema.js';
 
 export async function GET(request, { params }) {
   try {
@@ -45,9 +45,16 @@ export async function GET(request, { params }) {
     let activePlayers = [];
     let inactivePlayers = [];
 
-    const placeholders = variantsLower.map(() => '?').join(',');
+    // Match on the indexed canonical keys when present (older DBs: LOWER() of the names)
+    const useKeys = hasTeamKeys(db);
+    const teamValues = useKeys ? getTeamKeys(variantsLower) : variantsLower;
+    const teamACol = useKeys ? 'm.team_a_key' : 'LOWER(m.team_a)';
+    const teamBCol = useKeys ? 'm.team_b_key' : 'LOWER(m.team_b)';
+    const psTeamCol = useKeys ? 'ps.team_key' : 'LOWER(ps.team)';
+
+    const placeholders = teamValues.map(() => '?').join(',');
     // Need variants for both team matching (m.team_a/b) AND ps.team filtering
-    const queryParams = [...variantsLower, ...variantsLower, ...variantsLower];
+    const queryParams = [...teamValues, ...teamValues, ...teamValues];
 
     let rows = [];
     if (hasDateMeta) {
@@ -58,8 +65,8 @@ export async function GET(request, { params }) {
         FROM Player_Stats ps
         LEFT JOIN Maps mp ON ps.map_id = mp.id
         LEFT JOIN Matches m ON mp.match_id = m.match_id
-        WHERE (LOWER(m.team_a) IN (${placeholders}) OR LOWER(m.team_b) IN (${placeholders}))
-          AND LOWER(ps.team) IN (${placeholders})
+        WHERE (${teamACol} IN (${placeholders}) OR ${teamBCol} IN (${placeholders}))
+          AND ${psTeamCol} IN (${placeholders})
           AND ps.player IS NOT NULL AND ps.player != ''
           AND ${nonEmptyWhere}
         GROUP BY ps.player
@@ -76,14 +83,14 @@ export async function GET(request, { params }) {
       FROM Player_Stats ps
       JOIN Maps mp ON ps.map_id = mp.id
       JOIN Matches m ON mp.match_id = m.match_id
-      WHERE LOWER(ps.team) IN (${placeholders})
+      WHERE ${psTeamCol} IN (${placeholders})
         AND ps.player IS NOT NULL AND ps.player != ''
         AND m.match_date >= ?
         AND m.match_date < ?
       ORDER BY m.match_id DESC
       LIMIT 1
     `,
-    ).get(...variantsLower, `${year}-01-01`, `${parseInt(year) + 1}-01-01`);
+    ).get(...teamValues, `${year}-01-01`, `${parseInt(year) + 1}-01-01`);
 
     let currentRoster = [];
     if (latestMatch?.match_id) {
@@ -101,13 +108,13 @@ export async function GET(request, { params }) {
         FROM Player_Stats ps
         JOIN Maps mp ON ps.map_id = mp.id
         WHERE mp.match_id = ?
-          AND LOWER(ps.team) IN (${placeholders})
+          AND ${psTeamCol} IN (${placeholders})
           AND ps.player IS NOT NULL 
           AND ps.player != ''
         ORDER BY ps.rowid
         LIMIT 5
       `,
-      ).all(latestMatch.match_id, ...variantsLower);
+      ).all(latestMatch.match_id, ...teamValues);
 
       currentRoster = rosterRows.map((row) => ({
         player_name: row.player_name,
@@ -3,8 +3,9 @@
 import { NextResponse } from 'next/server';
 import db from '@/app/lib/db.js';
 import { inferTeamRegion, isOlderThanSixMonths } from '@/app/lib/region-utils.js';
-import { isShowmatchTeam, normalizeTeamName } from '@/app/lib/team-utils.js';
+import { isShowmatchTeam, normalizeTeamName, teamKey } from '@/app/lib/team-utils.js';
 import { getTeamLastMatchDate } from '@/app/lib/db/activity.js';
+import { hasSeasonStats } from '@/app/lib/db/schema.js';
 import { getTeamLogoUrl } from '@/app/lib/logos.js';
 
 // Teams that have been removed from VCT 2026
@@ -58,6 +59,17 @@ export async function GET() {
       normalizedTeamsMap.set(normalized, team.team_name);
     });
     
+    // 2026 records for every team in one read when the loader maintains Team_Season_Stats
+    const seasonStats = hasSeasonStats(db)
+      ? new Map(
+          db.prepare(`
+            SELECT team_key, wins, losses, maps_won, maps_lost, round_diff
+            FROM Team_Season_Stats
+            WHERE season = 2026
+          `).all().map(row => [row.team_key, row])
+        )
+      : null;
+
     // Convert to array and add region/inactive info and 2026 stats
     const teams = Array.from(normalizedTeamsMap.keys()).map(teamName => {
       const region = inferTeamRegion(db, teamName);
@@ -71,6 +83,21 @@ export async function GET() {
       // Team is inactive if in the inactive list OR hasn't played in 6 months
       const isInactive = isInInactiveList || (lastMatchDate ? isOlderThanSixMonths(lastMatchDate, null) : false);
       
+      if (seasonStats) {
+        const row = seasonStats.get(teamKey(teamName));
+        return {
+          team_name: teamName,
+          region,
+          is_inactive: isInactive,
+          logo_url: getTeamLogoUrl(teamName, 'small'),
+          match_wins: row?.wins || 0,
+          match_losses: row?.losses || 0,
+          map_wins: row?.maps_won || 0,
+          map_losses: row?.maps_lost || 0,
+          round_differential: row?.round_diff || 0,
+        };
+      }
+
       // Calculate 2026 statistics
       // Get match record (wins/losses) for 2026
       const matchStats = db.prepare(`
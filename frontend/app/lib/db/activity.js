@@ -1,7 +1,7 @@
 // Shared helpers for team/player activity derived from Matches + Player_Stats
 
-import { getMatchesDateMeta, getMatchDateExpr, getMatchDateNonEmptyWhere } from './schema.js';
-import { normalizeTeamName } from '../team-utils.js';
+import { getMatchesDateMeta, getMatchDateExpr, getMatchDateNonEmptyWhere, hasTeamKeys } from './schema.js';
+import { normalizeTeamName, getTeamKeys } from '../team-utils.js';
 
 // Build all known variants for certain teams (manual alias expansion)
 export function buildTeamVariants(normalizedTeamName) {
@@ -51,13 +51,18 @@ export function getTeamLastMatchDate(db, rawTeamName) {
       return null;
     }
 
-    const placeholders = variantsLower.map(() => '?').join(',');
-    const params = [...variantsLower, ...variantsLower];
+    // Canonical keys are indexed; fall back to LOWER() matching on older DBs
+    const useKeys = hasTeamKeys(db);
+    const values = useKeys ? getTeamKeys(variants) : variantsLower;
+    const teamA = useKeys ? 'team_a_key' : 'LOWER(team_a)';
+    const teamB = useKeys ? 'team_b_key' : 'LOWER(team_b)';
+    const placeholders = values.map(() => '?').join(',');
+    const params = [...values, ...values];
 
     const sql = `
       SELECT MAX(${dateExpr}) as last_match_date
       FROM Matches
-      WHERE (LOWER(team_a) IN (${placeholders}) OR LOWER(team_b) IN (${placeholders}))
+      WHERE (${teamA} IN (${placeholders}) OR ${teamB} IN (${placeholders}))
       AND ${nonEmptyWhere}
     `;
 
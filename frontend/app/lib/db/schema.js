@@ -17,6 +17,40 @@ export function getMatchesDateMeta(db) {
   };
 }
 
+// Canonical team key columns (Matches.team_a_key/team_b_key, Player_Stats.team_key)
+// are added together by the loader's schema migrations.
+export function hasTeamKeys(db) {
+  return getMatchesColumns(db).includes('team_a_key');
+}
+
+// Optional tables created by the loader's migrations (cached per table name)
+const _tableCache = new Map();
+
+export function hasTable(db, name) {
+  if (!_tableCache.has(name)) {
+    const row = db
+      .prepare("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?")
+      .get(name);
+    _tableCache.set(name, !!row);
+  }
+  return _tableCache.get(name);
+}
+
+// Parsed veto steps (Vetoes table), filled by the loader at ingestion.
+export function hasVetoes(db) {
+  return hasTable(db, 'Vetoes');
+}
+
+// Materialized per-season aggregates (Team_Season_Stats / Player_Season_Stats).
+export function hasSeasonStats(db) {
+  return hasTable(db, 'Team_Season_Stats') && hasTable(db, 'Player_Season_Stats');
+}
+
+// Elo outputs published by the loader (Elo_Snapshots per date range, Elo_Timeline per match).
+export function hasEloSnapshots(db) {
+  return hasTable(db, 'Elo_Snapshots') && hasTable(db, 'Player_Elo_Snapshots');
+}
+
 /**
  * Returns a SQL expression that yields a sortable "match date" string.
  * - If both columns exist: COALESCE(match_date, substr(match_ts_utc, 1, 10))
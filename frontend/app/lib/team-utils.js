@@ -208,6 +208,31 @@ export function normalizeTeamName(teamName) {
   return TEAM_ALIASES[normalized] || teamName;
 }
 
+/**
+ * Canonical lookup key for a team name, matching the loader's team_key():
+ * lowercase, diacritics stripped, non-alphanumerics removed.
+ * Matches.team_a_key / team_b_key and Player_Stats.team_key store this value.
+ * @param {string} teamName - The team name (any spelling)
+ * @returns {string} - The key ('' for empty names)
+ */
+export function teamKey(teamName) {
+  if (!teamName) return '';
+  return teamName
+    .toLowerCase()
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .replace(/[^\p{L}\p{N}]/gu, '');
+}
+
+/**
+ * Distinct, non-empty team keys for a list of name variants
+ * @param {string[]} variants - Team name variants
+ * @returns {string[]} - Array of keys
+ */
+export function getTeamKeys(variants) {
+  return Array.from(new Set(variants.map(teamKey).filter(Boolean)));
+}
+
 /**
  * Check if a team is a showmatch team
  * @param {string} teamName - The team name to check
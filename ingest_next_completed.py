@@ -14,8 +14,11 @@ import sys
 import argparse
 import asyncio
 from loadDB.db_utils import get_conn
+from loadDB.migrations import ensure_schema
 from loadDB import vlr_ingest
 from loadDB import upcoming
+from loadDB.recompute import deferred
+from loadDB.config import RECOMPUTE_DEBOUNCE_SECONDS
 
 
 def main():
@@ -48,23 +51,8 @@ Examples:
         except Exception as e:
             print(f"Warning: upcoming refresh failed: {e}")
     
-    # Ensure a small state table and a partial index exist to speed up scans
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS IngestionState (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    """)
-    # Partial index: earliest upcoming (null-score) by timestamp
-    try:
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_matches_nullscore_ts
-            ON Matches(match_ts_utc)
-            WHERE team_a_score IS NULL AND team_b_score IS NULL
-        """)
-    except Exception:
-        # Older SQLite versions may not support partial indexes; ignore
-        pass
+    # IngestionState and the null-score partial index are created by the migrations
+    ensure_schema(conn)
 
     # Read pointer (last processed upcoming match timestamp + id)
     cur.execute("SELECT value FROM IngestionState WHERE key = 'upcoming_pointer_ts'")
@@ -146,8 +134,10 @@ Examples:
     print(f"  Scheduled: {match_ts_utc}")
     print(f"\n⏳ Ingesting match {match_id}...\n")
     
-    # Ingest the match (use async ingest_matches so we can pass validate flag)
-    asyncio.run(vlr_ingest.ingest_matches([match_id], validate=not args.no_validate))
+    # Ingest the match (use async ingest_matches so we can pass validate flag);
+    # scheduled runs recompute Elo at most once per debounce window
+    with deferred(debounce=RECOMPUTE_DEBOUNCE_SECONDS):
+        asyncio.run(vlr_ingest.ingest_matches([match_id], validate=not args.no_validate))
     
     # Advance pointer to this match's timestamp and id
     cur = conn.cursor()
@@ -162,7 +152,7 @@ Examples:
     conn.commit()
     conn.close()
     
-    print("\n✓ Done! Match has been ingested and Elo snapshots have been recalculated.")
+    print("\n✓ Done! Match has been ingested (Elo snapshots recalculated unless deferred by the debounce window).")
     return 0
 
 
@@ -0,0 +1,160 @@
+"""
+Materialized aggregate tables.
+
+Pages that list every team or player read precomputed rows instead of
+running several GROUP BY queries per entity:
+
+- Team_Season_Stats / Player_Season_Stats (season_stats)
+- Team_Map_Stats / Team_Comp_Stats (map_stats)
+- Head_To_Head (head_to_head)
+
+Each materializer recomputes whole (entity, season) rows from the base
+tables, either for everything (rebuild) or only for the entities touched by
+a set of changed matches (refresh). Changed matches come from the
+ChangeLog (consumer "aggregates", see changelog), so refresh_aggregates()
+after an ingest only touches what that ingest changed. A deleted match
+triggers a full rebuild, since its teams can no longer be looked up.
+
+Renames don't reach the log (team keys are derived columns); `backfill
+team-keys` rebuilds when keys changed, otherwise run a rebuild after one:
+
+  python -m loadDB.cli aggregates refresh
+  python -m loadDB.cli aggregates rebuild
+  python -m loadDB.cli aggregates check    # stored rows vs a full rebuild
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set
+
+from .. import changelog
+from . import head_to_head, map_stats, season_stats
+from .scope import build_player_scope, build_team_scope
+
+# Run in order by refresh_aggregates / rebuild_aggregates
+MATERIALIZERS = [
+    season_stats.refresh,
+    map_stats.refresh,
+    head_to_head.refresh,
+]
+
+CONSUMER = "aggregates"
+
+# Tables compared by check_aggregates
+AGGREGATE_TABLES = [
+    "Team_Season_Stats",
+    "Player_Season_Stats",
+    "Team_Map_Stats",
+    "Team_Comp_Stats",
+    "Head_To_Head",
+]
+
+
+def _set_scope(
+    conn: sqlite3.Connection, match_ids: Iterable[int], prior: Iterable[changelog.PriorState] = ()
+) -> None:
+    """
+    Load the changed match IDs into temp._agg_matches, and their logged
+    pre-change state into temp._agg_prior_matches / _agg_prior_players (see
+    scope), for the materializers to join.
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _agg_matches (match_id INTEGER PRIMARY KEY)")
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS _agg_prior_matches (match_id INTEGER, team_a_key TEXT, team_b_key TEXT, season INTEGER)"
+    )
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _agg_prior_players (match_id INTEGER, player TEXT)")
+    for table in ("_agg_matches", "_agg_prior_matches", "_agg_prior_players"):
+        conn.execute(f"DELETE FROM temp.{table}")
+    conn.executemany("INSERT OR IGNORE INTO temp._agg_matches (match_id) VALUES (?)", [(int(m),) for m in match_ids])
+    prior = list(prior)
+    conn.executemany(
+        "INSERT INTO temp._agg_prior_matches (match_id, team_a_key, team_b_key, season) VALUES (?, ?, ?, ?)",
+        [(p.match_id, p.team_a_key, p.team_b_key, p.season) for p in prior if p.table_name == "Matches"],
+    )
+    conn.executemany(
+        "INSERT INTO temp._agg_prior_players (match_id, player) VALUES (?, ?)",
+        [(p.match_id, p.player) for p in prior if p.table_name == "Player_Stats" and p.player is not None],
+    )
+
+
+def rebuild_aggregates(conn: sqlite3.Connection) -> None:
+    """Recompute every aggregate table from scratch (caller commits)."""
+    latest = changelog.latest_seq(conn)
+    for materialize in MATERIALIZERS:
+        materialize(conn, full=True)
+    changelog.advance(conn, CONSUMER, latest)
+
+
+def refresh_aggregates(conn: sqlite3.Connection, match_ids: Optional[List[int]] = None) -> int:
+    """
+    Recompute the aggregate rows touched by changed matches (caller commits).
+
+    Args:
+        conn: Database connection
+        match_ids: Matches to refresh; default: every match in the ChangeLog
+                   after the stored cursor (a full rebuild if there is no cursor),
+                   including the teams, seasons and players those matches had
+                   before the change
+
+    Returns:
+        Number of changed matches processed (-1 for a full rebuild)
+    """
+    if match_ids is None:
+        if changelog.get_cursor(conn, CONSUMER) is None:
+            rebuild_aggregates(conn)
+            return -1
+        batch = changelog.read_changes(conn, CONSUMER)
+        if batch.deleted_match_ids():
+            rebuild_aggregates(conn)
+            return -1
+        match_ids = sorted(batch.match_ids)
+        prior = batch.prior
+        changelog.advance(conn, CONSUMER, batch.last_seq)
+    else:
+        prior = []
+    if not match_ids:
+        return 0
+    _set_scope(conn, match_ids, prior)
+    build_team_scope(conn)
+    build_player_scope(conn)
+    for materialize in MATERIALIZERS:
+        materialize(conn, full=False)
+    return len(match_ids)
+
+
+def _snapshot(conn: sqlite3.Connection, table: str) -> Set[tuple]:
+    # Rounded so summation-order noise in averages doesn't count as a difference
+    return {
+        tuple(round(v, 9) if isinstance(v, float) else v for v in row)
+        for row in conn.execute(f"SELECT * FROM {table}")
+    }
+
+
+def check_aggregates(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Compare the stored aggregates with a full rebuild, without keeping it.
+
+    The rebuild runs inside a savepoint that is rolled back, so an incremental
+    refresh can be verified against it (e.g. after updates that move a match
+    to another team or season).
+
+    Returns:
+        Table -> number of rows present in only one of the two versions
+    """
+    before = {table: _snapshot(conn, table) for table in AGGREGATE_TABLES}
+    conn.execute("SAVEPOINT check_aggregates")
+    try:
+        for materialize in MATERIALIZERS:
+            materialize(conn, full=True)
+        after = {table: _snapshot(conn, table) for table in AGGREGATE_TABLES}
+    finally:
+        conn.execute("ROLLBACK TO check_aggregates")
+        conn.execute("RELEASE check_aggregates")
+    return {table: len(before[table] ^ after[table]) for table in AGGREGATE_TABLES}
+
+
+__all__ = [
+    "AGGREGATE_TABLES",
+    "MATERIALIZERS",
+    "check_aggregates",
+    "refresh_aggregates",
+    "rebuild_aggregates",
+]
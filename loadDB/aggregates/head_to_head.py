@@ -0,0 +1,148 @@
+"""
+Head_To_Head.
+
+One row per (team_key_lo, team_key_hi, season), where lo/hi are the two
+canonical team keys in sorted order, so a pair has exactly one row per
+season whichever side each team was listed on. Counts cover completed
+matches: matches, match wins per side, map wins per side and the most
+recent match ID.
+
+Lookups for a pair are a primary-key read (see lookup()).
+"""
+import sqlite3
+from typing import Dict, Optional
+
+from ..normalizers.team import team_key
+
+# Matches where team_a sorts first (lo = team_a) and the reverse
+_ORIENTATIONS = (("a", "b"), ("b", "a"))
+
+_PAIR_SIDE = """
+        SELECT m.match_id, m.season, m.match_epoch, m.team_{lo}_key AS lo, m.team_{hi}_key AS hi,
+               m.team_{lo}_score AS lo_score, m.team_{hi}_score AS hi_score, '{lo}' AS lo_side
+        FROM Matches m
+        {scope}
+        WHERE m.team_{lo}_key < m.team_{hi}_key AND m.season IS NOT NULL
+          AND m.team_a_score IS NOT NULL AND m.team_b_score IS NOT NULL"""
+
+_PAIR_SCOPE_JOIN = (
+    "JOIN temp._agg_pair_scope sc ON sc.lo = m.team_{lo}_key AND sc.hi = m.team_{hi}_key AND sc.season = m.season"
+)
+
+_INSERT = """
+    INSERT INTO Head_To_Head (
+        team_key_lo, team_key_hi, season, matches, wins_lo, wins_hi, maps_lo, maps_hi, last_match_id
+    )
+    WITH pairs AS ({pairs}
+    ),
+    map_agg AS (
+        SELECT p.lo, p.hi, p.season,
+               SUM(CASE WHEN p.lo_side = 'a' THEN mp.team_a_score > mp.team_b_score
+                        ELSE mp.team_b_score > mp.team_a_score END) AS maps_lo,
+               SUM(CASE WHEN p.lo_side = 'a' THEN mp.team_b_score > mp.team_a_score
+                        ELSE mp.team_a_score > mp.team_b_score END) AS maps_hi
+        FROM pairs p
+        JOIN Maps mp ON mp.match_id = p.match_id
+        WHERE mp.team_a_score IS NOT NULL AND mp.team_b_score IS NOT NULL
+        GROUP BY p.lo, p.hi, p.season
+    ),
+    latest AS (
+        SELECT lo, hi, season, match_id FROM (
+            SELECT lo, hi, season, match_id,
+                   ROW_NUMBER() OVER (PARTITION BY lo, hi, season ORDER BY match_epoch DESC, match_id DESC) AS rn
+            FROM pairs
+        ) WHERE rn = 1
+    )
+    SELECT p.lo, p.hi, p.season, COUNT(*),
+           SUM(p.lo_score > p.hi_score), SUM(p.hi_score > p.lo_score),
+           COALESCE(ma.maps_lo, 0), COALESCE(ma.maps_hi, 0), l.match_id
+    FROM pairs p
+    LEFT JOIN map_agg ma ON ma.lo = p.lo AND ma.hi = p.hi AND ma.season = p.season
+    JOIN latest l ON l.lo = p.lo AND l.hi = p.hi AND l.season = p.season
+    GROUP BY p.lo, p.hi, p.season
+"""
+
+
+def _build_pair_scope(conn: sqlite3.Connection) -> None:
+    """Pairs/seasons of the changed matches, now and before the change (temp._agg_prior_matches, see scope)."""
+    conn.execute("DROP TABLE IF EXISTS temp._agg_pair_scope")
+    conn.execute("CREATE TEMP TABLE _agg_pair_scope (lo TEXT, hi TEXT, season INTEGER, PRIMARY KEY (lo, hi, season))")
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO temp._agg_pair_scope (lo, hi, season)
+        WITH states AS (
+            SELECT m.team_a_key, m.team_b_key, m.season
+            FROM Matches m JOIN temp._agg_matches c ON c.match_id = m.match_id
+            UNION
+            SELECT team_a_key, team_b_key, season FROM temp._agg_prior_matches
+        )
+        SELECT MIN(team_a_key, team_b_key), MAX(team_a_key, team_b_key), season
+        FROM states
+        WHERE team_a_key IS NOT NULL AND team_b_key IS NOT NULL AND season IS NOT NULL
+        """
+    )
+
+
+def refresh(conn: sqlite3.Connection, full: bool = False) -> None:
+    """
+    Recompute head-to-head rows (caller commits).
+
+    Args:
+        conn: Database connection
+        full: Rebuild every row; otherwise only the pairs/seasons of the
+              matches in temp._agg_matches
+    """
+    cur = conn.cursor()
+    if full:
+        cur.execute("DELETE FROM Head_To_Head")
+    else:
+        _build_pair_scope(conn)
+        cur.execute(
+            """
+            DELETE FROM Head_To_Head
+            WHERE (team_key_lo, team_key_hi, season) IN (SELECT lo, hi, season FROM temp._agg_pair_scope)
+            """
+        )
+    pairs = "\n        UNION ALL".join(
+        _PAIR_SIDE.format(lo=lo, hi=hi, scope="" if full else _PAIR_SCOPE_JOIN.format(lo=lo, hi=hi))
+        for lo, hi in _ORIENTATIONS
+    )
+    cur.execute(_INSERT.format(pairs=pairs))
+
+
+def lookup(conn: sqlite3.Connection, team_a: str, team_b: str, season: Optional[int] = None) -> Dict:
+    """
+    Head-to-head record of team_a against team_b.
+
+    Args:
+        conn: Database connection
+        team_a: Team name (any alias)
+        team_b: Opponent name (any alias)
+        season: Season to read (default: all seasons summed)
+
+    Returns:
+        Dictionary with matches, wins, losses, maps_won, maps_lost (from
+        team_a's side) and last_match_id (None if they never met)
+    """
+    key_a, key_b = team_key(team_a), team_key(team_b)
+    lo, hi = sorted((key_a, key_b))
+    sql = (
+        "SELECT COALESCE(SUM(matches), 0), COALESCE(SUM(wins_lo), 0), COALESCE(SUM(wins_hi), 0), "
+        "COALESCE(SUM(maps_lo), 0), COALESCE(SUM(maps_hi), 0), "
+        "(SELECT last_match_id FROM Head_To_Head WHERE team_key_lo = ? AND team_key_hi = ?"
+        + (" AND season = ?" if season is not None else "")
+        + " ORDER BY season DESC LIMIT 1) "
+        "FROM Head_To_Head WHERE team_key_lo = ? AND team_key_hi = ?"
+        + (" AND season = ?" if season is not None else "")
+    )
+    params = (lo, hi) + ((season,) if season is not None else ())
+    matches, wins_lo, wins_hi, maps_lo, maps_hi, last_match_id = conn.execute(sql, params + params).fetchone()
+    a_is_lo = key_a == lo
+    return {
+        "matches": matches,
+        "wins": wins_lo if a_is_lo else wins_hi,
+        "losses": wins_hi if a_is_lo else wins_lo,
+        "maps_won": maps_lo if a_is_lo else maps_hi,
+        "maps_lost": maps_hi if a_is_lo else maps_lo,
+        "last_match_id": last_match_id,
+    }
@@ -0,0 +1,109 @@
+"""
+Team_Map_Stats and Team_Comp_Stats.
+
+Team_Map_Stats: one row per (team_key, season, map) with maps played/won,
+round difference and how often the team picked the map in the veto.
+
+Team_Comp_Stats: one row per (team_key, season, map, comp_signature), where
+the signature is the team's five agents on that map, lowercased, sorted and
+comma-joined ("fade,omen,raze,sova,viper"). Maps without exactly five stat
+lines for the team are left out.
+
+Map names come from MapsDim (the normalized display name), so Maps and
+Vetoes rows for the same map share a key.
+"""
+import sqlite3
+
+from .scope import delete_team_rows, team_sides
+
+_VETO_SCOPE_JOIN = "JOIN temp._agg_team_scope sc ON sc.team_key = v.team_key AND sc.season = m.season"
+
+_MAP_INSERT = """
+    INSERT INTO Team_Map_Stats (team_key, season, map, played, won, round_diff, pick_count)
+    WITH sides AS ({sides}
+    ),
+    played AS (
+        SELECT s.team_key, s.season, COALESCE(md.map_name, mp.map) AS map, COUNT(*) AS played,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_a_score > mp.team_b_score
+                        ELSE mp.team_b_score > mp.team_a_score END) AS won,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_a_score - mp.team_b_score
+                        ELSE mp.team_b_score - mp.team_a_score END) AS round_diff
+        FROM sides s
+        JOIN Maps mp ON mp.match_id = s.match_id
+        LEFT JOIN MapsDim md ON md.map_dim_id = mp.map_dim_id
+        WHERE mp.team_a_score IS NOT NULL AND mp.team_b_score IS NOT NULL
+          AND mp.map IS NOT NULL AND mp.map NOT IN ('', 'Unknown')
+        GROUP BY s.team_key, s.season, COALESCE(md.map_name, mp.map)
+    ),
+    picks AS (
+        SELECT v.team_key, m.season, COALESCE(md.map_name, v.map) AS map, COUNT(*) AS pick_count
+        FROM Vetoes v
+        JOIN Matches m ON m.match_id = v.match_id
+        {veto_scope}
+        LEFT JOIN MapsDim md ON md.map_key = LOWER(v.map)
+        WHERE v.action = 'pick' AND v.team_key IS NOT NULL AND m.season IS NOT NULL
+        GROUP BY v.team_key, m.season, COALESCE(md.map_name, v.map)
+    ),
+    keys AS (
+        SELECT team_key, season, map FROM played
+        UNION
+        SELECT team_key, season, map FROM picks
+    )
+    SELECT k.team_key, k.season, k.map,
+           COALESCE(p.played, 0), COALESCE(p.won, 0), COALESCE(p.round_diff, 0), COALESCE(pk.pick_count, 0)
+    FROM keys k
+    LEFT JOIN played p ON p.team_key = k.team_key AND p.season = k.season AND p.map = k.map
+    LEFT JOIN picks pk ON pk.team_key = k.team_key AND pk.season = k.season AND pk.map = k.map
+"""
+
+_COMP_INSERT = """
+    INSERT INTO Team_Comp_Stats (team_key, season, map, comp_signature, played, won)
+    WITH sides AS ({sides}
+    ),
+    lines AS (
+        SELECT s.team_key, s.season, s.side, ps.map_id, LOWER(TRIM(ps.agent)) AS agent,
+               COUNT(*) OVER w AS n,
+               -- ordered window frame: agents concatenate in sorted order
+               GROUP_CONCAT(LOWER(TRIM(ps.agent)), ',') OVER (
+                   w ORDER BY LOWER(TRIM(ps.agent)) ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+               ) AS comp_signature
+        FROM sides s
+        JOIN Player_Stats ps ON ps.match_id = s.match_id AND ps.team_key = s.team_key
+        WHERE ps.agent IS NOT NULL AND TRIM(ps.agent) != ''
+        WINDOW w AS (PARTITION BY s.team_key, ps.map_id)
+    ),
+    comps AS (
+        SELECT DISTINCT team_key, season, side, map_id, comp_signature FROM lines WHERE n = 5
+    )
+    SELECT c.team_key, c.season, COALESCE(md.map_name, mp.map), c.comp_signature, COUNT(*),
+           SUM(CASE WHEN c.side = 'a' THEN mp.team_a_score > mp.team_b_score
+                    ELSE mp.team_b_score > mp.team_a_score END)
+    FROM comps c
+    JOIN Maps mp ON mp.id = c.map_id
+    LEFT JOIN MapsDim md ON md.map_dim_id = mp.map_dim_id
+    WHERE mp.team_a_score IS NOT NULL AND mp.team_b_score IS NOT NULL
+      AND mp.map IS NOT NULL AND mp.map NOT IN ('', 'Unknown')
+    GROUP BY c.team_key, c.season, COALESCE(md.map_name, mp.map), c.comp_signature
+"""
+
+
+def refresh(conn: sqlite3.Connection, full: bool = False) -> None:
+    """
+    Recompute map-pool and composition stats (caller commits).
+
+    Args:
+        conn: Database connection
+        full: Rebuild every row; otherwise only the (team, season) pairs in
+              temp._agg_team_scope (see scope; includes the pairs a changed
+              match belonged to before the change)
+    """
+    cur = conn.cursor()
+    if full:
+        cur.execute("DELETE FROM Team_Map_Stats")
+        cur.execute("DELETE FROM Team_Comp_Stats")
+    else:
+        delete_team_rows(conn, "Team_Map_Stats")
+        delete_team_rows(conn, "Team_Comp_Stats")
+    sides = team_sides(scoped=not full)
+    cur.execute(_MAP_INSERT.format(sides=sides, veto_scope="" if full else _VETO_SCOPE_JOIN))
+    cur.execute(_COMP_INSERT.format(sides=sides))
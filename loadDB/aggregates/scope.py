@@ -0,0 +1,95 @@
+"""
+Scope tables for incremental aggregate refreshes.
+
+refresh_aggregates() loads the changed match IDs into temp._agg_matches and
+their pre-change state from the ChangeLog into temp._agg_prior_matches
+(match_id, team_a_key, team_b_key, season) and temp._agg_prior_players
+(match_id, player); the helpers here derive the (team_key, season) and
+(player, season) pairs those matches touch now or touched before, so each
+materializer can delete and recompute just those rows (a match that moved to
+another team or season leaves its old rows too). PLAYER_SCOPE_JOIN restricts a query over Player_Stats ps and
+Matches m to the scope; team_sides() builds the per-team view of Matches.
+"""
+import sqlite3
+
+_TEAM_SCOPE_JOIN = "JOIN temp._agg_team_scope sc ON sc.team_key = m.team_{side}_key AND sc.season = m.season"
+PLAYER_SCOPE_JOIN = "JOIN temp._agg_player_scope sc ON sc.player = ps.player AND sc.season = m.season"
+
+_TEAM_SIDE = """
+        SELECT m.match_id, m.season, m.match_date, m.team_{side}_key AS team_key,
+               m.team_{other}_key AS opp_key, m.team_{side}_score AS score,
+               m.team_{other}_score AS opp_score, '{side}' AS side
+        FROM Matches m
+        {scope}
+        WHERE m.team_{side}_key IS NOT NULL AND m.season IS NOT NULL
+          AND m.team_a_score IS NOT NULL AND m.team_b_score IS NOT NULL"""
+
+
+def team_sides(scoped: bool) -> str:
+    """
+    SQL for one row per (completed match, team): match_id, season, match_date,
+    team_key, opp_key, score, opp_score and side ('a'/'b', to pick the team's
+    columns in Maps). With scoped=True only teams in temp._agg_team_scope.
+    """
+    return "\n        UNION ALL".join(
+        _TEAM_SIDE.format(side=side, other=other, scope=_TEAM_SCOPE_JOIN.format(side=side) if scoped else "")
+        for side, other in (("a", "b"), ("b", "a"))
+    )
+
+
+def build_team_scope(conn: sqlite3.Connection) -> None:
+    """Fill temp._agg_team_scope with the teams/seasons of the changed matches, current and prior."""
+    conn.execute("DROP TABLE IF EXISTS temp._agg_team_scope")
+    conn.execute("CREATE TEMP TABLE _agg_team_scope (team_key TEXT, season INTEGER, PRIMARY KEY (team_key, season))")
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO temp._agg_team_scope (team_key, season)
+        WITH states AS (
+            SELECT m.team_a_key, m.team_b_key, m.season
+            FROM Matches m JOIN temp._agg_matches c ON c.match_id = m.match_id
+            UNION
+            SELECT team_a_key, team_b_key, season FROM temp._agg_prior_matches
+        )
+        SELECT team_a_key, season FROM states WHERE team_a_key IS NOT NULL AND season IS NOT NULL
+        UNION
+        SELECT team_b_key, season FROM states WHERE team_b_key IS NOT NULL AND season IS NOT NULL
+        """
+    )
+
+
+def build_player_scope(conn: sqlite3.Connection) -> None:
+    """
+    Fill temp._agg_player_scope with the players/seasons of the changed matches.
+
+    Every player a match has or had a stat line for is paired with every
+    season the match is or was in.
+    """
+    conn.execute("DROP TABLE IF EXISTS temp._agg_player_scope")
+    conn.execute("CREATE TEMP TABLE _agg_player_scope (player TEXT, season INTEGER, PRIMARY KEY (player, season))")
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO temp._agg_player_scope (player, season)
+        WITH players AS (
+            SELECT ps.match_id, ps.player
+            FROM temp._agg_matches c JOIN Player_Stats ps ON ps.match_id = c.match_id
+            UNION
+            SELECT match_id, player FROM temp._agg_prior_players
+        ),
+        seasons AS (
+            SELECT m.match_id, m.season
+            FROM temp._agg_matches c JOIN Matches m ON m.match_id = c.match_id
+            UNION
+            SELECT match_id, season FROM temp._agg_prior_matches
+        )
+        SELECT DISTINCT p.player, s.season
+        FROM players p JOIN seasons s ON s.match_id = p.match_id
+        WHERE p.player IS NOT NULL AND s.season IS NOT NULL
+        """
+    )
+
+
+def delete_team_rows(conn: sqlite3.Connection, table: str) -> None:
+    """Delete the rows of a (team_key, season, ...) table that fall in the team scope."""
+    conn.execute(
+        f"DELETE FROM {table} WHERE (team_key, season) IN (SELECT team_key, season FROM temp._agg_team_scope)"
+    )
@@ -0,0 +1,138 @@
+"""
+Team_Season_Stats and Player_Season_Stats.
+
+One row per (team_key, season) / (player, season), computed from completed
+matches (both scores set). Season is Matches.season.
+
+Team rows: match record, map record, rounds won/lost, the team's average
+player rating/ACS/K/D/A and first kills/deaths, last match date.
+
+Player rows: matches (and wins), maps played, average rating/ACS/K/D/A,
+first kills/deaths, last match date, primary team (most maps that season)
+and latest team (team of the most recent match).
+"""
+import sqlite3
+
+from .scope import PLAYER_SCOPE_JOIN, delete_team_rows, team_sides
+
+_TEAM_INSERT = """
+    INSERT INTO Team_Season_Stats (
+        team_key, season, team_id, team_name, matches, wins, losses,
+        maps_won, maps_lost, rounds_won, rounds_lost, round_diff,
+        avg_rating, avg_acs, avg_kills, avg_deaths, avg_assists,
+        first_kills, first_deaths, last_match_date
+    )
+    WITH sides AS ({sides}
+    ),
+    match_agg AS (
+        SELECT team_key, season, COUNT(*) AS matches,
+               SUM(score > opp_score) AS wins, SUM(score < opp_score) AS losses,
+               MAX(match_date) AS last_match_date
+        FROM sides GROUP BY team_key, season
+    ),
+    map_agg AS (
+        SELECT s.team_key, s.season,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_a_score > mp.team_b_score
+                        ELSE mp.team_b_score > mp.team_a_score END) AS maps_won,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_a_score < mp.team_b_score
+                        ELSE mp.team_b_score < mp.team_a_score END) AS maps_lost,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_a_score ELSE mp.team_b_score END) AS rounds_won,
+               SUM(CASE WHEN s.side = 'a' THEN mp.team_b_score ELSE mp.team_a_score END) AS rounds_lost
+        FROM sides s
+        JOIN Maps mp ON mp.match_id = s.match_id
+        WHERE mp.team_a_score IS NOT NULL AND mp.team_b_score IS NOT NULL
+        GROUP BY s.team_key, s.season
+    ),
+    stat_agg AS (
+        SELECT s.team_key, s.season,
+               AVG(ps.rating) AS avg_rating, AVG(ps.acs) AS avg_acs, AVG(ps.kills) AS avg_kills,
+               AVG(ps.deaths) AS avg_deaths, AVG(ps.assists) AS avg_assists,
+               SUM(ps.first_kills) AS first_kills, SUM(ps.first_deaths) AS first_deaths
+        FROM sides s
+        JOIN Player_Stats ps ON ps.match_id = s.match_id AND ps.team_key = s.team_key
+        GROUP BY s.team_key, s.season
+    )
+    SELECT ma.team_key, ma.season, t.team_id, t.team_name, ma.matches, ma.wins, ma.losses,
+           COALESCE(mp.maps_won, 0), COALESCE(mp.maps_lost, 0),
+           COALESCE(mp.rounds_won, 0), COALESCE(mp.rounds_lost, 0),
+           COALESCE(mp.rounds_won, 0) - COALESCE(mp.rounds_lost, 0),
+           st.avg_rating, st.avg_acs, st.avg_kills, st.avg_deaths, st.avg_assists,
+           COALESCE(st.first_kills, 0), COALESCE(st.first_deaths, 0), ma.last_match_date
+    FROM match_agg ma
+    LEFT JOIN map_agg mp ON mp.team_key = ma.team_key AND mp.season = ma.season
+    LEFT JOIN stat_agg st ON st.team_key = ma.team_key AND st.season = ma.season
+    LEFT JOIN Teams t ON t.team_key = ma.team_key
+"""
+
+_PLAYER_INSERT = """
+    INSERT INTO Player_Season_Stats (
+        player, season, player_id, primary_team_key, latest_team_key,
+        matches, wins, maps_played,
+        avg_rating, avg_acs, avg_kills, avg_deaths, avg_assists,
+        first_kills, first_deaths, last_match_date
+    )
+    WITH base AS (
+        SELECT ps.player, m.season, ps.match_id, ps.map_id, ps.team_key,
+               ps.rating, ps.acs, ps.kills, ps.deaths, ps.assists, ps.first_kills, ps.first_deaths,
+               m.match_date, m.match_epoch,
+               CASE WHEN ps.team_key = m.team_a_key THEN m.team_a_score > m.team_b_score
+                    WHEN ps.team_key = m.team_b_key THEN m.team_b_score > m.team_a_score END AS won
+        FROM Player_Stats ps
+        JOIN Matches m ON m.match_id = ps.match_id
+        {scope}
+        WHERE m.season IS NOT NULL AND ps.player IS NOT NULL AND ps.player != ''
+          AND m.team_a_score IS NOT NULL AND m.team_b_score IS NOT NULL
+    ),
+    per_match AS (
+        SELECT player, season, match_id, MAX(won) AS won FROM base GROUP BY player, season, match_id
+    ),
+    match_agg AS (
+        SELECT player, season, COUNT(*) AS matches, SUM(won) AS wins FROM per_match GROUP BY player, season
+    ),
+    team_rank AS (
+        SELECT player, season, team_key,
+               ROW_NUMBER() OVER (PARTITION BY player, season ORDER BY COUNT(*) DESC, MAX(match_epoch) DESC) AS primary_rank,
+               ROW_NUMBER() OVER (PARTITION BY player, season ORDER BY MAX(match_epoch) DESC, COUNT(*) DESC) AS latest_rank
+        FROM base WHERE team_key IS NOT NULL
+        GROUP BY player, season, team_key
+    ),
+    totals AS (
+        SELECT player, season, COUNT(DISTINCT map_id) AS maps_played,
+               AVG(rating) AS avg_rating, AVG(acs) AS avg_acs, AVG(kills) AS avg_kills,
+               AVG(deaths) AS avg_deaths, AVG(assists) AS avg_assists,
+               SUM(first_kills) AS first_kills, SUM(first_deaths) AS first_deaths,
+               MAX(match_date) AS last_match_date
+        FROM base GROUP BY player, season
+    )
+    SELECT t.player, t.season, p.player_id, pr.team_key, lr.team_key,
+           ma.matches, COALESCE(ma.wins, 0), t.maps_played,
+           t.avg_rating, t.avg_acs, t.avg_kills, t.avg_deaths, t.avg_assists,
+           COALESCE(t.first_kills, 0), COALESCE(t.first_deaths, 0), t.last_match_date
+    FROM totals t
+    JOIN match_agg ma ON ma.player = t.player AND ma.season = t.season
+    LEFT JOIN team_rank pr ON pr.player = t.player AND pr.season = t.season AND pr.primary_rank = 1
+    LEFT JOIN team_rank lr ON lr.player = t.player AND lr.season = t.season AND lr.latest_rank = 1
+    LEFT JOIN Players p ON p.player_key = t.player
+"""
+
+
+def refresh(conn: sqlite3.Connection, full: bool = False) -> None:
+    """
+    Recompute season stats (caller commits).
+
+    Args:
+        conn: Database connection
+        full: Rebuild every row; otherwise only the (team, season) and
+              (player, season) pairs in the scope tables (see scope)
+    """
+    cur = conn.cursor()
+    if full:
+        player_scope = ""
+        cur.execute("DELETE FROM Team_Season_Stats")
+        cur.execute("DELETE FROM Player_Season_Stats")
+    else:
+        delete_team_rows(conn, "Team_Season_Stats")
+        cur.execute("DELETE FROM Player_Season_Stats WHERE (player, season) IN (SELECT player, season FROM temp._agg_player_scope)")
+        player_scope = PLAYER_SCOPE_JOIN
+    cur.execute(_TEAM_INSERT.format(sides=team_sides(scoped=not full)))
+    cur.execute(_PLAYER_INSERT.format(scope=player_scope))
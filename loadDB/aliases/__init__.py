@@ -7,11 +7,15 @@ This module provides a centralized way to load and use aliases for:
 - Tournaments/Events
 - Match Types
 
-All aliases are stored in JSON files and loaded at module import time.
+All aliases are stored in JSON files, compiled into one AliasNormalizer per
+entity type at import time and reloaded when a file changes.
 """
 import json
 import os
-from typing import Dict, Literal, Optional
+import time
+import unicodedata
+from functools import lru_cache, wraps
+from typing import Callable, Dict, List, Literal, Optional
 
 # Entity types that can have aliases
 EntityType = Literal["team", "map", "tournament", "match_type"]
@@ -27,20 +31,15 @@ _ALIAS_FILES: Dict[EntityType, str] = {
     "match_type": os.path.join(_ALIASES_DIR, "match_types.json"),
 }
 
-# Cache for loaded aliases
-_ALIAS_CACHE: Dict[EntityType, Dict[str, str]] = {}
+# Results memoized per entity type (distinct names seen in a replay are far fewer)
+ALIAS_CACHE_SIZE = 65536
 
+# How often (seconds) a normalizer stats its JSON file for changes
+ALIAS_RELOAD_CHECK_SECONDS = 2.0
 
-def _load_alias_file(filepath: str) -> Dict[str, str]:
-    """
-    Load aliases from a JSON file.
-    
-    Args:
-        filepath: Path to the JSON alias file
-    
-    Returns:
-        Dictionary mapping lowercase variant names to canonical names
-    """
+
+def _read_alias_file(filepath: str) -> Dict[str, str]:
+    """Variant -> canonical name as written in a JSON alias file ({} if missing or invalid)."""
     if not os.path.exists(filepath):
         return {}
     
@@ -48,34 +47,154 @@ def _load_alias_file(filepath: str) -> Dict[str, str]:
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
             if isinstance(data, dict):
-                # Normalize keys to lowercase for consistent lookups
-                return {str(k).lower().strip(): str(v).strip() for k, v in data.items()}
+                return {str(k).strip(): str(v).strip() for k, v in data.items()}
     except Exception:
         pass
     
     return {}
 
 
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics (e.g., 'Leviatán' -> 'leviatan')."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _mtime(filepath: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(filepath)
+    except OSError:
+        return None
+
+
+class AliasNormalizer:
+    """
+    Alias lookup for one entity type.
+    
+    The JSON file is compiled into a single dict keyed by the raw, lowercased
+    and diacritic-folded form of every variant, and results are memoized in a
+    bounded LRU. The file's mtime is checked at most every
+    ALIAS_RELOAD_CHECK_SECONDS; when it changes the aliases are reloaded and
+    every memo registered through memoize() is cleared, so long-running
+    workers pick up edited aliases without restarting.
+    """
+
+    def __init__(self, entity_type: EntityType, filepath: str, cache_size: int = ALIAS_CACHE_SIZE):
+        self.entity_type = entity_type
+        self.filepath = filepath
+        self.cache_size = cache_size
+        self.aliases: Dict[str, str] = {}
+        self._lookup: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._memos: List[Callable] = []
+        self._load()
+        self.get = self.memoize(self._resolve)
+
+    def _load(self) -> None:
+        self._mtime = _mtime(self.filepath)
+        raw = _read_alias_file(self.filepath)
+        self.aliases = {k.lower(): v for k, v in raw.items()}
+        # Exact spelling first, then lowercased, then diacritic-folded variants
+        lookup = dict(raw)
+        for key, canonical in self.aliases.items():
+            lookup.setdefault(key, canonical)
+        for key, canonical in self.aliases.items():
+            lookup.setdefault(fold(key), canonical)
+        self._lookup = lookup
+
+    def check_reload(self) -> bool:
+        """
+        Reload the aliases if the JSON file changed (throttled).
+        
+        Returns:
+            True if the aliases were reloaded
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + ALIAS_RELOAD_CHECK_SECONDS
+        if _mtime(self.filepath) == self._mtime:
+            return False
+        self.reload()
+        return True
+
+    def reload(self) -> None:
+        """Reload the JSON file and clear every memo."""
+        self._load()
+        for memo in self._memos:
+            memo.cache_clear()
+
+    def memoize(self, func: Callable) -> Callable:
+        """
+        Wrap a function of alias-normalized names in an LRU memo that is
+        cleared whenever these aliases reload.
+        
+        Args:
+            func: Function of hashable arguments
+        
+        Returns:
+            Memoized function (with cache_info / cache_clear)
+        """
+        cached = lru_cache(maxsize=self.cache_size)(func)
+        self._memos.append(cached)
+
+        @wraps(func)
+        def wrapper(*args):
+            self.check_reload()
+            return cached(*args)
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    def _resolve(self, name: str) -> Optional[str]:
+        key = name.strip()
+        lookup = self._lookup
+        canonical = lookup.get(key)
+        if canonical is None:
+            key = key.lower()
+            canonical = lookup.get(key)
+            if canonical is None:
+                canonical = lookup.get(fold(key))
+        return canonical
+
+    def normalize(self, name: str) -> str:
+        """Canonical name if an alias exists, else the name trimmed."""
+        if not name:
+            return ""
+        return self.get(name) or name.strip()
+
+
+_NORMALIZERS: Dict[EntityType, AliasNormalizer] = {
+    entity_type: AliasNormalizer(entity_type, filepath) for entity_type, filepath in _ALIAS_FILES.items()
+}
+
+
+def get_normalizer(entity_type: EntityType) -> AliasNormalizer:
+    """The AliasNormalizer for an entity type."""
+    return _NORMALIZERS[entity_type]
+
+
 def load_all_aliases() -> Dict[EntityType, Dict[str, str]]:
     """
     Load all alias files into a unified structure.
     
     Returns:
         Dictionary mapping entity types to their alias dictionaries
+        (lowercase variant -> canonical name, as of the last reload)
     """
-    if _ALIAS_CACHE:
-        return _ALIAS_CACHE
-    
-    for entity_type, filepath in _ALIAS_FILES.items():
-        _ALIAS_CACHE[entity_type] = _load_alias_file(filepath)
-    
-    return _ALIAS_CACHE
+    for normalizer in _NORMALIZERS.values():
+        normalizer.check_reload()
+    return {entity_type: normalizer.aliases for entity_type, normalizer in _NORMALIZERS.items()}
 
 
 def get_alias(entity_type: EntityType, name: str) -> Optional[str]:
     """
     Get canonical name for an entity using aliases.
     
+    Matches the name as given, lowercased, or with diacritics folded.
+    
     Args:
         entity_type: Type of entity (team, map, tournament, match_type)
         name: Variant name to look up
@@ -83,14 +202,10 @@ def get_alias(entity_type: EntityType, name: str) -> Optional[str]:
     Returns:
         Canonical name if alias exists, None otherwise
     """
-    aliases = load_all_aliases()
-    entity_aliases = aliases.get(entity_type, {})
-    
-    if not name:
+    normalizer = _NORMALIZERS.get(entity_type)
+    if normalizer is None or not name:
         return None
-    
-    key = name.lower().strip()
-    return entity_aliases.get(key)
+    return normalizer.get(name)
 
 
 def normalize_entity(entity_type: EntityType, name: str) -> str:
@@ -118,9 +233,6 @@ def normalize_entity(entity_type: EntityType, name: str) -> str:
     return name.strip()
 
 
-# Load aliases on module import
-load_all_aliases()
-
 # Convenience functions for each entity type
 def normalize_team(name: str) -> str:
     """Normalize a team name using aliases."""
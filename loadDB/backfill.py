@@ -1,5 +1,8 @@
 import sqlite3
-from .db_utils import get_conn, ensure_matches_columns
+from .db_utils import get_conn, ensure_matches_columns, update_team_keys, update_match_epochs
+from .dimensions import sync_dimensions
+from .vetoes import update_vetoes
+from .aggregates import rebuild_aggregates
 from .vlr_ingest import scrape_match
 import asyncio
 
@@ -32,6 +35,7 @@ def backfill_missing_timestamps(limit: int = 100):
                 "UPDATE Matches SET match_ts_utc = ? WHERE match_id = ? AND match_ts_utc IS NULL",
                 (ts_utc, mid),
             )
+            update_match_epochs(conn, [mid])
             conn.commit()
 
     asyncio.run(run(ids))
@@ -50,5 +54,87 @@ def backfill_match_dates_from_timestamps():
         WHERE match_ts_utc IS NOT NULL AND (match_date IS NULL OR match_date = '')
         """
     )
+    update_match_epochs(conn, only_missing=True)
     conn.commit()
     conn.close()
+
+
+def backfill_match_epochs(only_missing: bool = False) -> int:
+    """
+    Recompute Matches.match_epoch and season from match_ts_utc/match_date.
+    
+    Args:
+        only_missing: Only fill rows whose match_epoch is NULL
+    
+    Returns:
+        Number of rows updated
+    """
+    conn = get_conn()
+    ensure_matches_columns(conn)
+    try:
+        updated = update_match_epochs(conn, only_missing=only_missing)
+        conn.commit()
+    finally:
+        conn.close()
+    return updated
+
+
+def backfill_team_keys(only_missing: bool = False) -> dict[str, int]:
+    """
+    Recompute Matches.team_a_key/team_b_key and Player_Stats.team_key from
+    the stored team names. Aggregates are rebuilt when any key changed.
+    
+    Args:
+        only_missing: Only fill NULL keys (default recomputes all, e.g. after alias edits)
+    
+    Returns:
+        Dictionary mapping "table.column" to the number of rows updated
+    """
+    conn = get_conn()
+    ensure_matches_columns(conn)
+    try:
+        counts = update_team_keys(conn, only_missing=only_missing)
+        if any(counts.values()):
+            rebuild_aggregates(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+def backfill_dimensions(only_missing: bool = False, prune: bool = False) -> dict[str, int]:
+    """
+    Rebuild the dimension ID columns (team/player/map/agent IDs) from the text columns.
+    
+    Args:
+        only_missing: Only fill NULL IDs (default reassigns all, e.g. after alias edits)
+        prune: Delete dimension rows that are no longer referenced
+    
+    Returns:
+        Dictionary mapping "table.column" to the number of rows updated
+    """
+    conn = get_conn()
+    ensure_matches_columns(conn)
+    try:
+        counts = sync_dimensions(conn, only_missing=only_missing, prune=prune)
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+def backfill_vetoes() -> int:
+    """
+    Rebuild the Vetoes table from Matches.bans_picks (e.g. after alias edits).
+    
+    Returns:
+        Number of matches whose vetoes were rebuilt
+    """
+    conn = get_conn()
+    ensure_matches_columns(conn)
+    try:
+        rebuilt = update_vetoes(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return rebuilt
@@ -0,0 +1,222 @@
+"""
+Change-data capture for the scraped tables.
+
+Triggers on Matches, Maps and Player_Stats append one row per inserted,
+deleted or updated row to ChangeLog(seq, table_name, match_id, op, ts). Updates
+are logged only when a scraped column actually changes, so re-upserting
+identical data and backfills of derived columns (team keys, dimension IDs,
+match epochs) stay out of the log.
+
+Updates and deletes also record what the row looked like before (PRIOR_COLUMNS):
+a Matches row's old team keys and season, a Player_Stats row's old player. A
+consumer can then undo the rows a changed match used to count towards, not
+just recompute the ones it counts towards now (see ChangeBatch.prior). A
+Maps/Player_Stats row moved to another match is logged for both matches.
+
+Downstream jobs (Elo, aggregates, exports, predictions) each keep a cursor:
+the last seq they processed, stored in IngestionState under
+"changelog:<consumer>". The usual loop is
+
+    batch = read_changes(conn, "aggregates")
+    ...recompute batch.match_ids...
+    advance(conn, "aggregates", batch.last_seq)
+    conn.commit()
+
+so the work and the cursor commit together. prune() drops entries every
+registered consumer has already processed.
+"""
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+# Table -> scraped columns whose updates are logged
+TRACKED_TABLES: Dict[str, Tuple[str, ...]] = {
+    "Matches": (
+        "tournament", "stage", "match_type", "match_name", "team_a", "team_b",
+        "team_a_score", "team_b_score", "match_result", "match_ts_utc", "match_date", "bans_picks",
+    ),
+    "Maps": ("match_id", "game_id", "map", "team_a_score", "team_b_score"),
+    "Player_Stats": (
+        "match_id", "map_id", "game_id", "player", "team", "agent", "rating", "acs",
+        "kills", "deaths", "assists", "first_kills", "first_deaths",
+    ),
+}
+
+# Table -> (ChangeLog column, source column) pairs copied from OLD on update/delete
+PRIOR_COLUMNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "Matches": (("old_team_a_key", "team_a_key"), ("old_team_b_key", "team_b_key"), ("old_season", "season")),
+    "Player_Stats": (("old_player", "player"),),
+}
+
+_CURSOR_PREFIX = "changelog:"
+
+
+@dataclass(frozen=True)
+class PriorState:
+    """A logged row as it was before an update/delete (fields the table doesn't have are None)."""
+
+    match_id: int
+    table_name: str
+    team_a_key: Optional[str] = None
+    team_b_key: Optional[str] = None
+    season: Optional[int] = None
+    player: Optional[str] = None
+
+
+@dataclass
+class ChangeBatch:
+    """
+    Changes after a consumer's cursor, up to last_seq.
+
+    entries are (seq, table_name, match_id, op, ts); prior holds the
+    pre-change state logged with updates and deletes, in log order.
+    """
+
+    last_seq: int
+    entries: List[Tuple[int, str, Optional[int], str, str]] = field(default_factory=list)
+    prior: List[PriorState] = field(default_factory=list)
+
+    @property
+    def match_ids(self) -> Set[int]:
+        """Distinct matches touched by the batch."""
+        return {match_id for _, _, match_id, _, _ in self.entries if match_id is not None}
+
+    def deleted_match_ids(self) -> Set[int]:
+        """Matches whose Matches row was deleted."""
+        return {
+            match_id for _, table, match_id, op, _ in self.entries
+            if table == "Matches" and op == "delete" and match_id is not None
+        }
+
+
+def _log_statement(table: str, row: str, op: str, prior: bool, when: str = "") -> str:
+    """
+    INSERT INTO ChangeLog for one trigger row.
+
+    Args:
+        table: Tracked table
+        row: "NEW" or "OLD" (whose match_id is logged)
+        op: insert / update / delete
+        prior: Also copy the table's PRIOR_COLUMNS from OLD
+        when: Optional SQL condition; the entry is only logged if it holds
+    """
+    columns = ["table_name", "match_id", "op"]
+    values = [f"'{table}'", f"{row}.match_id", f"'{op}'"]
+    if prior:
+        for log_col, source_col in PRIOR_COLUMNS.get(table, ()):
+            columns.append(log_col)
+            values.append(f"OLD.{source_col}")
+    where = f" WHERE {when}" if when else ""
+    return f"INSERT INTO ChangeLog ({', '.join(columns)}) SELECT {', '.join(values)}{where};"
+
+
+def install_triggers(conn: sqlite3.Connection) -> None:
+    """(Re)create the ChangeLog triggers on the tracked tables."""
+    for table, columns in TRACKED_TABLES.items():
+        for op in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_changelog_{table.lower()}_{op}")
+        conn.execute(
+            f"""
+            CREATE TRIGGER trg_changelog_{table.lower()}_insert AFTER INSERT ON {table}
+            BEGIN {_log_statement(table, "NEW", "insert", prior=False)} END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER trg_changelog_{table.lower()}_delete AFTER DELETE ON {table}
+            BEGIN {_log_statement(table, "OLD", "delete", prior=True)} END
+            """
+        )
+        update = _log_statement(table, "NEW", "update", prior=True)
+        if "match_id" in columns:
+            # Moved to another match: the old match changed too
+            update += " " + _log_statement(table, "OLD", "update", prior=True, when="OLD.match_id IS NOT NEW.match_id")
+        old = ", ".join(f"OLD.{c}" for c in columns)
+        new = ", ".join(f"NEW.{c}" for c in columns)
+        conn.execute(
+            f"""
+            CREATE TRIGGER trg_changelog_{table.lower()}_update AFTER UPDATE OF {", ".join(columns)} ON {table}
+            WHEN ({old}) IS NOT ({new})
+            BEGIN {update} END
+            """
+        )
+
+
+def latest_seq(conn: sqlite3.Connection) -> int:
+    """Highest seq ever assigned (0 before the first change); pruning doesn't lower it."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'ChangeLog'").fetchone()
+    return row[0] if row else 0
+
+
+def get_cursor(conn: sqlite3.Connection, consumer: str) -> Optional[int]:
+    """Last seq the consumer processed, or None if it never ran."""
+    row = conn.execute(
+        "SELECT value FROM IngestionState WHERE key = ?", (_CURSOR_PREFIX + consumer,)
+    ).fetchone()
+    return int(row[0]) if row else None
+
+
+def advance(conn: sqlite3.Connection, consumer: str, seq: int) -> None:
+    """Store the consumer's cursor (caller commits, together with its work)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO IngestionState (key, value) VALUES (?, ?)",
+        (_CURSOR_PREFIX + consumer, str(int(seq))),
+    )
+
+
+def read_changes(conn: sqlite3.Connection, consumer: str, limit: Optional[int] = None) -> ChangeBatch:
+    """
+    Changes after the consumer's cursor (all of the log if it never ran).
+
+    Args:
+        conn: Database connection
+        consumer: Consumer name ("elo", "aggregates", ...)
+        limit: Read at most this many entries; advance to batch.last_seq and
+               call again for the rest
+
+    Returns:
+        ChangeBatch; last_seq is the cursor to store once the batch is processed
+    """
+    start = get_cursor(conn, consumer) or 0
+    sql = (
+        "SELECT seq, table_name, match_id, op, ts, old_team_a_key, old_team_b_key, old_season, old_player "
+        "FROM ChangeLog WHERE seq > ? ORDER BY seq"
+    )
+    params: tuple = (start,)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params += (int(limit),)
+    rows = conn.execute(sql, params).fetchall()
+    prior = [
+        PriorState(match_id, table, team_a_key, team_b_key, season, player)
+        for _, table, match_id, op, _, team_a_key, team_b_key, season, player in rows
+        if op != "insert" and match_id is not None
+        and (team_a_key, team_b_key, season, player) != (None, None, None, None)
+    ]
+    return ChangeBatch(
+        last_seq=rows[-1][0] if rows else start,
+        entries=[row[:5] for row in rows],
+        prior=prior,
+    )
+
+
+def consumers(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Registered consumers and their cursors."""
+    rows = conn.execute(
+        "SELECT key, value FROM IngestionState WHERE key LIKE ?", (_CURSOR_PREFIX + "%",)
+    ).fetchall()
+    return {key[len(_CURSOR_PREFIX):]: int(value) for key, value in rows}
+
+
+def prune(conn: sqlite3.Connection) -> int:
+    """
+    Delete entries every registered consumer has processed (caller commits).
+
+    Returns:
+        Number of entries deleted (0 when no consumer is registered)
+    """
+    cursors = consumers(conn)
+    if not cursors:
+        return 0
+    cur = conn.execute("DELETE FROM ChangeLog WHERE seq <= ?", (min(cursors.values()),))
+    return cur.rowcount
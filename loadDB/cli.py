@@ -1,8 +1,10 @@
 import argparse
 import asyncio
 from . import vlr_ingest
-from .elo import compute_elo, compute_elo_snapshots
-from .display import top_players, top_teams, team_history, player_history
+from .elo import compute_elo, compute_elo_snapshots, rollback_elo
+from .recompute import deferred, run_pending
+from .config import RECOMPUTE_DEBOUNCE_SECONDS
+from .display import top_players, top_teams, team_history, player_history, head_to_head
 from .tournament_scraper import scrape_tournament_match_ids, save_match_ids_to_file, load_match_ids_from_file
 
 
@@ -14,7 +16,7 @@ def main():
     p_ingest.add_argument("items", nargs="+", help="Match IDs or URLs")
 
     p_elo = sub.add_parser("elo", help="Compute Elo ratings")
-    p_elo.add_argument("action", choices=["compute", "snapshots"], help="Elo action")
+    p_elo.add_argument("action", choices=["compute", "snapshots", "rollback"], help="Elo action")
     p_elo.add_argument("--save", action="store_true", help="Persist history and snapshots")
     p_elo.add_argument("--top", type=int, default=20, help="Print top N teams after compute")
     p_elo.add_argument(
@@ -28,6 +30,11 @@ def main():
         action="store_true",
         help="Print summary statistics of Elo rating deltas (per team per match)",
     )
+    p_elo.add_argument(
+        "--refresh-closed",
+        action="store_true",
+        help="With 'snapshots': also recompute past seasons that already have a snapshot",
+    )
 
     p_show = sub.add_parser("show", help="Display current snapshots or histories")
     p_show_sub = p_show.add_subparsers(dest="show_cmd", required=True)
@@ -40,6 +47,10 @@ def main():
     p_t_history.add_argument("team")
     p_p_history = p_show_sub.add_parser("player-history", help="Show player Elo history")
     p_p_history.add_argument("player")
+    p_h2h = p_show_sub.add_parser("head-to-head", help="Show the head-to-head record between two teams")
+    p_h2h.add_argument("team_a")
+    p_h2h.add_argument("team_b")
+    p_h2h.add_argument("--season", type=int, help="Only this season (default: all seasons)")
 
     p_scrape_tournament = sub.add_parser("scrape-tournament", help="Scrape match IDs from a tournament")
     p_scrape_tournament.add_argument("url", help="Tournament event URL (e.g., https://www.vlr.gg/event/2792)")
@@ -52,10 +63,19 @@ def main():
     p_ingest_tournament.add_argument("-o", "--output", help="Output file path for match IDs (default: tournament_matches.txt)", default="tournament_matches.txt")
     p_ingest_tournament.add_argument("--all", action="store_true", help="Include all matches, not just completed ones")
     p_ingest_tournament.add_argument("--no-ingest", action="store_true", help="Only scrape and save to file, don't ingest (for manual review)")
+    p_ingest_tournament.add_argument("--force", action="store_true", help="Refetch and rewrite matches even if they are already complete or unchanged")
+    p_ingest_tournament.add_argument("--enqueue-only", action="store_true", help="Only add the matches to the job queue; run 'worker' to ingest them")
+
+    p_watch_event = sub.add_parser("watch-event", help="Ingest only new or newly completed matches of one or more events (incremental)")
+    p_watch_event.add_argument("urls", nargs="*", help="Tournament event URLs (default: every previously watched event)")
+    p_watch_event.add_argument("--match-type", choices=["VCT", "VCL", "OFFSEASON"], help="Match type override (remembered per event)")
+    p_watch_event.add_argument("--no-validate", action="store_true", help="Skip data validation during ingestion")
+    p_watch_event.add_argument("--dry-run", action="store_true", help="Show what would be ingested without ingesting")
 
     p_upload_file = sub.add_parser("upload-from-file", help="Upload matches from a file")
     p_upload_file.add_argument("file", help="File containing match IDs (one per line)")
     p_upload_file.add_argument("--match-type", choices=["VCL", "OFFSEASON", "VCT"], help="Match type (VCL, OFFSEASON, or VCT). Note: Showmatches are automatically skipped.")
+    p_upload_file.add_argument("--force", action="store_true", help="Refetch and rewrite matches even if they are already complete or unchanged")
 
     p_ingest_file = sub.add_parser("ingest-from-file", help="Ingest matches from a file containing URLs (one per line)")
     p_ingest_file.add_argument("file", help="File containing match URLs (one per line). Supports per-line match type: URL # VCT")
@@ -66,13 +86,75 @@ def main():
     p_remove_showmatches.add_argument("--dry-run", action="store_true", help="Show what would be deleted without actually deleting")
 
     p_scrape_all_vct = sub.add_parser("scrape-all-vct", help="Clear DB and scrape all VCT 2024 & 2025 matches")
+    p_scrape_all_vct.add_argument("--keep-existing", action="store_true", help="Don't clear the DB; only fetch matches that aren't completely ingested yet")
+    p_scrape_all_vct.add_argument("--force", action="store_true", help="With --keep-existing, refetch every match even if it is complete")
+
+    p_crawl_vct = sub.add_parser("crawl-vct", help="Concurrently discover all VCT 2024 & 2025 events and match IDs (resumable)")
+    p_crawl_vct.add_argument("-o", "--output", help="Output file path for discovered match IDs (default: vct_matches.txt)", default="vct_matches.txt")
+    p_crawl_vct.add_argument("--restart", action="store_true", help="Discard persisted crawl progress and start from the hubs")
+    p_crawl_vct.add_argument("--all", action="store_true", help="Include all listed matches, not just completed ones")
+
+    p_worker = sub.add_parser("worker", help="Drain the ingestion job queue (IngestJobs)")
+    p_worker.add_argument("--concurrency", type=int, default=None, help="Jobs processed at once (default: HTTP_CONCURRENCY)")
+    p_worker.add_argument("--lease-seconds", type=int, default=None, help="Lease length before an unfinished job is handed out again")
+    p_worker.add_argument("--max-attempts", type=int, default=None, help="Attempts before a job is marked failed")
+    p_worker.add_argument("--follow", action="store_true", help="Keep polling for new jobs instead of exiting when the queue is empty")
+    p_worker.add_argument(
+        "--recompute-debounce",
+        type=float,
+        default=RECOMPUTE_DEBOUNCE_SECONDS,
+        help="With --follow: recompute Elo snapshots at most once per this many seconds (default: RECOMPUTE_DEBOUNCE_SECONDS)",
+    )
+
+    p_db = sub.add_parser("db", help="Schema migrations and query-plan checks")
+    p_db.add_argument("action", choices=["migrate", "status", "explain"], help="migrate: apply pending migrations; status: show schema version; explain: EXPLAIN QUERY PLAN for hot queries")
+
+    p_backfill = sub.add_parser("backfill", help="Recompute derived columns from stored data")
+    p_backfill.add_argument(
+        "target",
+        choices=["team-keys", "match-epochs", "dimensions", "vetoes"],
+        help=(
+            "team-keys: canonical team keys on Matches and Player_Stats; match-epochs: Matches.match_epoch and season; "
+            "dimensions: team/player/map/agent IDs; vetoes: Vetoes rows parsed from Matches.bans_picks"
+        ),
+    )
+    p_backfill.add_argument("--missing-only", action="store_true", help="Only fill rows whose derived value is NULL")
+    p_backfill.add_argument("--prune", action="store_true", help="dimensions: delete dimension rows nothing references")
+
+    p_agg = sub.add_parser("aggregates", help="Maintain the materialized season aggregate tables")
+    p_agg.add_argument(
+        "action",
+        choices=["refresh", "rebuild", "check"],
+        help="refresh: recompute rows touched by matches changed since the last run; rebuild: recompute everything; "
+             "check: compare the stored rows with a full rebuild (not saved)",
+    )
+
+    p_recompute = sub.add_parser("recompute", help="Recompute Elo snapshots if ingests changed anything since the last run")
+    p_recompute.add_argument("--force", action="store_true", help="Recompute even if nothing changed")
+    p_recompute.add_argument("--debounce", type=float, default=0.0, help="Skip if the last run was less than this many seconds ago")
+
+    p_changes = sub.add_parser("changes", help="Inspect or prune the ChangeLog (change-data capture)")
+    p_changes.add_argument(
+        "action",
+        choices=["status", "prune"],
+        help="status: log size and each consumer's pending entries; prune: drop entries every consumer has processed",
+    )
+
+    p_predict = sub.add_parser("predict", help="Batch predictions from the trained models")
+    p_predict.add_argument("action", choices=["matrix"], help="matrix: write Matchup_Probs (win probability per ordered team pair)")
+    p_predict.add_argument("--teams", nargs="+", default=None, help="Only these teams (default: every rated team)")
+
+    p_jobs = sub.add_parser("jobs", help="Inspect or manage the ingestion job queue")
+    p_jobs.add_argument("action", choices=["status", "retry-failed"], help="Queue action")
 
     p_audit_vct = sub.add_parser("audit-vct", help="Audit and optionally backfill key VCT 2024/2025 events")
     p_audit_vct.add_argument("--ingest-missing", action="store_true", help="Ingest any missing matches for each event")
     p_audit_vct.add_argument("--no-validate", action="store_true", help="Skip data validation during ingestion")
+    p_audit_vct.add_argument("--force", action="store_true", help="With --ingest-missing, refetch every listed match, not just missing/incomplete ones")
 
     p_rescrape_empty_stage = sub.add_parser("rescrape-empty-stage", help="Rescrape matches with empty stage fields (e.g., misparsed tournaments like 'NRG vs. Cloud9')")
     p_rescrape_empty_stage.add_argument("--limit", type=int, default=None, help="Optional limit on number of matches to rescrape")
+    p_rescrape_empty_stage.add_argument("--enqueue-only", action="store_true", help="Only add the matches to the job queue; run 'worker' to ingest them")
 
     p_rescrape_bad_meta = sub.add_parser(
         "rescrape-bad-metadata",
@@ -89,6 +171,11 @@ def main():
         action="store_true",
         help="Skip data validation during rescrape",
     )
+    p_rescrape_bad_meta.add_argument(
+        "--enqueue-only",
+        action="store_true",
+        help="Only add the matches to the job queue; run 'worker' to ingest them",
+    )
 
     p_test_matches = sub.add_parser("test-matches", help="Test random matches for data quality")
     p_test_matches.add_argument("-n", "--num", type=int, default=10, help="Number of random matches to test")
@@ -97,7 +184,7 @@ def main():
     p_ingest_next.add_argument("--no-validate", action="store_true", help="Skip data validation during ingestion")
 
     p_standardize = sub.add_parser("standardize-teams", help="Use LLM or heuristics to standardize team names and identify duplicates")
-    p_standardize.add_argument("--provider", choices=["openai", "anthropic", "heuristics"], default="openai", help="Provider: LLM (openai/anthropic) or heuristics (default: openai)")
+    p_standardize.add_argument("--provider", choices=["openai", "anthropic", "heuristics", "fuzzy"], default="openai", help="Provider: LLM (openai/anthropic), heuristics or the local fuzzy matcher (default: openai)")
     p_standardize.add_argument("--api-key", type=str, help="API key (or set OPENAI_API_KEY/ANTHROPIC_API_KEY env var)")
     p_standardize.add_argument("--preview", action="store_true", help="Preview mappings without saving")
     p_standardize.add_argument("--no-save", action="store_true", help="Don't save to aliases.json")
@@ -121,7 +208,11 @@ def main():
         return
 
     if args.cmd == "elo" and args.action == "snapshots":
-        compute_elo_snapshots()
+        compute_elo_snapshots(refresh_closed=args.refresh_closed)
+        return
+
+    if args.cmd == "elo" and args.action == "rollback":
+        rollback_elo()
         return
 
     if args.cmd == "show":
@@ -147,6 +238,13 @@ def main():
             for (mid, team, opp_team, pre, post) in rows:
                 delta = post - pre
                 print(f"#{mid} {team or ''} vs {opp_team or ''}: {pre:.2f} -> {post:.2f} (Δ {delta:+.2f})")
+        elif args.show_cmd == "head-to-head":
+            record = head_to_head(args.team_a, args.team_b, season=args.season)
+            season_disp = f" ({args.season})" if args.season else ""
+            print(f"{args.team_a} vs {args.team_b}{season_disp}: {record['wins']}-{record['losses']} in matches, "
+                  f"{record['maps_won']}-{record['maps_lost']} in maps ({record['matches']} matches)")
+            if record["last_match_id"]:
+                print(f"Last meeting: #{record['last_match_id']}")
 
     if args.cmd == "scrape-tournament":
         print(f"Scraping match IDs from tournament: {args.url}")
@@ -164,7 +262,7 @@ def main():
             return 1
 
     if args.cmd == "ingest-tournament":
-        from .ingestion import ingest_from_urls
+        from .ingest_jobs import enqueue_matches, ingest_via_queue
         
         print(f"Scraping match IDs from tournament: {args.url}")
         print(f"Match type: {args.match_type}")
@@ -184,20 +282,35 @@ def main():
             save_match_ids_to_file(match_ids, args.output)
             print(f"Match IDs saved to {args.output}")
             
-            # Step 3: Convert match IDs to URLs and ingest (unless --no-ingest flag is set)
-            if not args.no_ingest:
+            # Step 3: Convert match IDs to URLs and queue/ingest them (unless --no-ingest flag is set)
+            if args.enqueue_only and not args.no_ingest:
+                urls = [f"https://www.vlr.gg/{match_id}" for match_id in match_ids]
+                counts = enqueue_matches(
+                    urls,
+                    match_type=args.match_type,
+                    source="ingest-tournament",
+                    reparse=args.force,
+                    skip_complete=not args.force,
+                )
+                print(f"Queued {counts['enqueued']} job(s) ({counts['already_queued']} already queued, "
+                      f"{counts['complete']} already complete). Run 'python -m loadDB.cli worker' to ingest.")
+            elif not args.no_ingest:
                 urls = [f"https://www.vlr.gg/{match_id}" for match_id in match_ids]
                 print(f"Starting ingestion of {len(urls)} match(es) (this may take a while)...")
                 
-                result = asyncio.run(ingest_from_urls(
+                result = asyncio.run(ingest_via_queue(
                     urls,
-                    validate=True,
-                    match_type=args.match_type
+                    match_type=args.match_type,
+                    source="ingest-tournament",
+                    reparse=args.force,
+                    skip_complete=not args.force,
                 ))
                 
                 print(f"\nIngestion complete:")
                 print(f"  Success: {result.success_count}")
                 print(f"  Errors: {result.error_count}")
+                if result.complete_count > 0:
+                    print(f"  Already complete (fetch avoided): {result.complete_count}")
                 if result.skipped_count > 0:
                     print(f"  Skipped (showmatches): {result.skipped_count}")
                 if result.warnings:
@@ -226,6 +339,50 @@ def main():
             traceback.print_exc()
             return 1
 
+    if args.cmd == "watch-event":
+        from .db_utils import get_conn
+        from .event_watcher import watch_event
+        from .migrations import ensure_schema
+
+        urls = list(args.urls)
+        if not urls:
+            conn = get_conn()
+            ensure_schema(conn)
+            urls = [r[0] for r in conn.execute("SELECT event_url FROM WatchedEvents ORDER BY event_id")]
+            conn.close()
+        if not urls:
+            print("No events given and none watched yet.")
+            return 1
+
+        total_ingested = 0
+        total_errors = 0
+        for url in urls:
+            print(f"\nWatching {url}...")
+            try:
+                res = asyncio.run(watch_event(
+                    url,
+                    match_type=args.match_type,
+                    validate=not args.no_validate,
+                    dry_run=args.dry_run,
+                ))
+            except Exception as e:
+                print(f"  Error watching event: {e}")
+                total_errors += 1
+                continue
+            print(f"  Listed: {res.listed}  New: {len(res.new)}  Changed: {len(res.changed)}  "
+                  f"To ingest: {len(res.to_ingest)}  Fetches: {res.fetches}")
+            if args.dry_run:
+                if res.to_ingest:
+                    print(f"  Would ingest: {', '.join(map(str, res.to_ingest))}")
+                continue
+            print(f"  Ingested: {len(res.ingested)}")
+            total_ingested += len(res.ingested)
+            total_errors += len(res.errors)
+
+        if total_ingested > 0:
+            run_pending()
+        return 1 if total_errors else 0
+
     if args.cmd == "upload-from-file":
         match_ids = load_match_ids_from_file(args.file)
         if not match_ids:
@@ -247,7 +404,12 @@ def main():
         
         print(f"Uploading {len(match_ids)} match(es) with match type: {match_type}")
         try:
-            vlr_ingest.ingest(match_ids, match_type=match_type)
+            vlr_ingest.ingest(
+                match_ids,
+                match_type=match_type,
+                skip_complete=not args.force,
+                skip_unchanged=not args.force,
+            )
             print(f"Successfully uploaded {len(match_ids)} match(es)")
         except Exception as e:
             print(f"Error uploading matches: {e}")
@@ -295,12 +457,31 @@ def main():
 
     if args.cmd == "scrape-all-vct":
         from .scrape_all_vct import main as scrape_main
-        asyncio.run(scrape_main())
+        asyncio.run(scrape_main(keep_existing=args.keep_existing, force=args.force))
         return
 
+    if args.cmd == "crawl-vct":
+        import time
+        from .crawler import SeasonCrawler
+
+        started = time.monotonic()
+        crawl = asyncio.run(SeasonCrawler().crawl(restart=args.restart))
+        elapsed = time.monotonic() - started
+
+        match_ids = [m["match_id"] for m in crawl.matches if args.all or m["completed"]]
+        save_match_ids_to_file(match_ids, args.output)
+        print(f"\nCrawl {'resumed and ' if crawl.resumed else ''}finished in {elapsed:.1f}s "
+              f"({crawl.fetched} page fetch(es))")
+        print(f"  Events : {len(crawl.events)}")
+        print(f"  Matches: {len(crawl.matches)} discovered, {len(match_ids)} saved to {args.output}")
+        if crawl.errors:
+            print(f"  Errors : {len(crawl.errors)} (re-run to retry the failed nodes)")
+            return 1
+        return 0
+
     if args.cmd == "rescrape-bad-metadata":
         from .db_utils import get_conn
-        from .ingestion import ingest_from_urls
+        from .ingest_jobs import enqueue_matches, ingest_via_queue
 
         conn = get_conn()
         cur = conn.cursor()
@@ -349,12 +530,22 @@ def main():
 
         urls = [f"https://www.vlr.gg/{mid}" for mid in match_ids]
 
+        if args.enqueue_only:
+            counts = enqueue_matches(
+                urls, match_type="VCT", source="rescrape-bad-metadata",
+                validate=not args.no_validate, reparse=True,
+            )
+            print(f"Queued {counts['enqueued']} job(s). Run 'python -m loadDB.cli worker' to rescrape.")
+            return 0
+
         try:
             result = asyncio.run(
-                ingest_from_urls(
+                ingest_via_queue(
                     urls,
-                    validate=not args.no_validate,
                     match_type="VCT",
+                    source="rescrape-bad-metadata",
+                    validate=not args.no_validate,
+                    reparse=True,
                 )
             )
         except Exception as e:
@@ -385,7 +576,7 @@ def main():
 
     if args.cmd == "rescrape-empty-stage":
         from .db_utils import get_conn
-        from .ingestion import ingest_from_urls
+        from .ingest_jobs import enqueue_matches, ingest_via_queue
 
         conn = get_conn()
         cur = conn.cursor()
@@ -415,13 +606,14 @@ def main():
 
         urls = [f"https://www.vlr.gg/{mid}" for mid in match_ids]
 
+        if args.enqueue_only:
+            counts = enqueue_matches(urls, match_type="VCT", source="rescrape-empty-stage", reparse=True)
+            print(f"Queued {counts['enqueued']} job(s). Run 'python -m loadDB.cli worker' to rescrape.")
+            return 0
+
         try:
             result = asyncio.run(
-                ingest_from_urls(
-                    urls,
-                    validate=True,
-                    match_type="VCT",
-                )
+                ingest_via_queue(urls, match_type="VCT", source="rescrape-empty-stage", reparse=True)
             )
         except Exception as e:
             print(f"Error rescraping matches: {e}")
@@ -449,10 +641,209 @@ def main():
 
         return 0
 
+    if args.cmd == "worker":
+        from .ingest_jobs import IngestWorker
+        from .config import HTTP_CONCURRENCY, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+        worker = IngestWorker(
+            concurrency=args.concurrency or HTTP_CONCURRENCY,
+            lease_seconds=args.lease_seconds or JOB_LEASE_SECONDS,
+            max_attempts=args.max_attempts or JOB_MAX_ATTEMPTS,
+            recompute_debounce=args.recompute_debounce,
+        )
+        print("Draining ingestion job queue..." if not args.follow else "Worker running (Ctrl-C to stop)...")
+        try:
+            res = asyncio.run(worker.run(follow=args.follow))
+        except KeyboardInterrupt:
+            print("\nInterrupted; unfinished jobs stay queued.")
+            return 1
+        print(f"\nWorker finished:")
+        print(f"  Jobs done: {res.processed}")
+        print(f"  Ingested: {len(res.ingested_ids)}")
+        if res.unchanged_ids:
+            print(f"  Unchanged (no writes): {len(res.unchanged_ids)}")
+        if res.skipped_ids:
+            print(f"  Skipped (showmatches): {len(res.skipped_ids)}")
+        if res.retried:
+            print(f"  Retried attempts: {res.retried}")
+        print(f"  Failed: {res.failed}")
+        for error in res.errors[:5]:
+            print(f"    - {error}")
+        if len(res.errors) > 5:
+            print(f"    ... and {len(res.errors) - 5} more errors")
+        if res.ingested_ids:
+            run_pending()
+        return 1 if res.failed else 0
+
+    if args.cmd == "db":
+        from .db_utils import get_conn
+        from .migrations import LATEST_VERSION, current_version, migrate, explain_hot_queries
+
+        conn = get_conn()
+        try:
+            if args.action == "migrate":
+                before, after = migrate(conn, verbose=True)
+                if before == after:
+                    print(f"Schema is up to date (version {after}).")
+                else:
+                    print(f"Migrated schema from version {before} to {after}.")
+                return 0
+
+            version = current_version(conn)
+            if args.action == "status":
+                pending = LATEST_VERSION - version
+                print(f"Schema version: {version} (latest {LATEST_VERSION})")
+                if pending > 0:
+                    print(f"  {pending} pending migration(s); run 'python -m loadDB.cli db migrate'")
+                return 0
+
+            if version < LATEST_VERSION:
+                print(f"Warning: schema version {version} < {LATEST_VERSION}; run 'db migrate' first.\n")
+            failures = 0
+            for res in explain_hot_queries(conn):
+                mark = "OK  " if res["ok"] else "SCAN"
+                print(f"[{mark}] {res['name']} (expects {res['index']})")
+                for line in res["plan"]:
+                    print(f"         {line}")
+                failures += 0 if res["ok"] else 1
+            print(f"\n{failures} hot query(ies) not using their index." if failures else "\nAll hot queries use their indexes.")
+            return 1 if failures else 0
+        finally:
+            conn.close()
+
+    if args.cmd == "backfill":
+        if args.target == "team-keys":
+            from .backfill import backfill_team_keys
+
+            counts = backfill_team_keys(only_missing=args.missing_only)
+            for column, n in counts.items():
+                print(f"  {column}: {n} row(s) updated")
+            print(f"Team keys backfilled ({sum(counts.values())} row(s) updated).")
+        elif args.target == "match-epochs":
+            from .backfill import backfill_match_epochs
+
+            updated = backfill_match_epochs(only_missing=args.missing_only)
+            print(f"Match epochs backfilled ({updated} row(s) updated).")
+        elif args.target == "dimensions":
+            from .backfill import backfill_dimensions
+
+            counts = backfill_dimensions(only_missing=args.missing_only, prune=args.prune)
+            for column, n in counts.items():
+                print(f"  {column}: {n} row(s)")
+            print("Dimension IDs backfilled.")
+        elif args.target == "vetoes":
+            from .backfill import backfill_vetoes
+
+            rebuilt = backfill_vetoes()
+            print(f"Vetoes rebuilt for {rebuilt} match(es).")
+        return 0
+
+    if args.cmd == "aggregates":
+        from .db_utils import get_conn, ensure_matches_columns
+        from .aggregates import check_aggregates, refresh_aggregates, rebuild_aggregates
+
+        conn = get_conn()
+        try:
+            ensure_matches_columns(conn)
+            if args.action == "check":
+                conn.commit()
+                diffs = check_aggregates(conn)
+                for table, n in diffs.items():
+                    print(f"  {table:22s} {'OK' if n == 0 else f'{n} row(s) differ from a full rebuild'}")
+                return 1 if any(diffs.values()) else 0
+            if args.action == "rebuild":
+                rebuild_aggregates(conn)
+                print("Aggregates rebuilt.")
+            else:
+                n = refresh_aggregates(conn)
+                print("Aggregates rebuilt (no refresh cursor or deleted matches)." if n < 0 else f"Aggregates refreshed for {n} changed match(es).")
+            conn.commit()
+        finally:
+            conn.close()
+        return 0
+
+    if args.cmd == "recompute":
+        if not run_pending(debounce=args.debounce, force=args.force):
+            print("Nothing to recompute.")
+        return 0
+
+    if args.cmd == "changes":
+        from .db_utils import get_conn, ensure_matches_columns
+        from . import changelog
+
+        conn = get_conn()
+        try:
+            ensure_matches_columns(conn)
+            if args.action == "prune":
+                n = changelog.prune(conn)
+                conn.commit()
+                print(f"Pruned {n} ChangeLog entr{'y' if n == 1 else 'ies'}.")
+                return 0
+            latest = changelog.latest_seq(conn)
+            print(f"ChangeLog: latest seq {latest}")
+            for consumer, seq in sorted(changelog.consumers(conn).items()):
+                pending = conn.execute("SELECT COUNT(*) FROM ChangeLog WHERE seq > ?", (seq,)).fetchone()[0]
+                print(f"  {consumer:12s} cursor {seq:8d}  pending {pending}")
+        finally:
+            conn.close()
+        return 0
+
+    if args.cmd == "predict":
+        import os
+        from .config import DB_PATH, REPO_ROOT
+        from .db_utils import get_conn, ensure_matches_columns
+        from .normalizers.team import team_key
+        from analytics.predict import Predictor, write_matchup_probs
+
+        predictor = Predictor(db_path=DB_PATH, models_dir=os.path.join(REPO_ROOT, "models"))
+        keys = [team_key(t) for t in args.teams] if args.teams else None
+        conn = get_conn()
+        try:
+            ensure_matches_columns(conn)
+            n = write_matchup_probs(conn, predictor, keys)
+            conn.commit()
+        finally:
+            conn.close()
+        print(f"Wrote {n} matchup probabilities ({predictor.model_version}).")
+        return 0
+
+    if args.cmd == "jobs":
+        from .db_utils import get_conn
+        from .ingest_jobs import jobs_status, retry_failed
+
+        conn = get_conn()
+        try:
+            if args.action == "retry-failed":
+                n = retry_failed(conn)
+                print(f"Reset {n} failed job(s) to pending.")
+                return 0
+
+            status = jobs_status(conn)
+            counts = status["counts"]
+            total = sum(counts.values())
+            finished = counts.get("done", 0) + counts.get("failed", 0)
+            print(f"Ingestion jobs: {total} total, {finished} finished"
+                  + (f" ({100.0 * finished / total:.1f}%)" if total else ""))
+            for st in ("pending", "leased", "done", "failed"):
+                print(f"  {st:<8} {counts.get(st, 0)}")
+            print(f"  Due now: {status['due']}  Expired leases: {status['expired_leases']}")
+            if status["by_source"]:
+                print("\nBy source:")
+                for source, by_status in sorted(status["by_source"].items()):
+                    parts = ", ".join(f"{k}={v}" for k, v in sorted(by_status.items()))
+                    print(f"  {source}: {parts}")
+            if status["recent_errors"]:
+                print("\nRecent errors:")
+                for mid, st, attempts, err in status["recent_errors"]:
+                    print(f"  {mid} [{st}, {attempts} attempt(s)]: {err}")
+            return 0
+        finally:
+            conn.close()
+
     if args.cmd == "audit-vct":
         from .vct_scraper import get_vct_target_events
         from .tournament_scraper import scrape_tournament_match_ids
-        from .db_utils import get_conn
+        from .db_utils import get_conn, find_complete_matches
         from .ingestion import ingest_from_urls
 
         print("Enumerating VCT 2024/2025 target events...")
@@ -479,6 +870,7 @@ def main():
         cur = conn.cursor()
 
         total_missing = 0
+        total_avoided = 0
         total_ingested_success = 0
         total_ingested_errors = 0
 
@@ -538,28 +930,43 @@ def main():
 
             missing_ids = [mid for mid in truth_ids if mid not in db_ids]
             extra_ids = [mid for mid in db_ids if mid not in set(truth_ids)]
+            complete_ids = find_complete_matches(conn, truth_ids)
+            incomplete_ids = [mid for mid in truth_ids if mid in db_ids and mid not in complete_ids]
 
             print(f"  Matches already in DB      : {len(db_ids)}")
+            print(f"  Complete matches in DB     : {len(complete_ids)}")
             print(f"  Missing matches (in VLR)   : {len(missing_ids)}")
+            print(f"  Incomplete matches in DB   : {len(incomplete_ids)}")
             if extra_ids:
                 print(f"  Extra DB matches not in VLR list: {len(extra_ids)}")
 
+            if args.ingest_missing and args.force:
+                to_ingest = truth_ids
+            else:
+                to_ingest = missing_ids + incomplete_ids
+
             if missing_ids:
                 total_missing += len(missing_ids)
                 print("  Missing match IDs (first 15):")
                 print("   ", ", ".join(str(m) for m in missing_ids[:15]))
                 if len(missing_ids) > 15:
                     print(f"    ... and {len(missing_ids) - 15} more")
+            else:
+                print("  No missing matches for this event.")
 
-                if args.ingest_missing:
-                    urls = [f"https://www.vlr.gg/{mid}" for mid in missing_ids]
-                    print(f"\n  Ingesting {len(urls)} missing match(es) as VCT...")
+            if args.ingest_missing:
+                total_avoided += len(truth_ids) - len(to_ingest)
+                if to_ingest:
+                    urls = [f"https://www.vlr.gg/{mid}" for mid in to_ingest]
+                    print(f"\n  Ingesting {len(urls)} missing/incomplete match(es) as VCT "
+                          f"({len(truth_ids) - len(to_ingest)} complete, fetch avoided)...")
                     try:
                         result = asyncio.run(
                             ingest_from_urls(
                                 urls,
                                 validate=not args.no_validate,
                                 match_type="VCT",
+                                skip_unchanged=not args.force,
                             )
                         )
                         print(f"    Success: {result.success_count}")
@@ -572,8 +979,6 @@ def main():
                         print(f"    ERROR ingesting missing matches: {ex}")
                         import traceback
                         traceback.print_exc()
-            else:
-                print("  No missing matches for this event.")
 
         conn.close()
 
@@ -582,6 +987,7 @@ def main():
         print("=" * 70)
         print(f"Total missing matches across all events (before ingest): {total_missing}")
         if args.ingest_missing:
+            print(f"Complete matches skipped (fetches avoided): {total_avoided}")
             print(f"Total ingested successfully: {total_ingested_success}")
             print(f"Total ingestion errors     : {total_ingested_errors}")
         else:
@@ -595,23 +1001,25 @@ def main():
         return
 
     if args.cmd == "ingest-next-completed":
-        from .db_utils import get_conn
+        import time
+        from .db_utils import get_conn, ensure_matches_columns
         
         # Query the next upcoming match that has been completed (has scores)
         conn = get_conn()
+        ensure_matches_columns(conn)
         cur = conn.cursor()
         
-        # Get first upcoming match with scores (ordered by match_ts_utc asc)
+        # Get first upcoming match with scores (ordered by match time asc; +5 hours for EST->UTC)
         cur.execute("""
             SELECT match_id, team_a, team_b, team_a_score, team_b_score, match_ts_utc
             FROM Matches
             WHERE match_ts_utc IS NOT NULL
-            AND datetime(match_ts_utc, '+5 hours') > datetime('now')
+            AND match_epoch > ?
             AND team_a_score IS NOT NULL
             AND team_b_score IS NOT NULL
-            ORDER BY match_ts_utc ASC
+            ORDER BY match_epoch ASC
             LIMIT 1
-        """)
+        """, (int(time.time()) - 5 * 3600,))
         
         row = cur.fetchone()
         conn.close()
@@ -629,8 +1037,9 @@ def main():
         print(f"  Time: {match_ts_utc}")
         print(f"\nIngesting match {match_id}...")
         
-        # Ingest the match
-        vlr_ingest.ingest([match_id], validate=not args.no_validate)
+        # Ingest the match; scheduled runs recompute Elo at most once per debounce window
+        with deferred(debounce=RECOMPUTE_DEBOUNCE_SECONDS):
+            vlr_ingest.ingest([match_id], validate=not args.no_validate)
         return
 
     if args.cmd == "standardize-teams":
@@ -641,6 +1050,9 @@ def main():
                 print(f"Found {len(team_names)} unique team names\n")
                 if args.provider == "heuristics":
                     new_mappings = standardize_with_heuristics(team_names)
+                elif args.provider == "fuzzy":
+                    from .team_standardizer import standardize_with_matcher
+                    new_mappings = standardize_with_matcher(team_names)
                 elif args.provider == "openai":
                     from .team_standardizer import standardize_with_llm
                     new_mappings = standardize_with_llm(team_names, args.api_key)
@@ -674,7 +1086,7 @@ def main():
         return
 
     if args.cmd == "remove-showmatches":
-        from .db_utils import get_conn
+        from .db_utils import get_conn, ensure_matches_columns
         from .normalizers.team import normalize_team
         import sqlite3
         import re
@@ -719,6 +1131,7 @@ def main():
             return False
         
         conn = get_conn()
+        ensure_matches_columns(conn)
         cur = conn.cursor()
         
         # Comprehensive showmatch detection
@@ -791,9 +1204,10 @@ def main():
         cur.execute(f"DELETE FROM Player_Stats WHERE match_id IN ({placeholders})", match_ids_list)
         player_stats_deleted = cur.rowcount
         
-        # Delete maps for these matches
+        # Delete maps and vetoes for these matches
         cur.execute(f"DELETE FROM Maps WHERE match_id IN ({placeholders})", match_ids_list)
         maps_deleted = cur.rowcount
+        cur.execute(f"DELETE FROM Vetoes WHERE match_id IN ({placeholders})", match_ids_list)
         
         # Delete matches
         cur.execute(f"DELETE FROM Matches WHERE match_id IN ({placeholders})", match_ids_list)
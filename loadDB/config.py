@@ -84,3 +84,22 @@ PLAYER_PERF_LOGIT_BETA = 4.0
 WIN_LOSS_WEIGHT = 0.05
 PLAYER_DELTA_CAP = 20.0
 PLAYER_SEED_SCALE = 100.0
+
+# --- Scraping / HTTP ---
+# Shared limits for every request made against vlr.gg (see scrapers.base.RateLimiter).
+# HTTP_CONCURRENCY bounds in-flight requests; HTTP_RATE_PER_SEC spaces request starts.
+HTTP_CONCURRENCY = 8
+HTTP_RATE_PER_SEC = 6.0
+# Extra pause applied to *all* requests after a 429 response (seconds)
+HTTP_429_COOLDOWN = 5.0
+
+# --- Ingestion job queue (see ingest_jobs.py) ---
+# A leased job whose worker hasn't finished within the lease is handed out again
+JOB_LEASE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 5
+# Retry delay is JOB_RETRY_BASE_SECONDS * 2**(attempts - 1)
+JOB_RETRY_BASE_SECONDS = 30
+
+# --- Post-ingest recomputation (see recompute.py) ---
+# Scheduled ingests and `worker --follow` recompute Elo snapshots at most once per window
+RECOMPUTE_DEBOUNCE_SECONDS = 600
@@ -0,0 +1,287 @@
+"""
+Concurrent, resumable crawler for VCT season hubs.
+
+Walks a URL frontier of three node kinds:
+
+    hub (vct-2024, vct-2025)  ->  event pages  ->  event match listings
+
+Every fetch goes through one aiohttp session and the shared rate limiter
+(scrapers.base), so concurrency stays bounded no matter how many events a hub
+links. Events are deduplicated on event ID and matches on match ID.
+
+Progress is persisted in SQLite (CrawlFrontier / CrawlMatches). If a crawl is
+interrupted, the next run resumes from the nodes that were not finished; once a
+crawl completes, the next run starts a fresh one.
+
+Run:
+  python -m loadDB.cli crawl-vct
+  python -m loadDB.cli crawl-vct --restart -o vct_matches.txt
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .config import HTTP_CONCURRENCY
+from .db_utils import get_conn
+from .migrations import ensure_schema
+from .scrapers.base import fetch_html
+from .tournament_scraper import parse_tournament_match_ids, resolve_tournament_matches_url
+from .vct_scraper import parse_vct_tournaments
+
+# Default hubs crawled for a full season discovery
+VCT_HUBS: Dict[int, str] = {
+    2024: "https://www.vlr.gg/vct-2024",
+    2025: "https://www.vlr.gg/vct-2025",
+}
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of a season crawl (includes nodes finished by earlier, interrupted runs)."""
+    events: List[Dict[str, object]]
+    matches: List[Dict[str, object]]
+    fetched: int = 0
+    resumed: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+class SeasonCrawler:
+    """
+    Async frontier crawler for VCT hubs.
+
+    Args:
+        hubs: Mapping of season year -> hub URL (default: VCT_HUBS)
+        concurrency: Number of concurrent workers (the shared rate limiter still applies)
+        db_path: Optional database path for the persisted frontier
+    """
+
+    def __init__(
+        self,
+        hubs: Optional[Dict[int, str]] = None,
+        concurrency: int = HTTP_CONCURRENCY,
+        db_path: Optional[str] = None,
+    ):
+        self.hubs = dict(hubs or VCT_HUBS)
+        self.concurrency = max(1, int(concurrency))
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._seen: set[str] = set()
+        self._fetched = 0
+        self._errors: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Frontier persistence
+    # ------------------------------------------------------------------
+    def _prepare(self, restart: bool) -> bool:
+        """Open the state DB and decide between resuming and starting fresh. Returns resumed flag."""
+        conn = get_conn(self.db_path)
+        ensure_schema(conn)
+        self._conn = conn
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), SUM(CASE WHEN status != 'done' THEN 1 ELSE 0 END) FROM CrawlFrontier")
+        total, unfinished = cur.fetchone()
+        resumed = bool(total) and bool(unfinished) and not restart
+        if not resumed:
+            cur.execute("DELETE FROM CrawlFrontier")
+            cur.execute("DELETE FROM CrawlMatches")
+        for position, (season, url) in enumerate(sorted(self.hubs.items())):
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO CrawlFrontier (node_key, kind, url, season, position, status, updated_at)
+                VALUES (?, 'hub', ?, ?, ?, 'pending', datetime('now'))
+                """,
+                (f"hub:{season}", url, season, position),
+            )
+        conn.commit()
+        return resumed
+
+    def _add_children(self, children: List[tuple]) -> List[tuple]:
+        """Insert child nodes into the frontier, skipping node keys already known."""
+        new_nodes = []
+        cur = self._conn.cursor()
+        for node in children:
+            node_key, kind, url, season, event_id, name, position = node
+            if node_key in self._seen:
+                continue
+            self._seen.add(node_key)
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO CrawlFrontier
+                    (node_key, kind, url, season, event_id, name, position, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', datetime('now'))
+                """,
+                node,
+            )
+            new_nodes.append(node)
+        return new_nodes
+
+    def _mark(self, node_key: str, status: str, error: Optional[str] = None) -> None:
+        self._conn.execute(
+            """
+            UPDATE CrawlFrontier
+            SET status = ?, attempts = attempts + 1, last_error = ?, updated_at = datetime('now')
+            WHERE node_key = ?
+            """,
+            (status, error, node_key),
+        )
+
+    # ------------------------------------------------------------------
+    # Node handlers
+    # ------------------------------------------------------------------
+    async def _process_hub(self, session, node: tuple) -> List[tuple]:
+        _, _, url, season, _, _, _ = node
+        html = await fetch_html(session, url)
+        self._fetched += 1
+        children = []
+        for position, t in enumerate(parse_vct_tournaments(html)):
+            children.append(
+                (f"event:{t['event_id']}", "event", t["url"], season, t["event_id"], t["name"], position)
+            )
+        return children
+
+    async def _process_event(self, session, node: tuple) -> List[tuple]:
+        _, _, url, season, event_id, name, position = node
+        html = await fetch_html(session, url)
+        self._fetched += 1
+        listing_url = resolve_tournament_matches_url(url, html)
+        return [(f"listing:{event_id}", "listing", listing_url, season, event_id, name, position)]
+
+    async def _process_listing(self, session, node: tuple) -> List[tuple]:
+        _, _, url, season, event_id, name, _ = node
+        html = await fetch_html(session, url)
+        self._fetched += 1
+        # One fetch serves both the completed-only and the full listing parse
+        completed_ids = parse_tournament_match_ids(html, completed_only=True)
+        completed = set(completed_ids)
+        ordered = list(dict.fromkeys(parse_tournament_match_ids(html, completed_only=False) + completed_ids))
+        cur = self._conn.cursor()
+        for position, mid in enumerate(ordered):
+            # First event to list a match owns it; completion is sticky
+            cur.execute(
+                """
+                INSERT INTO CrawlMatches (match_id, event_id, season, tournament, position, completed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(match_id) DO UPDATE SET
+                    completed = MAX(CrawlMatches.completed, excluded.completed)
+                """,
+                (mid, event_id, season, name, position, 1 if mid in completed else 0),
+            )
+        return []
+
+    async def _worker(self, session) -> None:
+        handlers = {
+            "hub": self._process_hub,
+            "event": self._process_event,
+            "listing": self._process_listing,
+        }
+        while True:
+            node = await self._queue.get()
+            node_key, kind = node[0], node[1]
+            try:
+                children = await handlers[kind](session, node)
+                new_nodes = self._add_children(children)
+                self._mark(node_key, "done")
+                # One commit per node: children and completion land atomically
+                self._conn.commit()
+                for child in new_nodes:
+                    self._queue.put_nowait(child)
+            except Exception as e:
+                self._conn.rollback()
+                self._mark(node_key, "error", str(e))
+                self._conn.commit()
+                self._errors.append(f"{kind} {node[2]}: {e}")
+                print(f"  [WARN] Failed {kind} {node[2]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def crawl(self, restart: bool = False) -> CrawlResult:
+        """
+        Crawl all hubs down to match listings.
+
+        Args:
+            restart: Discard any persisted progress and start from the hubs
+
+        Returns:
+            CrawlResult with events and discovered matches in hub/listing order
+        """
+        resumed = self._prepare(restart)
+        cur = self._conn.cursor()
+        cur.execute(
+            "SELECT node_key, kind, url, season, event_id, name, position, status FROM CrawlFrontier"
+        )
+        rows = cur.fetchall()
+        self._seen = {r[0] for r in rows}
+        self._queue = asyncio.Queue()
+        for r in rows:
+            if r[7] != "done":
+                self._queue.put_nowait(tuple(r[:7]))
+        if resumed:
+            print(f"Resuming crawl: {self._queue.qsize()} of {len(rows)} frontier node(s) left")
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                workers = [asyncio.create_task(self._worker(session)) for _ in range(self.concurrency)]
+                try:
+                    await self._queue.join()
+                finally:
+                    for w in workers:
+                        w.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+            return self._collect(resumed)
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def _collect(self, resumed: bool) -> CrawlResult:
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT event_id, name, url, season
+            FROM CrawlFrontier
+            WHERE kind = 'event'
+            ORDER BY season, position
+            """
+        )
+        events = [
+            {"event_id": e, "name": n, "url": u, "season": s}
+            for (e, n, u, s) in cur.fetchall()
+        ]
+        cur.execute(
+            """
+            SELECT cm.match_id, cm.event_id, cm.season, cm.tournament, cm.completed
+            FROM CrawlMatches cm
+            LEFT JOIN CrawlFrontier f ON f.node_key = 'event:' || cm.event_id
+            ORDER BY cm.season, f.position, cm.position
+            """
+        )
+        matches = [
+            {"match_id": m, "event_id": e, "season": s, "tournament": t, "completed": bool(c)}
+            for (m, e, s, t, c) in cur.fetchall()
+        ]
+        return CrawlResult(
+            events=events,
+            matches=matches,
+            fetched=self._fetched,
+            resumed=resumed,
+            errors=list(self._errors),
+        )
+
+
+async def crawl_vct_seasons(
+    hubs: Optional[Dict[int, str]] = None,
+    restart: bool = False,
+    concurrency: int = HTTP_CONCURRENCY,
+) -> CrawlResult:
+    """Convenience wrapper: crawl the given hubs (default VCT 2024/2025)."""
+    return await SeasonCrawler(hubs, concurrency=concurrency).crawl(restart=restart)
+
@@ -1,5 +1,9 @@
 import sqlite3
+from datetime import datetime, timezone
 from .config import DB_PATH
+from .normalizers.team import team_key
+from .dimensions import DimensionIds
+from .vetoes import replace_vetoes
 
 
 def get_conn(db_path: str | None = None) -> sqlite3.Connection:
@@ -17,32 +21,71 @@ def get_conn(db_path: str | None = None) -> sqlite3.Connection:
 
 def ensure_matches_columns(conn: sqlite3.Connection) -> None:
     """
-    Ensure Matches table has required columns, adding them if missing.
+    Ensure the schema is current (backward-compatible name).
     
-    Also migrates data from tournament_type to match_type if tournament_type exists.
-    Note: SQLite doesn't support DROP COLUMN, so tournament_type column remains
-    but match_type is used going forward.
+    Schema changes now live in loadDB.migrations; this applies any pending
+    migrations, which include the Matches columns this function used to add.
     
     Args:
         conn: Database connection
     """
-    cur = conn.cursor()
-    cur.execute("PRAGMA table_info(Matches)")
-    cols = {r[1] for r in cur.fetchall()}
-    if 'match_ts_utc' not in cols:
-        cur.execute("ALTER TABLE Matches ADD COLUMN match_ts_utc TEXT")
-        conn.commit()
-    if 'match_date' not in cols:
-        cur.execute("ALTER TABLE Matches ADD COLUMN match_date TEXT")
-        conn.commit()
-    if 'tournament_type' in cols and 'match_type' in cols:
-        cur.execute("""
-            UPDATE Matches 
-            SET match_type = tournament_type 
-            WHERE (match_type IS NULL OR match_type = '' OR match_type NOT IN ('VCT', 'VCL', 'OFFSEASON', 'SHOWMATCH'))
-            AND tournament_type IS NOT NULL
-        """)
-        conn.commit()
+    from .migrations import ensure_schema
+    ensure_schema(conn)
+
+
+# match_ts_utc/match_date keep their stored values when the new row lacks them,
+# so the derived columns follow the same precedence: new timestamp, stored
+# timestamp, then whichever date is available.
+_MATCH_TIME_UPDATE = """
+                match_epoch=CASE
+                    WHEN excluded.match_ts_utc IS NOT NULL THEN excluded.match_epoch
+                    WHEN match_ts_utc IS NOT NULL THEN match_epoch
+                    ELSE COALESCE(excluded.match_epoch, match_epoch) END,
+                season=CASE
+                    WHEN excluded.match_ts_utc IS NOT NULL THEN excluded.season
+                    WHEN match_ts_utc IS NOT NULL THEN season
+                    ELSE COALESCE(excluded.season, season) END"""
+
+
+def match_time_fields(match_ts_utc: str | None, match_date: str | None) -> tuple[int | None, int | None]:
+    """
+    Derive (match_epoch, season) from the stored timestamp/date strings.
+    
+    match_epoch is UTC seconds from match_ts_utc, falling back to midnight UTC
+    of match_date; season is the calendar year of that instant.
+    
+    Args:
+        match_ts_utc: ISO timestamp (e.g. "2025-04-24T17:00:00Z") or None
+        match_date: Date string (YYYY-MM-DD) or None
+    
+    Returns:
+        Tuple of (match_epoch, season), (None, None) if neither parses
+    """
+    for value in (match_ts_utc, match_date):
+        if not value:
+            continue
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        dt = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+        return int(dt.timestamp()), dt.year
+    return None, None
+
+
+def date_to_epoch(date: str, end_of_day: bool = False) -> int:
+    """
+    Convert a YYYY-MM-DD date to UTC epoch seconds.
+    
+    Args:
+        date: Date string
+        end_of_day: Return the first second of the following day instead of
+                    midnight, for exclusive upper bounds (match_epoch < ?)
+    """
+    epoch, _ = match_time_fields(None, date[:10])
+    if epoch is None:
+        raise ValueError(f"Invalid date: {date!r}")
+    return epoch + 86400 if end_of_day else epoch
 
 
 def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
@@ -51,6 +94,10 @@ def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
     
     Handles both old format (12 fields) and new format (13 fields with bans_picks).
     The match_type field stores VCT/VCL/OFFSEASON/SHOWMATCH classification.
+    Canonical team keys (team_a_key, team_b_key) and Teams dimension IDs
+    (team_a_id, team_b_id) are derived from the team names, match_epoch and
+    season from the timestamp (see match_time_fields). A non-empty bans_picks
+    string is parsed into the Vetoes table.
     
     Args:
         conn: Database connection
@@ -64,8 +111,9 @@ def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
             """
             INSERT INTO Matches (
                 match_id, tournament, stage, match_type, match_name,
-                team_a, team_b, team_a_score, team_b_score, match_result, match_ts_utc, match_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                team_a, team_b, team_a_score, team_b_score, match_result, match_ts_utc, match_date,
+                team_a_key, team_b_key, match_epoch, season, team_a_id, team_b_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(match_id) DO UPDATE SET
                 tournament=excluded.tournament,
                 stage=excluded.stage,
@@ -77,7 +125,11 @@ def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
                 team_b_score=excluded.team_b_score,
                 match_result=excluded.match_result,
                 match_ts_utc=COALESCE(excluded.match_ts_utc, match_ts_utc),
-                match_date=COALESCE(excluded.match_date, match_date)
+                match_date=COALESCE(excluded.match_date, match_date),
+                team_a_key=excluded.team_a_key,
+                team_b_key=excluded.team_b_key,
+                team_a_id=excluded.team_a_id,
+                team_b_id=excluded.team_b_id,""" + _MATCH_TIME_UPDATE + """
             """
         )
     else:
@@ -86,8 +138,9 @@ def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
             """
             INSERT INTO Matches (
                 match_id, tournament, stage, match_type, match_name,
-                team_a, team_b, team_a_score, team_b_score, match_result, match_ts_utc, match_date, bans_picks
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                team_a, team_b, team_a_score, team_b_score, match_result, match_ts_utc, match_date, bans_picks,
+                team_a_key, team_b_key, match_epoch, season, team_a_id, team_b_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(match_id) DO UPDATE SET
                 tournament=excluded.tournament,
                 stage=excluded.stage,
@@ -100,10 +153,19 @@ def upsert_match(conn: sqlite3.Connection, row: tuple) -> None:
                 match_result=excluded.match_result,
                 match_ts_utc=COALESCE(excluded.match_ts_utc, match_ts_utc),
                 match_date=COALESCE(excluded.match_date, match_date),
-                bans_picks=COALESCE(excluded.bans_picks, bans_picks)
+                bans_picks=COALESCE(excluded.bans_picks, bans_picks),
+                team_a_key=excluded.team_a_key,
+                team_b_key=excluded.team_b_key,
+                team_a_id=excluded.team_a_id,
+                team_b_id=excluded.team_b_id,""" + _MATCH_TIME_UPDATE + """
             """
         )
-    conn.execute(sql, row)
+    keys = (team_key(row[5]) or None, team_key(row[6]) or None)
+    dims = DimensionIds(conn)
+    ids = (dims.team(row[5]), dims.team(row[6]))
+    conn.execute(sql, tuple(row) + keys + match_time_fields(row[10], row[11]) + ids)
+    if len(row) > 12 and row[12]:
+        replace_vetoes(conn, row[0], row[12], row[5], row[6])
 
 
 def upsert_maps(conn: sqlite3.Connection, maps: list[tuple]) -> dict[tuple[int, str], int]:
@@ -120,6 +182,7 @@ def upsert_maps(conn: sqlite3.Connection, maps: list[tuple]) -> dict[tuple[int,
         Dictionary mapping (match_id, game_id) to map database id
     """
     cur = conn.cursor()
+    dims = DimensionIds(conn)
     lookup: dict[tuple[int, str], int] = {}
     def clean_map_name(name: str | None) -> str:
         if not name:
@@ -152,14 +215,15 @@ def upsert_maps(conn: sqlite3.Connection, maps: list[tuple]) -> dict[tuple[int,
         
         cur.execute(
             """
-            INSERT INTO Maps (match_id, game_id, map, team_a_score, team_b_score)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO Maps (match_id, game_id, map, team_a_score, team_b_score, map_dim_id)
+            VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(match_id, game_id) DO UPDATE SET
                 map=COALESCE(excluded.map, Maps.map),
                 team_a_score=COALESCE(excluded.team_a_score, Maps.team_a_score),
-                team_b_score=COALESCE(excluded.team_b_score, Maps.team_b_score)
+                team_b_score=COALESCE(excluded.team_b_score, Maps.team_b_score),
+                map_dim_id=COALESCE(excluded.map_dim_id, Maps.map_dim_id)
             """,
-            (match_id, game_id, map_name, ta_score, tb_score),
+            (match_id, game_id, map_name, ta_score, tb_score, dims.map(map_name)),
         )
         cur.execute("SELECT id FROM Maps WHERE match_id = ? AND game_id = ?", (match_id, game_id))
         row = cur.fetchone()
@@ -180,6 +244,7 @@ def upsert_player_stats(conn: sqlite3.Connection, stats: list[tuple], map_lookup
         map_lookup: Dictionary mapping (match_id, game_id) to map database id
     """
     cur = conn.cursor()
+    dims = DimensionIds(conn)
     for match_id, game_id, player, team, agent, rating, acs, kills, deaths, assists, first_kills, first_deaths in stats:
         # Skip if player name is missing
         if not player or player == '' or player == 'Unknown':
@@ -197,10 +262,10 @@ def upsert_player_stats(conn: sqlite3.Connection, stats: list[tuple], map_lookup
             # Try to insert a placeholder map if it doesn't exist
             cur.execute(
                 """
-                INSERT OR IGNORE INTO Maps (match_id, game_id, map, team_a_score, team_b_score)
-                VALUES (?, ?, 'Unknown', NULL, NULL)
+                INSERT OR IGNORE INTO Maps (match_id, game_id, map, team_a_score, team_b_score, map_dim_id)
+                VALUES (?, ?, 'Unknown', NULL, NULL, ?)
                 """,
-                (match_id, game_id),
+                (match_id, game_id, dims.map('Unknown')),
             )
             cur.execute("SELECT id FROM Maps WHERE match_id = ? AND game_id = ?", (match_id, game_id))
             row = cur.fetchone()
@@ -223,10 +288,16 @@ def upsert_player_stats(conn: sqlite3.Connection, stats: list[tuple], map_lookup
         
         cur.execute(
             """
-            INSERT INTO Player_Stats (match_id, map_id, game_id, player, team, agent, rating, acs, kills, deaths, assists, first_kills, first_deaths)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO Player_Stats (
+                match_id, map_id, game_id, player, team, agent, rating, acs, kills, deaths, assists, first_kills, first_deaths,
+                team_key, player_id, team_id, agent_id
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(match_id, map_id, player) DO UPDATE SET
                 team=COALESCE(excluded.team, Player_Stats.team),
+                team_key=COALESCE(excluded.team_key, Player_Stats.team_key),
+                team_id=COALESCE(excluded.team_id, Player_Stats.team_id),
+                agent_id=COALESCE(excluded.agent_id, Player_Stats.agent_id),
                 agent=COALESCE(excluded.agent, Player_Stats.agent),
                 rating=COALESCE(excluded.rating, Player_Stats.rating),
                 acs=COALESCE(excluded.acs, Player_Stats.acs),
@@ -236,5 +307,126 @@ def upsert_player_stats(conn: sqlite3.Connection, stats: list[tuple], map_lookup
                 first_kills=COALESCE(excluded.first_kills, Player_Stats.first_kills),
                 first_deaths=COALESCE(excluded.first_deaths, Player_Stats.first_deaths)
             """,
-            (match_id, map_id, game_id, player, team, agent, rating, acs, kills, deaths, assists, first_kills, first_deaths),
+            (match_id, map_id, game_id, player, team, agent, rating, acs, kills, deaths, assists, first_kills, first_deaths,
+             team_key(team) or None, dims.player(player), dims.team(team), dims.agent(agent)),
         )
+
+
+def update_team_keys(conn: sqlite3.Connection, only_missing: bool = False) -> dict[str, int]:
+    """
+    Recompute canonical team keys from the stored team names (caller commits).
+    
+    Run after alias changes or bulk team renames; ingestion keeps the keys
+    current for new rows. Each distinct name is keyed once and applied with
+    one UPDATE per (table, column, name).
+    
+    Args:
+        conn: Database connection
+        only_missing: Only fill rows whose key is NULL
+    
+    Returns:
+        Dictionary mapping "table.column" to the number of rows updated
+    """
+    # Elo_History's key comes from the Teams dimension (see dimensions.sync_dimensions)
+    targets = [
+        ("Matches", "team_a", "team_a_key"),
+        ("Matches", "team_b", "team_b_key"),
+        ("Player_Stats", "team", "team_key"),
+    ]
+    counts: dict[str, int] = {}
+    cur = conn.cursor()
+    for table, name_col, key_col in targets:
+        missing = f" AND {key_col} IS NULL" if only_missing else ""
+        names = [r[0] for r in cur.execute(
+            f"SELECT DISTINCT {name_col} FROM {table} WHERE {name_col} IS NOT NULL{missing}"
+        ).fetchall()]
+        if only_missing:
+            sql = f"UPDATE {table} SET {key_col} = ? WHERE {name_col} = ? AND {key_col} IS NULL"
+            params = [(team_key(n) or None, n) for n in names]
+        else:
+            sql = f"UPDATE {table} SET {key_col} = ? WHERE {name_col} = ? AND {key_col} IS NOT ?"
+            params = [(k, n, k) for n in names for k in [team_key(n) or None]]
+        before = conn.total_changes
+        cur.executemany(sql, params)
+        counts[f"{table}.{key_col}"] = conn.total_changes - before
+    return counts
+
+
+def update_match_epochs(
+    conn: sqlite3.Connection,
+    match_ids: list[int] | None = None,
+    only_missing: bool = False,
+) -> int:
+    """
+    Recompute Matches.match_epoch and season from match_ts_utc/match_date (caller commits).
+    
+    Args:
+        conn: Database connection
+        match_ids: Optional subset of matches (default: all)
+        only_missing: Only fill rows whose match_epoch is NULL
+    
+    Returns:
+        Number of rows updated
+    """
+    sql = "SELECT match_id, match_ts_utc, match_date, match_epoch, season FROM Matches"
+    if only_missing:
+        sql += " WHERE match_epoch IS NULL"
+    rows = conn.execute(sql).fetchall()
+    wanted = set(match_ids) if match_ids is not None else None
+    updates = []
+    for match_id, ts, date, epoch, season in rows:
+        if wanted is not None and match_id not in wanted:
+            continue
+        fields = match_time_fields(ts, date)
+        if fields != (epoch, season):
+            updates.append(fields + (match_id,))
+    conn.executemany("UPDATE Matches SET match_epoch = ?, season = ? WHERE match_id = ?", updates)
+    return len(updates)
+
+
+def find_complete_matches(conn: sqlite3.Connection, match_ids: list[int]) -> set[int]:
+    """
+    Return the subset of match_ids that are already completely ingested.
+    
+    A match is complete when it has a series score, at least as many maps as
+    maps played (team_a_score + team_b_score), every map has a score, and every
+    map has 10 Player_Stats rows. The whole batch is checked with one grouped
+    query against a temporary ID table, so the cost doesn't grow with the number
+    of round trips.
+    
+    Args:
+        conn: Database connection
+        match_ids: Candidate match IDs
+    
+    Returns:
+        Set of match IDs that don't need to be fetched again
+    """
+    ids = {int(m) for m in match_ids if m is not None}
+    if not ids:
+        return set()
+    cur = conn.cursor()
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS _candidate_ids (match_id INTEGER PRIMARY KEY)")
+    cur.execute("DELETE FROM _candidate_ids")
+    cur.executemany("INSERT OR IGNORE INTO _candidate_ids (match_id) VALUES (?)", [(m,) for m in ids])
+    cur.execute(
+        """
+        SELECT m.match_id
+        FROM _candidate_ids c
+        JOIN Matches m ON m.match_id = c.match_id
+        JOIN Maps mp ON mp.match_id = m.match_id
+        LEFT JOIN (
+            SELECT ps.map_id, COUNT(*) AS n
+            FROM Player_Stats ps
+            JOIN _candidate_ids c2 ON c2.match_id = ps.match_id
+            GROUP BY ps.map_id
+        ) pc ON pc.map_id = mp.id
+        WHERE m.team_a_score IS NOT NULL AND m.team_b_score IS NOT NULL
+        GROUP BY m.match_id
+        HAVING SUM(mp.team_a_score IS NULL OR mp.team_b_score IS NULL) = 0
+           AND MIN(COALESCE(pc.n, 0)) >= 10
+           AND COUNT(*) >= MAX(m.team_a_score) + MAX(m.team_b_score)
+        """
+    )
+    complete = {int(r[0]) for r in cur.fetchall()}
+    cur.execute("DELETE FROM _candidate_ids")
+    return complete
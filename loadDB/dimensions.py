@@ -0,0 +1,154 @@
+"""
+Dimension tables with integer surrogate keys.
+
+Teams, Players, MapsDim and Agents each map a normalized key to an integer ID
+and a display name. Fact rows reference them:
+
+- Matches.team_a_id / team_b_id
+- Maps.map_dim_id (Player_Stats.map_id already points at the Maps row)
+- Player_Stats.player_id / team_id / agent_id
+- Elo_History_Fact / Player_Elo_History_Fact, which store only IDs; the
+  Elo_History and Player_Elo_History views expose the old text columns.
+
+Keys are derived with the alias normalizers, so spelling variants of a team
+or map share one ID:
+
+- team:   normalizers.team.team_key (same as Matches.team_a_key)
+- player: the trimmed name (player names are already consistent and the Elo
+          code keys players by exact name)
+- map:    normalize_map(name), lowercased
+- agent:  trimmed name, lowercased
+
+IDs are assigned during ingestion (get-or-create, cached per DimensionIds
+instance) and can be rebuilt from the text columns with sync_dimensions().
+"""
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+from .normalizers.map import normalize_map
+from .normalizers.team import normalize_team, team_key
+
+# kind -> (table, id column, key column, name column)
+DIMENSIONS: Dict[str, Tuple[str, str, str, str]] = {
+    "team": ("Teams", "team_id", "team_key", "team_name"),
+    "player": ("Players", "player_id", "player_key", "player_name"),
+    "map": ("MapsDim", "map_dim_id", "map_key", "map_name"),
+    "agent": ("Agents", "agent_id", "agent_key", "agent_name"),
+}
+
+# Fact columns rebuilt by sync_dimensions: (table, name column, id column, kind)
+FACT_COLUMNS = [
+    ("Matches", "team_a", "team_a_id", "team"),
+    ("Matches", "team_b", "team_b_id", "team"),
+    ("Maps", "map", "map_dim_id", "map"),
+    ("Player_Stats", "player", "player_id", "player"),
+    ("Player_Stats", "team", "team_id", "team"),
+    ("Player_Stats", "agent", "agent_id", "agent"),
+]
+
+
+def dimension_key(kind: str, name: Optional[str]) -> Tuple[str, str]:
+    """
+    Return (key, display_name) for a raw name ('' key when the name is empty).
+
+    Args:
+        kind: "team", "player", "map" or "agent"
+        name: Raw or normalized name
+    """
+    name = (name or "").strip()
+    if not name:
+        return "", ""
+    if kind == "team":
+        return team_key(name), normalize_team(name)
+    if kind == "map":
+        display = normalize_map(name)
+        return display.lower(), display
+    if kind == "agent":
+        return name.lower(), name
+    return name, name
+
+
+class DimensionIds:
+    """Get-or-create surrogate IDs for one connection (caller commits)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._cache: Dict[str, Dict[str, int]] = {kind: {} for kind in DIMENSIONS}
+
+    def id(self, kind: str, name: Optional[str]) -> Optional[int]:
+        """Return the ID for a name, inserting a dimension row if needed (None for empty names)."""
+        key, display = dimension_key(kind, name)
+        if not key:
+            return None
+        cache = self._cache[kind]
+        if key in cache:
+            return cache[key]
+        table, id_col, key_col, name_col = DIMENSIONS[kind]
+        row = self.conn.execute(f"SELECT {id_col} FROM {table} WHERE {key_col} = ?", (key,)).fetchone()
+        if row is None:
+            cur = self.conn.execute(
+                f"INSERT INTO {table} ({key_col}, {name_col}) VALUES (?, ?)", (key, display)
+            )
+            cache[key] = int(cur.lastrowid)
+        else:
+            cache[key] = int(row[0])
+        return cache[key]
+
+    def team(self, name: Optional[str]) -> Optional[int]:
+        return self.id("team", name)
+
+    def player(self, name: Optional[str]) -> Optional[int]:
+        return self.id("player", name)
+
+    def map(self, name: Optional[str]) -> Optional[int]:
+        return self.id("map", name)
+
+    def agent(self, name: Optional[str]) -> Optional[int]:
+        return self.id("agent", name)
+
+
+def sync_dimensions(conn: sqlite3.Connection, only_missing: bool = False, prune: bool = False) -> Dict[str, int]:
+    """
+    Rebuild fact ID columns from the text columns (caller commits).
+
+    Run after alias changes or bulk renames (together with the team-key
+    backfill); ingestion assigns IDs for new rows.
+
+    Args:
+        conn: Database connection
+        only_missing: Only fill rows whose ID is NULL
+        prune: Delete dimension rows no fact row references anymore
+
+    Returns:
+        Dictionary mapping "table.column" to the number of rows updated
+        (plus "<Dimension>.pruned" counts when prune is set)
+    """
+    ids = DimensionIds(conn)
+    counts: Dict[str, int] = {}
+    cur = conn.cursor()
+    for table, name_col, id_col, kind in FACT_COLUMNS:
+        missing = f" AND {id_col} IS NULL" if only_missing else ""
+        names = [r[0] for r in cur.execute(
+            f"SELECT DISTINCT {name_col} FROM {table} WHERE {name_col} IS NOT NULL{missing}"
+        ).fetchall()]
+        params = [(i, n, i) for n in names for i in [ids.id(kind, n)]]
+        before = conn.total_changes
+        cur.executemany(f"UPDATE {table} SET {id_col} = ? WHERE {name_col} = ? AND {id_col} IS NOT ?", params)
+        counts[f"{table}.{id_col}"] = conn.total_changes - before
+    if prune:
+        references = {
+            "team": [
+                ("Matches", "team_a_id"), ("Matches", "team_b_id"), ("Player_Stats", "team_id"),
+                ("Elo_History_Fact", "team_id"), ("Elo_History_Fact", "opponent_id"),
+                ("Player_Elo_History_Fact", "team_id"), ("Player_Elo_History_Fact", "opponent_id"),
+            ],
+            "player": [("Player_Stats", "player_id"), ("Player_Elo_History_Fact", "player_id")],
+            "map": [("Maps", "map_dim_id")],
+            "agent": [("Player_Stats", "agent_id")],
+        }
+        for kind, refs in references.items():
+            table, id_col, _, _ = DIMENSIONS[kind]
+            used = " UNION ".join(f"SELECT {col} FROM {t} WHERE {col} IS NOT NULL" for t, col in refs)
+            cur.execute(f"DELETE FROM {table} WHERE {id_col} NOT IN ({used})")
+            counts[f"{table}.pruned"] = cur.rowcount
+    return counts
@@ -2,6 +2,7 @@ import sqlite3
 from datetime import datetime, timedelta
 from typing import Optional
 from .config import DB_PATH
+from .normalizers.team import team_key
 
 
 def _conn(db_path: str | None = None) -> sqlite3.Connection:
@@ -49,8 +50,9 @@ def top_teams(n: int = 20, date_range: Optional[str] = None):
     """
     Get top teams by Elo rating, optionally filtered by date range.
     
-    If date_range is specified, computes Elo ratings only from matches in that range.
-    Otherwise, uses the pre-computed Elo_Current table.
+    If date_range is specified, reads its stored snapshot (Elo_Snapshots, see
+    compute_elo_snapshots) or, when there is none, computes Elo ratings only
+    from matches in that range. Otherwise, uses the pre-computed Elo_Current table.
     
     Args:
         n: Number of top teams to return
@@ -59,6 +61,19 @@ def top_teams(n: int = 20, date_range: Optional[str] = None):
     Returns:
         List of tuples (team, rating, matches)
     """
+    if date_range and date_range.lower() != 'all-time':
+        from .migrations import ensure_schema
+
+        conn = _conn()
+        ensure_schema(conn)
+        rows = conn.execute(
+            "SELECT team, rating, matches FROM Elo_Snapshots WHERE date_range = ? ORDER BY rank LIMIT ?",
+            (date_range.lower(), n),
+        ).fetchall()
+        conn.close()
+        if rows:
+            return rows
+
     start_date, end_date = _parse_date_range(date_range)
     
     if start_date and end_date:
@@ -102,21 +117,35 @@ def top_players(n: int = 20):
 
 
 def team_history(team: str):
+    from .migrations import ensure_schema
+
     conn = _conn()
+    ensure_schema(conn)
     cur = conn.cursor()
     cur.execute(
         """
         SELECT h.match_id, m.tournament, m.stage, m.match_type, h.opponent, h.pre_rating, h.post_rating
         FROM Elo_History h LEFT JOIN Matches m ON m.match_id = h.match_id
-        WHERE LOWER(h.team) = LOWER(?) ORDER BY h.match_id ASC
+        WHERE h.team_key = ? ORDER BY h.match_id ASC
         """,
-        (team,),
+        (team_key(team),),
     )
     rows = cur.fetchall()
     conn.close()
     return rows
 
 
+def head_to_head(team_a: str, team_b: str, season: Optional[int] = None) -> dict:
+    from .migrations import ensure_schema
+    from .aggregates.head_to_head import lookup
+
+    conn = _conn()
+    ensure_schema(conn)
+    record = lookup(conn, team_a, team_b, season=season)
+    conn.close()
+    return record
+
+
 def player_history(player: str):
     conn = _conn()
     cur = conn.cursor()
@@ -2,9 +2,9 @@ import argparse
 import math
 import os
 import sqlite3
+import time
 from collections import defaultdict
 from statistics import mean
-import unicodedata
 from .config import (
     DB_PATH,
     START_ELO,
@@ -44,18 +44,22 @@ from .config import (
     PLAYER_DELTA_CAP,
     PLAYER_SEED_SCALE,
 )
-from .normalizers.team import normalize_team
+from .normalizers.team import normalize_team, team_key
+from .migrations import ensure_schema
+from .db_utils import date_to_epoch
+from .dimensions import DimensionIds
+from .publish import ELO_TABLES, SNAPSHOT_TABLES, create_shadow, shadow_name
+from .publish import publish as publish_tables, rollback as rollback_tables
+from . import changelog
+from .elo_timeline import ALL_TIME, SNAPSHOT_WINDOWS, has_snapshot, rebuild_timeline, window_filters, write_snapshot
+
+# ChangeLog consumer name (see changelog); advanced by compute_elo_snapshots
+ELO_CONSUMER = "elo"
+
 
 def canon(name: str | None) -> str:
-    """Canonicalize a team name for robust equality: lowercase and remove non-alphanumerics."""
-    if not name:
-        return ''
-    s = normalize_team(name)
-    s = s.lower()
-    # Strip diacritics (e.g., ü -> u)
-    s_norm = unicodedata.normalize('NFKD', s)
-    s_no_accents = ''.join(ch for ch in s_norm if not unicodedata.combining(ch))
-    return ''.join(ch for ch in s_no_accents if ch.isalnum())
+    """Canonicalize a team name for robust equality (same key stored in *_key columns)."""
+    return team_key(name)
 
 def get_importance(tournament: str, stage: str, match_type: str) -> float:
     t = (tournament or '').lower()
@@ -167,27 +171,20 @@ def get_round_margin(cur: sqlite3.Cursor, match_id: int) -> float | None:
 
 
 def get_team_roster(cur: sqlite3.Cursor, match_id: int, team: str) -> list[str]:
-    """Return distinct players for a given match whose normalized team matches.
+    """Return distinct players for a given match whose canonical team key matches.
 
-    This avoids strict string equality by normalizing Player_Stats.team values.
+    Player_Stats.team_key holds canon(team) (written at ingestion), so this is
+    an index seek on (match_id, team_key) instead of normalizing every row.
     """
     cur.execute(
         """
-        SELECT DISTINCT player, team
+        SELECT DISTINCT player
         FROM Player_Stats
-        WHERE match_id = ?
+        WHERE match_id = ? AND team_key = ?
         """,
-        (match_id,),
+        (match_id, canon(team)),
     )
-    rows = cur.fetchall()
-    target = canon(team)
-    roster: list[str] = []
-    for player, t in rows:
-        if not player:
-            continue
-        if canon(t) == target:
-            roster.append(player)
-    return roster
+    return [player for (player,) in cur.fetchall() if player]
 
 
 def get_match_stat_averages(cur: sqlite3.Cursor, match_id: int) -> tuple[float, float]:
@@ -322,18 +319,47 @@ def get_team_avg_rating(cur: sqlite3.Cursor, match_id: int, team: str) -> float
     """Return average rating for a normalized team in a match (None if unavailable)."""
     cur.execute(
         """
-        SELECT rating, team
+        SELECT AVG(rating)
         FROM Player_Stats
-        WHERE match_id = ? AND rating IS NOT NULL
+        WHERE match_id = ? AND team_key = ? AND rating IS NOT NULL
         """,
-        (match_id,),
+        (match_id, canon(team)),
     )
-    rows = cur.fetchall()
-    target = canon(team)
-    vals = [float(r) for (r, t) in rows if canon(t) == target and r is not None]
-    if not vals:
+    row = cur.fetchone()
+    if not row or row[0] is None:
         return None
-    return float(sum(vals) / len(vals))
+    return float(row[0])
+
+
+def _match_time_conditions(
+    start_date: str | None,
+    end_date: str | None,
+    season: int | None = None,
+    prefix: str = "",
+) -> tuple[list[str], list]:
+    """Range predicates on Matches.match_epoch/season for a date window (end date inclusive)."""
+    p = f"{prefix}." if prefix else ""
+    conditions: list[str] = []
+    params: list = []
+    if season is not None:
+        conditions.append(f"{p}season = ?")
+        params.append(season)
+    if start_date:
+        conditions.append(f"{p}match_epoch >= ?")
+        params.append(date_to_epoch(start_date))
+    if end_date:
+        conditions.append(f"{p}match_epoch < ?")
+        params.append(date_to_epoch(end_date, end_of_day=True))
+    return conditions, params
+
+
+# Dated matches by day (match_id within a day), undated ones last
+_MATCH_ORDER = """
+        ORDER BY
+          match_epoch IS NULL,
+          match_epoch / 86400,
+          match_id ASC
+"""
 
 
 def compute_elo(
@@ -343,20 +369,30 @@ def compute_elo(
     end_date: str | None = None,
     recency_half_life: float | None = None,
     delta_summary: bool = False,
+    season: int | None = None,
+    snapshot: str | None = None,
+    publish: bool = True,
 ):
     """
     Compute Elo ratings from matches in the database.
     
     Args:
-        save: If True, save Elo history and current ratings to database
+        save: If True, save Elo history, timeline and current ratings to database
         top: Number of top teams to display
         start_date: Optional start date filter (YYYY-MM-DD format)
         end_date: Optional end date filter (YYYY-MM-DD format)
+        season: Optional season (calendar year) filter
+        snapshot: If set, store the final ratings in Elo_Snapshots /
+                  Player_Elo_Snapshots under this date range name
+        publish: Swap the written shadow tables in when done. With False the
+                 caller publishes; snapshot rows then go to the shadow tables
+                 the caller created (see compute_elo_snapshots)
     """
     if not os.path.exists(DB_PATH):
         raise SystemExit(f"DB not found at {DB_PATH}")
 
     conn = sqlite3.connect(DB_PATH)
+    ensure_schema(conn)
     cur = conn.cursor()
 
     # Build query with optional date filtering
@@ -366,28 +402,16 @@ def compute_elo(
         FROM Matches
         WHERE team_a IS NOT NULL AND team_b IS NOT NULL
         AND team_a_score IS NOT NULL AND team_b_score IS NOT NULL
-        AND (match_ts_utc IS NULL OR datetime(match_ts_utc, '+5 hours') < datetime('now'))
+        AND (match_epoch IS NULL OR match_epoch < ?)
     """
-    params = []
+    params = [int(time.time()) - 5 * 3600]
     
-    if start_date or end_date:
-        date_conditions = []
-        if start_date:
-            date_conditions.append("(match_date >= ? OR (match_date IS NULL AND match_ts_utc >= ?))")
-            params.extend([start_date, start_date])
-        if end_date:
-            date_conditions.append("(match_date <= ? OR (match_date IS NULL AND match_ts_utc <= ?))")
-            params.extend([end_date, end_date + "T23:59:59Z"])
-        
-        if date_conditions:
-            query += " AND " + " AND ".join(date_conditions)
+    date_conditions, date_params = _match_time_conditions(start_date, end_date, season)
+    if date_conditions:
+        query += " AND " + " AND ".join(date_conditions)
+        params.extend(date_params)
     
-    query += """
-        ORDER BY
-          CASE WHEN match_date IS NOT NULL AND match_date <> '' THEN 0 ELSE 1 END,
-          match_date ASC,
-          match_id ASC
-    """
+    query += _MATCH_ORDER
     
     cur.execute(query, params)
     matches = cur.fetchall()
@@ -558,54 +582,51 @@ def compute_elo(
         print(f"  95th pct     : {p95_delta:.2f}")
         print(f"  Max |Δrating|: {max_delta:.2f}")
 
+    # Results go to empty shadow tables and are published with one atomic swap
+    # (see publish), so readers never see a half-written generation
+    if save:
+        for table in ELO_TABLES:
+            create_shadow(conn, table)
+    if snapshot and publish:
+        for table in SNAPSHOT_TABLES:
+            create_shadow(conn, table, copy_rows=True)
+
     if save:
-        # Reset history before saving to avoid duplicates across runs
-        cur.execute("DELETE FROM Elo_History")
+        # Histories store dimension IDs; Elo_History / Player_Elo_History are views
+        dims = DimensionIds(conn)
         cur.executemany(
-            """
-            INSERT INTO Elo_History (match_id, team, opponent, pre_rating, post_rating, expected, actual, margin, k_used, importance)
+            f"""
+            INSERT INTO {shadow_name("Elo_History_Fact")} (match_id, team_id, opponent_id, pre_rating, post_rating, expected, actual, margin, k_used, importance)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            history_rows,
+            [(mid, dims.team(t), dims.team(o), *rest) for (mid, t, o, *rest) in history_rows],
         )
         # Save player Elo history
-        cur.execute("DELETE FROM Player_Elo_History")
         cur.executemany(
-            """
-            INSERT INTO Player_Elo_History (match_id, player, team, opponent_team, pre_rating, post_rating, expected, actual, margin, k_used, importance)
+            f"""
+            INSERT INTO {shadow_name("Player_Elo_History_Fact")} (match_id, player_id, team_id, opponent_id, pre_rating, post_rating, expected, actual, margin, k_used, importance)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            player_history_rows,
+            [(mid, dims.player(p), dims.team(t), dims.team(o), *rest) for (mid, p, t, o, *rest) in player_history_rows],
         )
         # Replace current snapshot
-        cur.execute("DELETE FROM Elo_Current")
         cur.executemany(
-            """
-            INSERT INTO Elo_Current (team, rating, matches, last_match_id)
+            f"""
+            INSERT INTO {shadow_name("Elo_Current")} (team, rating, matches, last_match_id)
             VALUES (?, ?, ?, ?)
             """,
             [(t, ratings[t], games_played[t], None) for t in ratings.keys()],
         )
-        # Replace current snapshot with union of dynamic player ratings and seeds for all players in Player_Stats
-        cur.execute("DELETE FROM Player_Elo_Current")
+        rebuild_timeline(conn, history=shadow_name("Elo_History_Fact"), timeline=shadow_name("Elo_Timeline"))
+
+    if save or snapshot:
+        # Player snapshot: union of dynamic player ratings and seeds for all players in Player_Stats
 
         # Most recent team per player from Player_Stats (not most frequent)
         # Compute most frequent team for each player within the date range
         # This ensures players show their primary team for the specific time period
-        date_where = ""
-        date_params_team = []
-        
-        if start_date or end_date:
-            date_conditions = []
-            if start_date:
-                date_conditions.append("(m.match_date >= ? OR (m.match_date IS NULL AND m.match_ts_utc >= ?))")
-                date_params_team.extend([start_date, start_date])
-            if end_date:
-                date_conditions.append("(m.match_date <= ? OR (m.match_date IS NULL AND m.match_ts_utc <= ?))")
-                date_params_team.extend([end_date, end_date + "T23:59:59Z"])
-            
-            if date_conditions:
-                date_where = " AND " + " AND ".join(date_conditions)
+        date_conditions, date_params_team = _match_time_conditions(start_date, end_date, season, prefix="m")
+        date_where = "".join(f" AND {c}" for c in date_conditions)
         
         # Global average rating for seeding (filtered by date range)
         cur.execute(
@@ -677,14 +698,26 @@ def compute_elo(
                 matches_val = appearances
             to_insert.append((p, team, float(rating_val), int(matches_val), None))
 
-        cur.executemany(
-            """
-            INSERT INTO Player_Elo_Current (player, team, rating, matches, last_match_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            to_insert,
-        )
+        if save:
+            cur.executemany(
+                f"""
+                INSERT INTO {shadow_name("Player_Elo_Current")} (player, team, rating, matches, last_match_id)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                to_insert,
+            )
+        if snapshot:
+            write_snapshot(
+                conn,
+                snapshot,
+                [(t, ratings[t], games_played[t]) for t in ratings.keys()],
+                [row[:4] for row in to_insert],
+                team_table=shadow_name("Elo_Snapshots"),
+                player_table=shadow_name("Player_Elo_Snapshots"),
+            )
         conn.commit()
+        if publish:
+            publish_tables(conn, (ELO_TABLES if save else ()) + (SNAPSHOT_TABLES if snapshot else ()))
 
     # Print top N
     top_list = sorted(ratings.items(), key=lambda x: x[1], reverse=True)[: top]
@@ -695,71 +728,95 @@ def compute_elo(
     conn.close()
 
 
-def compute_elo_snapshots():
+def compute_elo_snapshots(windows: tuple[str, ...] = SNAPSHOT_WINDOWS, refresh_closed: bool = False):
     """
-    Compute and store ELO snapshots for fixed date ranges (2024, 2025) and 
-    recalculate for current year (2026) and all-time.
-    Automatically called after ingestion to keep current year and all-time updated.
+    Compute and store Elo snapshots for every date range the UI offers
+    (all-time, each season, rolling windows) in Elo_Snapshots /
+    Player_Elo_Snapshots. The all-time run also saves Elo_History,
+    Elo_Timeline and the Current tables. All of them are published in one
+    atomic swap at the end (the previous generation stays for `elo rollback`).
+    Automatically called after ingestion to keep the snapshots updated.
+    
+    NOTE: Past seasons that already have a snapshot are NOT recomputed - their
+    snapshots are preserved unless refresh_closed is set.
     
-    NOTE: Historical years (2024, 2025) are NOT recomputed - their snapshots are preserved.
-    Only 2026 and all-time are recalculated when new matches are added.
+    Args:
+        windows: Date ranges to compute (see elo_timeline.SNAPSHOT_WINDOWS)
+        refresh_closed: Recompute past seasons even if a snapshot exists
     """
     if not os.path.exists(DB_PATH):
         raise SystemExit(f"DB not found at {DB_PATH}")
 
-    # Only recompute current year (2026) and all-time
-    # Historical years (2024, 2025) snapshots are preserved and not touched
-    date_ranges = [
-        ('2026', '2026-01-01', '2026-12-31'),
-        (None, None, None),  # all-time
+    conn = sqlite3.connect(DB_PATH)
+    ensure_schema(conn)
+    current_year = time.localtime().tm_year
+    preserved = [
+        w for w in windows
+        if w.isdigit() and int(w) < current_year and not refresh_closed and has_snapshot(conn, w)
     ]
+    # Everything in the ChangeLog so far is covered by this run (consumer "elo")
+    seen_seq = changelog.latest_seq(conn)
+    # Every range is written into one set of shadow tables (starting from the
+    # live rows, so preserved seasons carry over) and published together
+    for table in SNAPSHOT_TABLES:
+        create_shadow(conn, table, copy_rows=True)
+    conn.commit()
+
+    for window in windows:
+        if window in preserved:
+            continue
+        print(f"\nComputing ELO snapshot for {window}...")
+        start_date, season = window_filters(window)
+        compute_elo(
+            save=(window == ALL_TIME),
+            top=5,
+            start_date=start_date,
+            season=season,
+            snapshot=window,
+            publish=False,
+        )
+        print(f"  ✓ Snapshot {window} computed")
 
-    for range_name, start_date, end_date in date_ranges:
-        print(f"\nComputing ELO snapshot for {range_name or 'all-time'}...")
-        
-        # Call compute_elo with save=True to populate Elo_Current and Player_Elo_Current
-        compute_elo(save=True, top=5, start_date=start_date, end_date=end_date)
-        
-        # Now copy from Elo_Current and Player_Elo_Current to snapshot tables
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        
-        if range_name:
-            # Create/update team snapshot table for this year
-            team_table = f"Elo_{range_name}"
-            cur.execute(f"DROP TABLE IF EXISTS {team_table}")
-            cur.execute(f"""
-                CREATE TABLE {team_table} AS
-                SELECT team, rating, matches FROM Elo_Current
-            """)
-            
-            # Create/update player snapshot table for this year
-            player_table = f"Player_Elo_{range_name}"
-            cur.execute(f"DROP TABLE IF EXISTS {player_table}")
-            cur.execute(f"""
-                CREATE TABLE {player_table} AS
-                SELECT player, team, rating, matches, last_match_id FROM Player_Elo_Current
-            """)
-            print(f"  ✓ Snapshot tables {team_table} and {player_table} created")
-        else:
-            # For all-time, the Current tables are the snapshot (they already have all-time data)
-            print("  ✓ All-time ELO stored in Elo_Current and Player_Elo_Current")
-        
+    tables = (ELO_TABLES if ALL_TIME in windows else ()) + SNAPSHOT_TABLES
+    publish_tables(conn, tables)
+    if ALL_TIME in windows:
+        changelog.advance(conn, ELO_CONSUMER, seen_seq)
         conn.commit()
-        conn.close()
-    
+    conn.close()
+    print(f"  ✓ Published {', '.join(tables)}")
+
     print("\n✓ ELO snapshots completed successfully!")
-    print("  (Historical 2024 & 2025 snapshots preserved)")
+    if preserved:
+        print(f"  (Past season snapshots preserved: {', '.join(preserved)})")
 
 
+def rollback_elo():
+    """Swap the previous published generation of the Elo tables back in (see publish)."""
+    if not os.path.exists(DB_PATH):
+        raise SystemExit(f"DB not found at {DB_PATH}")
 
-def _compute_elo_ratings(start_date: str | None = None, end_date: str | None = None):
+    conn = sqlite3.connect(DB_PATH)
+    ensure_schema(conn)
+    tables = rollback_tables(conn, ELO_TABLES + SNAPSHOT_TABLES)
+    conn.close()
+    if tables:
+        print(f"Rolled back: {', '.join(tables)}")
+    else:
+        print("No previous Elo generation to roll back to")
+
+
+def _compute_elo_ratings(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    season: int | None = None,
+):
     """
     Compute Elo ratings for a date range without saving to database.
     
     Args:
         start_date: Optional start date filter (YYYY-MM-DD format)
         end_date: Optional end date filter (YYYY-MM-DD format)
+        season: Optional season (calendar year) filter
     
     Returns:
         Tuple of (ratings dict, games_played dict)
@@ -768,6 +825,7 @@ def _compute_elo_ratings(start_date: str | None = None, end_date: str | None = N
         raise SystemExit(f"DB not found at {DB_PATH}")
 
     conn = sqlite3.connect(DB_PATH)
+    ensure_schema(conn)
     cur = conn.cursor()
 
     query = """
@@ -775,26 +833,11 @@ def _compute_elo_ratings(start_date: str | None = None, end_date: str | None = N
         FROM Matches
         WHERE team_a IS NOT NULL AND team_b IS NOT NULL
     """
-    params = []
-    
-    if start_date or end_date:
-        date_conditions = []
-        if start_date:
-            date_conditions.append("(match_date >= ? OR (match_date IS NULL AND match_ts_utc >= ?))")
-            params.extend([start_date, start_date])
-        if end_date:
-            date_conditions.append("(match_date <= ? OR (match_date IS NULL AND match_ts_utc <= ?))")
-            params.extend([end_date, end_date + "T23:59:59Z"])
-        
-        if date_conditions:
-            query += " AND " + " AND ".join(date_conditions)
+    date_conditions, params = _match_time_conditions(start_date, end_date, season)
+    if date_conditions:
+        query += " AND " + " AND ".join(date_conditions)
     
-    query += """
-        ORDER BY
-          CASE WHEN match_date IS NOT NULL AND match_date <> '' THEN 0 ELSE 1 END,
-          match_date ASC,
-          match_id ASC
-    """
+    query += _MATCH_ORDER
     
     cur.execute(query, params)
     matches = cur.fetchall()
@@ -917,10 +960,10 @@ if __name__ == "__main__":
                    h.team, h.opponent, h.pre_rating, h.post_rating, h.expected, h.actual, h.margin, h.k_used, h.importance
             FROM Elo_History h
             LEFT JOIN Matches m ON m.match_id = h.match_id
-            WHERE LOWER(h.team) = LOWER(?)
+            WHERE h.team_key = ?
             ORDER BY h.match_id ASC
             """,
-            (team,),
+            (canon(team),),
         )
         rows = cur.fetchall()
         print(f"\nElo history for {team}:")
@@ -938,11 +981,11 @@ if __name__ == "__main__":
                        h.team, h.opponent, (h.post_rating - h.pre_rating) AS delta, h.expected, h.actual, h.margin, h.k_used, h.importance
                 FROM Elo_History h
                 LEFT JOIN Matches m ON m.match_id = h.match_id
-                WHERE LOWER(h.team) = LOWER(?)
+                WHERE h.team_key = ?
                 ORDER BY delta DESC
                 LIMIT ?
                 """,
-                (team, args.limit),
+                (canon(team), args.limit),
             )
             pos_rows = cur.fetchall()
             cur.execute(
@@ -951,11 +994,11 @@ if __name__ == "__main__":
                        h.team, h.opponent, (h.post_rating - h.pre_rating) AS delta, h.expected, h.actual, h.margin, h.k_used, h.importance
                 FROM Elo_History h
                 LEFT JOIN Matches m ON m.match_id = h.match_id
-                WHERE LOWER(h.team) = LOWER(?)
+                WHERE h.team_key = ?
                 ORDER BY delta ASC
                 LIMIT ?
                 """,
-                (team, args.limit),
+                (canon(team), args.limit),
             )
             neg_rows = cur.fetchall()
             print(f"\nLargest swings for {team} (top {args.limit}):")
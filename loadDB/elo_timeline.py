@@ -0,0 +1,160 @@
+"""
+Published Elo outputs for readers (frontend, CLI display).
+
+Elo_Timeline: one row per (team_key, match) with the team's rating before and
+after the match and its rank among all teams rated so far (1 = highest).
+Rebuilt from Elo_History_Fact whenever compute_elo saves, so it always
+matches the all-time history. Both kinds of table are published through
+shadow tables (see publish).
+
+Elo_Snapshots / Player_Elo_Snapshots: final ratings per date range, one row
+per (date_range, rank). The date ranges are the ones the UI offers
+(SNAPSHOT_WINDOWS); compute_elo_snapshots() fills them.
+"""
+import bisect
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from .normalizers.team import team_key
+
+ALL_TIME = "all-time"
+
+# Rolling windows: name -> days back from today
+ROLLING_WINDOWS = {
+    "last-3-months": 90,
+    "last-6-months": 180,
+}
+
+SNAPSHOT_WINDOWS = (ALL_TIME, "2024", "2025", "2026", *ROLLING_WINDOWS)
+
+
+def window_filters(window: str, today: Optional[datetime] = None) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Return (start_date, season) match filters for a snapshot window.
+
+    Args:
+        window: "all-time", a year ("2025") or a rolling window ("last-3-months")
+        today: Reference date for rolling windows (default: now)
+    """
+    if window == ALL_TIME:
+        return None, None
+    if window in ROLLING_WINDOWS:
+        start = (today or datetime.now()) - timedelta(days=ROLLING_WINDOWS[window])
+        return start.strftime("%Y-%m-%d"), None
+    if window.isdigit():
+        return None, int(window)
+    raise ValueError(f"Unknown Elo window: {window}")
+
+
+def rebuild_timeline(
+    conn: sqlite3.Connection,
+    history: str = "Elo_History_Fact",
+    timeline: str = "Elo_Timeline",
+) -> int:
+    """
+    Rebuild Elo_Timeline from Elo_History_Fact (caller commits).
+
+    Ranks are computed by replaying the history in insertion order (the
+    order compute_elo processed the matches); both teams of a match are
+    updated before either rank is taken.
+
+    Args:
+        conn: Database connection
+        history: History table to read (compute_elo passes its shadow tables)
+        timeline: Timeline table to replace
+
+    Returns:
+        Number of timeline rows written
+    """
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT h.match_id, t.team_key, h.pre_rating, h.post_rating, m.match_epoch
+        FROM {history} h
+        JOIN Teams t ON t.team_id = h.team_id
+        LEFT JOIN Matches m ON m.match_id = h.match_id
+        ORDER BY h.id
+        """
+    )
+    current: dict[str, float] = {}
+    ordered: list[float] = []  # every team's current rating, ascending
+    rows = []
+    pending = []
+    pending_match = None
+
+    def flush():
+        for match_id, key, pre, post, epoch in pending:
+            rank = len(ordered) - bisect.bisect_right(ordered, post) + 1
+            rows.append((key, match_id, epoch, pre, post, rank))
+        pending.clear()
+
+    for match_id, key, pre, post, epoch in cur.fetchall():
+        if match_id != pending_match:
+            flush()
+            pending_match = match_id
+        if key in current:
+            del ordered[bisect.bisect_left(ordered, current[key])]
+        current[key] = post
+        bisect.insort(ordered, post)
+        pending.append((match_id, key, pre, post, epoch))
+    flush()
+
+    cur.execute(f"DELETE FROM {timeline}")
+    cur.executemany(
+        f"""
+        INSERT OR REPLACE INTO {timeline} (team_key, match_id, match_epoch, pre, post, rank_after)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
+
+
+def write_snapshot(
+    conn: sqlite3.Connection,
+    window: str,
+    teams: Iterable[Tuple[str, float, int]],
+    players: Iterable[Tuple[str, Optional[str], float, int]],
+    team_table: str = "Elo_Snapshots",
+    player_table: str = "Player_Elo_Snapshots",
+) -> None:
+    """
+    Replace one date range in Elo_Snapshots / Player_Elo_Snapshots (caller commits).
+
+    Args:
+        conn: Database connection
+        window: Date range name (see SNAPSHOT_WINDOWS)
+        teams: (team, rating, matches) rows
+        players: (player, team, rating, matches) rows
+        team_table: Team snapshot table (compute_elo passes its shadow tables)
+        player_table: Player snapshot table
+    """
+    cur = conn.cursor()
+    cur.execute(f"DELETE FROM {team_table} WHERE date_range = ?", (window,))
+    cur.executemany(
+        f"""
+        INSERT INTO {team_table} (date_range, rank, team_key, team, rating, matches)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (window, rank, team_key(team), team, rating, matches)
+            for rank, (team, rating, matches) in enumerate(sorted(teams, key=lambda r: -r[1]), 1)
+        ],
+    )
+    cur.execute(f"DELETE FROM {player_table} WHERE date_range = ?", (window,))
+    cur.executemany(
+        f"""
+        INSERT INTO {player_table} (date_range, rank, player, team, rating, matches)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (window, rank, player, team, rating, matches)
+            for rank, (player, team, rating, matches) in enumerate(sorted(players, key=lambda r: -r[2]), 1)
+        ],
+    )
+
+
+def has_snapshot(conn: sqlite3.Connection, window: str) -> bool:
+    """True if Elo_Snapshots already holds rows for the date range."""
+    return conn.execute("SELECT 1 FROM Elo_Snapshots WHERE date_range = ? LIMIT 1", (window,)).fetchone() is not None
@@ -0,0 +1,202 @@
+"""
+Incremental event watcher: ingest only newly listed or newly completed matches.
+
+Each watched event keeps per-match state (status + series score as last seen on
+the event's matches listing). A watch run:
+
+  1. Fetches the event's matches listing (the listing URL is resolved once and
+     cached, so steady-state runs cost a single listing fetch)
+  2. Diffs each listed match against the stored state
+  3. Ingests only completed matches that are new or whose status/score changed
+  4. Records the new state for everything it saw (ingested matches only once
+     their ingestion succeeded, so failures are retried on the next run)
+
+Matches already present in the DB with a matching final score are adopted into
+the state without refetching, so the first watch of an event that was ingested
+with ingest-tournament does not re-ingest it.
+
+Run:
+  python -m loadDB.cli watch-event https://www.vlr.gg/event/2682/vct-2026-americas-kickoff --match-type VCT
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .db_utils import get_conn
+from .migrations import ensure_schema
+from .scrapers.base import fetch_html
+from .tournament_scraper import (
+    extract_event_id_from_url,
+    get_tournament_matches_url,
+    parse_event_listing,
+)
+
+
+@dataclass
+class WatchResult:
+    """Outcome of watching one event."""
+    event_id: str
+    listed: int = 0
+    new: List[int] = field(default_factory=list)
+    changed: List[int] = field(default_factory=list)
+    to_ingest: List[int] = field(default_factory=list)
+    ingested: List[int] = field(default_factory=list)
+    fetches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _listing_key(entry: Dict) -> tuple:
+    return (entry['status'], entry['score_a'], entry['score_b'])
+
+
+def diff_listing(
+    conn: sqlite3.Connection, event_id: str, entries: List[Dict]
+) -> tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Compare listing entries with stored state.
+
+    Returns:
+        (new_entries, changed_entries, adopted_entries) where adopted entries are
+        unseen completed matches already in Matches with the same final score.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT match_id, status, score_a, score_b FROM EventMatchState WHERE event_id = ?",
+        (event_id,),
+    )
+    known = {mid: (st, a, b) for (mid, st, a, b) in cur.fetchall()}
+
+    unseen = [e for e in entries if e['match_id'] not in known]
+    changed = [e for e in entries if e['match_id'] in known and known[e['match_id']] != _listing_key(e)]
+
+    # Adopt unseen completed matches that are already fully scored in the DB
+    adopted: List[Dict] = []
+    completed_unseen = [e for e in unseen if e['status'] == 'completed']
+    if completed_unseen:
+        ids = [e['match_id'] for e in completed_unseen]
+        placeholders = ",".join("?" * len(ids))
+        cur.execute(
+            f"""
+            SELECT match_id, team_a_score, team_b_score
+            FROM Matches
+            WHERE match_id IN ({placeholders})
+              AND team_a_score IS NOT NULL AND team_b_score IS NOT NULL
+            """,
+            ids,
+        )
+        db_scores = {mid: (a, b) for (mid, a, b) in cur.fetchall()}
+        for e in completed_unseen:
+            scores = db_scores.get(e['match_id'])
+            if scores is None:
+                continue
+            listed = (e['score_a'], e['score_b'])
+            # Unknown listing score (fallback parser) trusts the DB row
+            if None in listed or scores == listed or scores == listed[::-1]:
+                adopted.append(e)
+
+    adopted_ids = {e['match_id'] for e in adopted}
+    new = [e for e in unseen if e['match_id'] not in adopted_ids]
+    return new, changed, adopted
+
+
+def _record_state(conn: sqlite3.Connection, event_id: str, entries: List[Dict], ingested: bool = False) -> None:
+    conn.executemany(
+        f"""
+        INSERT INTO EventMatchState (event_id, match_id, status, score_a, score_b, first_seen, last_seen, last_ingested)
+        VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now'), {"datetime('now')" if ingested else "NULL"})
+        ON CONFLICT(event_id, match_id) DO UPDATE SET
+            status = excluded.status,
+            score_a = excluded.score_a,
+            score_b = excluded.score_b,
+            last_seen = excluded.last_seen,
+            last_ingested = COALESCE(excluded.last_ingested, EventMatchState.last_ingested)
+        """,
+        [(event_id, e['match_id'], e['status'], e['score_a'], e['score_b']) for e in entries],
+    )
+
+
+async def watch_event(
+    event_url: str,
+    match_type: Optional[str] = None,
+    validate: bool = True,
+    dry_run: bool = False,
+) -> WatchResult:
+    """
+    Diff an event's listing against stored state and ingest new/changed completed matches.
+
+    Args:
+        event_url: Tournament event URL (e.g., https://www.vlr.gg/event/2792)
+        match_type: Optional match type override (VCT, VCL, OFFSEASON); remembered per event
+        validate: Validate data before inserting
+        dry_run: Only report what would be ingested; don't ingest or update state
+
+    Returns:
+        WatchResult with diff and ingestion details
+    """
+    from .ingestion import ingest_from_urls
+
+    event_id = extract_event_id_from_url(event_url)
+    if not event_id:
+        raise ValueError(f"Could not extract event ID from URL: {event_url}")
+
+    result = WatchResult(event_id=event_id)
+    conn = get_conn()
+    ensure_schema(conn)
+    cur = conn.cursor()
+    cur.execute("SELECT listing_url, match_type FROM WatchedEvents WHERE event_id = ?", (event_id,))
+    row = cur.fetchone()
+    listing_url = row[0] if row else None
+    match_type = match_type or (row[1] if row else None)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            if not listing_url:
+                listing_url = await get_tournament_matches_url(event_url, session=session)
+                result.fetches += 1
+            html = await fetch_html(session, listing_url)
+            result.fetches += 1
+        entries = parse_event_listing(html)
+        result.listed = len(entries)
+
+        new, changed, adopted = diff_listing(conn, event_id, entries)
+        result.new = [e['match_id'] for e in new]
+        result.changed = [e['match_id'] for e in changed]
+        pending = [e for e in new + changed if e['status'] == 'completed']
+        result.to_ingest = [e['match_id'] for e in pending]
+
+        if dry_run:
+            return result
+
+        # Everything seen but not (re)ingested is recorded now; ingested matches after success
+        pending_ids = set(result.to_ingest)
+        _record_state(conn, event_id, [e for e in entries if e['match_id'] not in pending_ids])
+        conn.execute(
+            """
+            INSERT INTO WatchedEvents (event_id, event_url, listing_url, match_type, last_checked)
+            VALUES (?, ?, ?, ?, datetime('now'))
+            ON CONFLICT(event_id) DO UPDATE SET
+                event_url = excluded.event_url,
+                listing_url = excluded.listing_url,
+                match_type = COALESCE(excluded.match_type, WatchedEvents.match_type),
+                last_checked = excluded.last_checked
+            """,
+            (event_id, event_url, listing_url, match_type),
+        )
+        conn.commit()
+
+        if pending:
+            urls = [f"https://www.vlr.gg/{e['match_id']}" for e in pending]
+            ingest_result = await ingest_from_urls(urls, validate=validate, match_type=match_type)
+            result.fetches += len(urls)
+            result.errors.extend(ingest_result.errors)
+            done = set(ingest_result.ingested_ids) | set(ingest_result.skipped_ids) | set(ingest_result.unchanged_ids)
+            result.ingested = [mid for mid in result.to_ingest if mid in set(ingest_result.ingested_ids)]
+            _record_state(conn, event_id, [e for e in pending if e['match_id'] in done], ingested=True)
+            conn.commit()
+        return result
+    finally:
+        conn.close()
@@ -0,0 +1,502 @@
+"""
+Durable ingestion job queue in SQLite.
+
+Bulk commands enqueue one IngestJobs row per match instead of keeping their
+work list in memory, then drain the queue with the worker. If a run is
+interrupted (crash, Ctrl-C, 429 storm), nothing is lost: the remaining jobs
+stay pending and `vlr worker` (or re-running the command) picks them up.
+
+Job lifecycle:
+
+    pending --lease--> leased --ok--> done
+                          |
+                          +--error--> pending (retry after backoff) ... failed
+
+A lease expires after JOB_LEASE_SECONDS, so jobs held by a worker that died are
+handed out again. Failed attempts are retried with exponential backoff until
+JOB_MAX_ATTEMPTS is reached. The in-process drain of a bulk command
+(ingest_via_queue) doesn't wait out those delays: it reports the jobs as
+errors and leaves them pending for `vlr worker`, which does wait for them.
+
+Run:
+  python -m loadDB.cli worker
+  python -m loadDB.cli jobs status
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .config import HTTP_CONCURRENCY, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS
+from .db_utils import get_conn, find_complete_matches
+from .migrations import ensure_schema
+from .scrapers.base import match_id_from_url
+
+JOB_STATUSES = ("pending", "leased", "done", "failed")
+
+
+def _to_match_id(item) -> Optional[int]:
+    text = str(item).strip()
+    return int(text) if text.isdigit() else match_id_from_url(text)
+
+
+def enqueue_matches(
+    items: Iterable,
+    match_type: Optional[str] = None,
+    priority: int = 0,
+    source: Optional[str] = None,
+    validate: bool = True,
+    reparse: bool = False,
+    skip_complete: bool = False,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[str, int]:
+    """
+    Add matches to the queue.
+
+    A match that already has a pending or leased job is not queued twice; its
+    existing job keeps the higher priority.
+
+    Args:
+        items: Match IDs or URLs, or (url, match_type) tuples
+        match_type: Match type for every job (overrides per-item types)
+        priority: Higher priorities are leased first
+        source: Command that enqueued the jobs (for status reporting)
+        validate: Validate data before inserting
+        reparse: Re-parse and rewrite even if the page content is unchanged
+        skip_complete: Don't enqueue matches that are already completely ingested
+        conn: Optional open connection (committed before returning)
+
+    Returns:
+        Dict with 'enqueued', 'already_queued', 'complete' and 'invalid' counts
+    """
+    own_conn = conn is None
+    conn = conn or get_conn()
+    ensure_schema(conn)
+    counts = {"enqueued": 0, "already_queued": 0, "complete": 0, "invalid": 0}
+    try:
+        jobs: Dict[int, tuple] = {}
+        for item in items:
+            url, item_type = item if isinstance(item, tuple) else (item, None)
+            mid = _to_match_id(url)
+            if mid is None:
+                counts["invalid"] += 1
+                continue
+            text = str(url).strip()
+            jobs.setdefault(mid, (text if not text.isdigit() else f"https://www.vlr.gg/{mid}", match_type or item_type))
+
+        if skip_complete and jobs:
+            complete = find_complete_matches(conn, list(jobs))
+            counts["complete"] = len(complete)
+            jobs = {mid: job for mid, job in jobs.items() if mid not in complete}
+
+        cur = conn.cursor()
+        active = set()
+        if jobs:
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS _enqueue_ids (match_id INTEGER PRIMARY KEY)")
+            cur.execute("DELETE FROM _enqueue_ids")
+            cur.executemany("INSERT INTO _enqueue_ids (match_id) VALUES (?)", [(m,) for m in jobs])
+            cur.execute(
+                """
+                SELECT j.match_id FROM IngestJobs j
+                JOIN _enqueue_ids e ON e.match_id = j.match_id
+                WHERE j.status IN ('pending', 'leased')
+                """
+            )
+            active = {r[0] for r in cur.fetchall()}
+            cur.execute("DELETE FROM _enqueue_ids")
+        if active:
+            cur.executemany(
+                """
+                UPDATE IngestJobs SET priority = MAX(priority, ?), updated_at = datetime('now')
+                WHERE match_id = ? AND status IN ('pending', 'leased')
+                """,
+                [(priority, mid) for mid in active],
+            )
+        new_rows = [
+            (mid, url, mt, priority, source, int(validate), int(reparse))
+            for mid, (url, mt) in jobs.items()
+            if mid not in active
+        ]
+        cur.executemany(
+            """
+            INSERT INTO IngestJobs (match_id, url, match_type, priority, source, validate, reparse)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            new_rows,
+        )
+        conn.commit()
+        counts["enqueued"] = len(new_rows)
+        counts["already_queued"] = len(active)
+        return counts
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def lease_jobs(conn: sqlite3.Connection, limit: int = 1, lease_seconds: int = JOB_LEASE_SECONDS) -> List[Dict]:
+    """
+    Atomically lease up to `limit` runnable jobs (pending and due, or leased with an expired lease).
+
+    Returns:
+        List of job dicts (job_id, match_id, url, match_type, attempts, validate, reparse)
+    """
+    cur = conn.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        cur.execute(
+            f"""
+            UPDATE IngestJobs
+            SET status = 'leased',
+                attempts = attempts + 1,
+                lease_expires = datetime('now', '+{int(lease_seconds)} seconds'),
+                updated_at = datetime('now')
+            WHERE job_id IN (
+                SELECT job_id FROM IngestJobs
+                WHERE (status = 'pending' AND available_at <= datetime('now'))
+                   OR (status = 'leased' AND lease_expires < datetime('now'))
+                ORDER BY priority DESC, job_id
+                LIMIT ?
+            )
+            RETURNING job_id, match_id, url, match_type, attempts, validate, reparse, priority
+            """,
+            (int(limit),),
+        )
+        rows = cur.fetchall()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    rows.sort(key=lambda r: (-r[7], r[0]))
+    return [
+        {
+            "job_id": r[0],
+            "match_id": r[1],
+            "url": r[2],
+            "match_type": r[3],
+            "attempts": r[4],
+            "validate": bool(r[5]),
+            "reparse": bool(r[6]),
+        }
+        for r in rows
+    ]
+
+
+def complete_job(conn: sqlite3.Connection, job_id: int) -> None:
+    conn.execute(
+        """
+        UPDATE IngestJobs
+        SET status = 'done', last_error = NULL, lease_expires = NULL, updated_at = datetime('now')
+        WHERE job_id = ?
+        """,
+        (job_id,),
+    )
+    conn.commit()
+
+
+def release_job(conn: sqlite3.Connection, job_id: int) -> None:
+    """Hand a leased job back without counting the attempt (e.g. on Ctrl-C)."""
+    conn.execute(
+        """
+        UPDATE IngestJobs
+        SET status = 'pending', attempts = MAX(0, attempts - 1), lease_expires = NULL, updated_at = datetime('now')
+        WHERE job_id = ? AND status = 'leased'
+        """,
+        (job_id,),
+    )
+    conn.commit()
+
+
+def fail_job(
+    conn: sqlite3.Connection,
+    job_id: int,
+    error: str,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+    retry_base: float = JOB_RETRY_BASE_SECONDS,
+) -> str:
+    """
+    Record a failed attempt; schedule a retry with backoff or mark the job failed.
+
+    Returns:
+        New status ('pending' or 'failed')
+    """
+    row = conn.execute("SELECT attempts FROM IngestJobs WHERE job_id = ?", (job_id,)).fetchone()
+    attempts = row[0] if row else max_attempts
+    if attempts >= max_attempts:
+        status, delay = "failed", 0
+    else:
+        status, delay = "pending", int(retry_base * 2 ** max(0, attempts - 1))
+    conn.execute(
+        f"""
+        UPDATE IngestJobs
+        SET status = ?, last_error = ?, lease_expires = NULL,
+            available_at = datetime('now', '+{delay} seconds'), updated_at = datetime('now')
+        WHERE job_id = ?
+        """,
+        (status, str(error)[:500], job_id),
+    )
+    conn.commit()
+    return status
+
+
+def retry_failed(conn: sqlite3.Connection) -> int:
+    """Reset failed jobs to pending with a fresh attempt budget. Returns the number reset."""
+    ensure_schema(conn)
+    cur = conn.execute(
+        """
+        UPDATE IngestJobs
+        SET status = 'pending', attempts = 0, available_at = datetime('now'), updated_at = datetime('now')
+        WHERE status = 'failed'
+        """
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+def jobs_status(conn: sqlite3.Connection) -> Dict[str, object]:
+    """
+    Summarize the queue.
+
+    Returns:
+        Dict with 'counts' (status -> n), 'by_source' (source -> {status: n}),
+        'due' (pending jobs runnable now), 'expired_leases' and 'recent_errors'
+    """
+    ensure_schema(conn)
+    cur = conn.cursor()
+    counts = {s: 0 for s in JOB_STATUSES}
+    by_source: Dict[str, Dict[str, int]] = {}
+    cur.execute("SELECT COALESCE(source, '-'), status, COUNT(*) FROM IngestJobs GROUP BY 1, 2")
+    for source, status, n in cur.fetchall():
+        counts[status] = counts.get(status, 0) + n
+        by_source.setdefault(source, {})[status] = n
+    cur.execute(
+        """
+        SELECT
+            SUM(CASE WHEN status = 'pending' AND available_at <= datetime('now') THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'leased' AND lease_expires < datetime('now') THEN 1 ELSE 0 END)
+        FROM IngestJobs
+        """
+    )
+    due, expired = cur.fetchone()
+    cur.execute(
+        """
+        SELECT match_id, status, attempts, last_error FROM IngestJobs
+        WHERE last_error IS NOT NULL AND status != 'done'
+        ORDER BY updated_at DESC LIMIT 10
+        """
+    )
+    return {
+        "counts": counts,
+        "by_source": by_source,
+        "due": due or 0,
+        "expired_leases": expired or 0,
+        "recent_errors": cur.fetchall(),
+    }
+
+
+@dataclass
+class WorkerResult:
+    """Outcome of a worker run."""
+    processed: int = 0
+    ingested_ids: List[int] = field(default_factory=list)
+    skipped_ids: List[int] = field(default_factory=list)
+    unchanged_ids: List[int] = field(default_factory=list)
+    retried: int = 0
+    failed: int = 0
+    # "Match <id>: <error>" for jobs left pending on a retry backoff (wait_for_retries=False)
+    deferred: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+class IngestWorker:
+    """
+    Drains IngestJobs with concurrent async workers.
+
+    Args:
+        concurrency: Number of jobs processed at once (the shared HTTP rate limiter still applies)
+        lease_seconds: Lease length; a job running longer is abandoned and re-leased later
+        max_attempts: Attempts before a job is marked failed
+        db_path: Database to lease jobs from and ingest into (default: config.DB_PATH)
+        recompute_debounce: With follow=True, recompute Elo snapshots while running,
+                            at most once per this many seconds (None: never; see recompute)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = HTTP_CONCURRENCY,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        db_path: Optional[str] = None,
+        recompute_debounce: Optional[float] = None,
+    ):
+        self.concurrency = max(1, int(concurrency))
+        self.lease_seconds = int(lease_seconds)
+        self.max_attempts = int(max_attempts)
+        self.db_path = db_path
+        self.recompute_debounce = recompute_debounce
+        self._conn: Optional[sqlite3.Connection] = None
+        self._result = WorkerResult()
+        # match_id -> last error of jobs this run scheduled for a retry
+        self._retrying: Dict[int, str] = {}
+
+    async def _run_job(self, job: Dict) -> None:
+        from .ingestion import ingest_from_urls
+
+        res = self._result
+        try:
+            # Give up before the lease runs out so no other worker picks it up concurrently
+            ingest_result = await asyncio.wait_for(
+                ingest_from_urls(
+                    [(job["url"], job["match_type"])],
+                    validate=job["validate"],
+                    skip_unchanged=not job["reparse"],
+                    db_path=self.db_path,
+                ),
+                timeout=max(1, self.lease_seconds - 5),
+            )
+            if ingest_result.error_count:
+                raise RuntimeError(ingest_result.errors[0] if ingest_result.errors else "ingestion error")
+        except asyncio.CancelledError:
+            release_job(self._conn, job["job_id"])
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}" if isinstance(e, asyncio.TimeoutError) else str(e)
+            status = fail_job(self._conn, job["job_id"], error, max_attempts=self.max_attempts)
+            if status == "failed":
+                self._retrying.pop(job["match_id"], None)
+                res.failed += 1
+                res.errors.append(f"Match {job['match_id']}: {error}")
+            else:
+                self._retrying[job["match_id"]] = error
+                res.retried += 1
+            return
+        complete_job(self._conn, job["job_id"])
+        self._retrying.pop(job["match_id"], None)
+        res.processed += 1
+        res.ingested_ids.extend(ingest_result.ingested_ids)
+        res.skipped_ids.extend(ingest_result.skipped_ids)
+        res.unchanged_ids.extend(ingest_result.unchanged_ids)
+        res.warnings.extend(ingest_result.warnings)
+
+    async def _worker(self, follow: bool, poll_seconds: float, wait_for_retries: bool) -> None:
+        while True:
+            jobs = lease_jobs(self._conn, 1, self.lease_seconds)
+            if not jobs:
+                # A one-off drain stops once nothing is due; leased jobs finish with their worker
+                if not follow and not (wait_for_retries and self._has_waiting()):
+                    return
+                await asyncio.sleep(poll_seconds)
+                continue
+            await self._run_job(jobs[0])
+
+    async def _recompute(self, poll_seconds: float) -> None:
+        from .recompute import run_pending
+
+        while True:
+            await asyncio.sleep(poll_seconds)
+            # Runs inline: ingestion pauses (rather than contends for the write lock) meanwhile
+            run_pending(debounce=self.recompute_debounce)
+
+    def _has_waiting(self) -> bool:
+        """True while jobs are waiting on a backoff delay or another worker's lease."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM IngestJobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return bool(row[0])
+
+    async def run(
+        self, follow: bool = False, poll_seconds: float = 5.0, wait_for_retries: bool = True
+    ) -> WorkerResult:
+        """
+        Process jobs until the queue is drained (or forever with follow=True).
+
+        Args:
+            follow: Keep polling for new jobs instead of returning when drained
+            poll_seconds: Sleep between polls when no job is due
+            wait_for_retries: Wait out the backoff of jobs scheduled for a retry, so
+                              the drain only returns once every job is done or
+                              failed. With False those jobs stay pending (for
+                              `vlr worker`) and are listed in WorkerResult.deferred.
+        """
+        self._conn = get_conn(self.db_path)
+        ensure_schema(self._conn)
+        self._result = WorkerResult()
+        self._retrying = {}
+        try:
+            tasks = [self._worker(follow, poll_seconds, wait_for_retries) for _ in range(self.concurrency)]
+            if follow and self.recompute_debounce is not None:
+                tasks.append(self._recompute(poll_seconds))
+            await asyncio.gather(*tasks)
+            self._result.deferred = [f"Match {mid}: {error}" for mid, error in self._retrying.items()]
+            return self._result
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+async def ingest_via_queue(
+    items: Iterable,
+    match_type: Optional[str] = None,
+    source: Optional[str] = None,
+    validate: bool = True,
+    reparse: bool = False,
+    skip_complete: bool = False,
+    priority: int = 0,
+    concurrency: int = HTTP_CONCURRENCY,
+):
+    """
+    Enqueue matches and drain the queue in-process.
+
+    Used by the bulk commands in place of calling ingest_from_urls with an
+    in-memory list. The drain also finishes jobs left over from interrupted
+    runs. A job that errors is reported and left pending for `vlr worker`
+    to retry after its backoff, rather than holding up the drain. Arguments
+    are as for enqueue_matches.
+
+    Returns:
+        IngestionResult aggregated over every job processed by this drain
+        (errors include the jobs left for a retry)
+    """
+    from .ingestion import IngestionResult
+
+    counts = enqueue_matches(
+        items,
+        match_type=match_type,
+        priority=priority,
+        source=source,
+        validate=validate,
+        reparse=reparse,
+        skip_complete=skip_complete,
+    )
+    print(
+        f"Queued {counts['enqueued']} job(s)"
+        + (f", {counts['already_queued']} already queued" if counts["already_queued"] else "")
+        + (f", {counts['complete']} already complete (fetch avoided)" if counts["complete"] else "")
+    )
+    res = await IngestWorker(concurrency=concurrency).run(wait_for_retries=False)
+    if res.deferred:
+        print(f"{len(res.deferred)} job(s) failed and will be retried by `vlr worker` after a backoff")
+    return IngestionResult(
+        success_count=len(res.ingested_ids),
+        error_count=res.failed + len(res.deferred),
+        skipped_count=len(res.skipped_ids),
+        warnings=res.warnings,
+        errors=res.errors + [f"{d} (retry pending)" for d in res.deferred],
+        ingested_ids=res.ingested_ids,
+        skipped_ids=res.skipped_ids,
+        complete_count=counts["complete"],
+        unchanged_ids=res.unchanged_ids,
+    )
+
+
+def run_worker(
+    concurrency: int = HTTP_CONCURRENCY,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+    follow: bool = False,
+) -> WorkerResult:
+    """Synchronous convenience wrapper around IngestWorker.run()."""
+    worker = IngestWorker(concurrency=concurrency, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    return asyncio.run(worker.run(follow=follow))
@@ -0,0 +1,102 @@
+"""
+Content-hash change detection for match pages.
+
+Each ingested match stores two hashes:
+
+- html_hash: the relevant region of the match page (title, .match-header and
+  .vm-stats containers) plus the parser version and the match type override.
+  Comments, sidebars and ads are outside the region, so they don't count as
+  changes. Computing it only builds the strained subtree, not the full soup.
+- data_hash: the extracted (match_row, maps, player_stats) tuples.
+
+On refetch, an identical html_hash skips parsing and writes entirely; an
+identical data_hash (page markup moved but data didn't) skips the writes.
+Both only apply while the match is still in Matches, so a cleared table or
+deleted row is re-ingested.
+When the data does change, changed_at is bumped; the rewritten rows also
+land in the ChangeLog, which downstream consumers (Elo, aggregates) read
+(see changelog).
+"""
+import hashlib
+import re
+import sqlite3
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Bump when scraper/normalizer output changes so unchanged pages are re-parsed
+PARSER_VERSION = 1
+
+_REGION = SoupStrainer(class_=["match-header", "vm-stats"])
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def html_region_hash(html: str, match_type: Optional[str] = None) -> str:
+    """
+    Hash the parts of a match page the scrapers read.
+
+    Args:
+        html: Raw match page HTML
+        match_type: Match type override used for this ingestion (part of the key,
+                    since it changes the stored row without changing the page)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    title = _TITLE_RE.search(html)
+    region = BeautifulSoup(html, "html.parser", parse_only=_REGION)
+    h = hashlib.sha256()
+    h.update(f"v{PARSER_VERSION}|{match_type or ''}|".encode())
+    h.update((title.group(1).strip() if title else "").encode("utf-8", "replace"))
+    h.update(str(region).encode("utf-8", "replace"))
+    return h.hexdigest()
+
+
+def data_hash(match_row: tuple, maps_info: List[tuple], players_info: List[tuple]) -> str:
+    """Hash the extracted tuples (order-independent for maps and player rows)."""
+    payload = repr((
+        tuple(match_row),
+        sorted(repr(m) for m in maps_info),
+        sorted(repr(p) for p in players_info),
+    ))
+    return hashlib.sha256(payload.encode("utf-8", "replace")).hexdigest()
+
+
+def get_hashes(conn: sqlite3.Connection, match_id: int) -> Tuple[Optional[str], Optional[str]]:
+    """Return the stored (html_hash, data_hash) for a match, or (None, None)."""
+    row = conn.execute(
+        "SELECT html_hash, data_hash FROM MatchContentHashes WHERE match_id = ?",
+        (match_id,),
+    ).fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def record_hashes(
+    conn: sqlite3.Connection,
+    match_id: int,
+    html_hash: str,
+    data_hash_value: Optional[str],
+    changed: bool,
+) -> None:
+    """
+    Store the hashes for a match (caller commits).
+
+    Args:
+        conn: Database connection
+        match_id: Match ID
+        html_hash: Region hash of the fetched page
+        data_hash_value: Hash of the extracted tuples (None keeps the stored one)
+        changed: True if the match's data was (re)written, which bumps changed_at
+    """
+    conn.execute(
+        f"""
+        INSERT INTO MatchContentHashes (match_id, html_hash, data_hash, checked_at, changed_at)
+        VALUES (?, ?, ?, datetime('now'), datetime('now'))
+        ON CONFLICT(match_id) DO UPDATE SET
+            html_hash = excluded.html_hash,
+            data_hash = COALESCE(excluded.data_hash, MatchContentHashes.data_hash),
+            checked_at = excluded.checked_at,
+            changed_at = {"excluded.changed_at" if changed else "MatchContentHashes.changed_at"}
+        """,
+        (match_id, html_hash, data_hash_value),
+    )
@@ -6,6 +6,10 @@ Orchestrates the complete ingestion process:
 2. Applies normalization (aliases)
 3. Validates data
 4. Inserts into database
+
+Refetched pages whose relevant HTML region is unchanged skip steps 2-4
+(see content_hash). Matches that were written refresh the aggregate tables
+(see loadDB.aggregates).
 """
 import aiohttp
 import asyncio
@@ -20,8 +24,18 @@ from ..scrapers.players import extract_player_stats
 from ..normalizers.team import normalize_team
 from ..normalizers.tournament import normalize_tournament
 from ..normalizers.match_type import normalize_match_type
-from ..db_utils import get_conn, ensure_matches_columns, upsert_match, upsert_maps, upsert_player_stats
+from ..db_utils import (
+    get_conn,
+    ensure_matches_columns,
+    find_complete_matches,
+    upsert_match,
+    upsert_maps,
+    upsert_player_stats,
+)
+from .. import changelog
+from ..aggregates import CONSUMER as AGGREGATES_CONSUMER, refresh_aggregates
 from .validator import validate_match_data
+from .content_hash import html_region_hash, data_hash, get_hashes, record_hashes
 
 
 @dataclass
@@ -32,26 +46,39 @@ class IngestionResult:
     skipped_count: int = 0
     warnings: List[str] = None
     errors: List[str] = None
+    ingested_ids: List[int] = None
+    skipped_ids: List[int] = None
+    complete_count: int = 0
+    complete_ids: List[int] = None
+    unchanged_ids: List[int] = None
     
     def __post_init__(self):
         if self.warnings is None:
             self.warnings = []
         if self.errors is None:
             self.errors = []
+        if self.ingested_ids is None:
+            self.ingested_ids = []
+        if self.skipped_ids is None:
+            self.skipped_ids = []
+        if self.complete_ids is None:
+            self.complete_ids = []
+        if self.unchanged_ids is None:
+            self.unchanged_ids = []
 
 
-async def scrape_and_normalize_match(url: str) -> tuple:
+async def fetch_match_html(url: str) -> tuple:
     """
-    Scrape a match and apply normalization.
+    Fetch a match page.
     
     Args:
-        url: Match URL
+        url: Match URL (or bare match ID)
     
     Returns:
-        Tuple of (match_metadata_dict, maps_info, players_info, match_type)
+        Tuple of (match_id, url, html)
     """
     # Get match ID
-    match_id = match_id_from_url(url)
+    match_id = match_id_from_url(str(url))
     if not match_id:
         # Try constructing URL if just ID provided
         if isinstance(url, int) or (isinstance(url, str) and url.isdigit()):
@@ -60,9 +87,23 @@ async def scrape_and_normalize_match(url: str) -> tuple:
         else:
             raise ValueError(f"Could not extract match ID from URL: {url}")
     
-    # Fetch and parse HTML
     async with aiohttp.ClientSession() as session:
         html = await fetch_html(session, url)
+    return match_id, url, html
+
+
+def parse_and_normalize_match(html: str, match_id: int, url: str) -> tuple:
+    """
+    Parse a fetched match page and apply normalization.
+    
+    Args:
+        html: Match page HTML
+        match_id: Match ID
+        url: Match URL
+    
+    Returns:
+        Tuple of (match_row, maps_info, players_info)
+    """
     soup = BeautifulSoup(html, 'html.parser')
     
     # Extract match metadata directly from the page
@@ -117,10 +158,27 @@ async def scrape_and_normalize_match(url: str) -> tuple:
     return match_row, maps_info, players_info
 
 
+async def scrape_and_normalize_match(url: str) -> tuple:
+    """
+    Scrape a match and apply normalization.
+    
+    Args:
+        url: Match URL
+    
+    Returns:
+        Tuple of (match_row, maps_info, players_info)
+    """
+    match_id, url, html = await fetch_match_html(url)
+    return parse_and_normalize_match(html, match_id, url)
+
+
 async def ingest_from_urls(
     urls: List[str] | List[Tuple[str, Optional[str]]],
     validate: bool = True,
-    match_type: Optional[str] = None
+    match_type: Optional[str] = None,
+    skip_complete: bool = False,
+    skip_unchanged: bool = True,
+    db_path: Optional[str] = None,
 ) -> IngestionResult:
     """
     Main ingestion pipeline that processes URLs and inserts into database.
@@ -136,94 +194,162 @@ async def ingest_from_urls(
         validate: If True, validate data before inserting
         match_type: Optional global match type override (overrides per-URL types)
                    Use VCT/VCL/OFFSEASON to indicate tournament tier
+        skip_complete: If True, check the whole batch against the DB up front and
+                       don't fetch matches that are already completely ingested
+                       (see db_utils.find_complete_matches)
+        skip_unchanged: If True, skip parsing/writes for refetched pages whose content
+                        hash is unchanged (only while the match is still in Matches);
+                        pass False to force a re-parse (e.g. rescrapes after a parser fix)
+        db_path: Database to write to (default: config.DB_PATH)
     
     Returns:
         IngestionResult with success/error counts and warnings
     """
-    conn = get_conn()
-    ensure_matches_columns(conn)
-    
-    success_count = 0
-    error_count = 0
-    skipped_count = 0
-    warnings = []
-    errors = []
-    
-    # Normalize urls to list of tuples
-    url_tuples = []
-    for item in urls:
-        if isinstance(item, tuple):
-            url_tuples.append(item)
-        else:
-            url_tuples.append((item, None))
+    conn = get_conn(db_path)
+    try:
+        ensure_matches_columns(conn)
+    
+        success_count = 0
+        error_count = 0
+        skipped_count = 0
+        warnings = []
+        errors = []
+        ingested_ids = []
+        skipped_ids = []
+        unchanged_ids = []
     
-    for url, url_match_type in url_tuples:
-        try:
-            # Use global override if provided, otherwise use per-URL type
-            effective_match_type = match_type or url_match_type
+        # Normalize urls to list of tuples
+        url_tuples = []
+        for item in urls:
+            if isinstance(item, tuple):
+                url_tuples.append(item)
+            else:
+                url_tuples.append((item, None))
+    
+        complete_ids = []
+        if skip_complete and url_tuples:
+            ids_by_url = {}
+            for url, _ in url_tuples:
+                text = str(url)
+                mid = int(text) if text.isdigit() else match_id_from_url(text)
+                if mid is not None:
+                    ids_by_url[url] = mid
+            complete = find_complete_matches(conn, list(ids_by_url.values()))
+            if complete:
+                complete_ids = sorted(complete)
+                url_tuples = [(u, t) for (u, t) in url_tuples if ids_by_url.get(u) not in complete]
+                print(f"Skipping {len(complete_ids)} already-complete match(es) (fetches avoided; use --force to refetch)")
+    
+        for url, url_match_type in url_tuples:
+            try:
+                # Use global override if provided, otherwise use per-URL type
+                effective_match_type = match_type or url_match_type
             
-            # Scrape and normalize
-            match_row, maps_info, players_info = await scrape_and_normalize_match(url)
-            match_id = match_row[0]
-            detected_match_type = match_row[3] if len(match_row) > 3 else None
+                # Fetch, then skip parsing entirely if the relevant region is unchanged
+                match_id, url, html = await fetch_match_html(url)
+                region_hash = html_region_hash(html, effective_match_type)
+                stored_html_hash, stored_data_hash = get_hashes(conn, match_id)
+                # Hashes only vouch for rows that are still there (tables cleared or rows deleted since)
+                can_skip = skip_unchanged and conn.execute(
+                    "SELECT 1 FROM Matches WHERE match_id = ?", (match_id,)
+                ).fetchone() is not None
+                if can_skip and stored_html_hash == region_hash:
+                    unchanged_ids.append(match_id)
+                    record_hashes(conn, match_id, region_hash, None, changed=False)
+                    conn.commit()
+                    continue
             
-            # ALWAYS skip showmatches, regardless of specified type
-            # Showmatches can exist within VCT/VCL tournaments but should be filtered
-            if detected_match_type == 'SHOWMATCH':
-                skipped_count += 1
-                print(f"Skipping showmatch: {url} (match_id: {match_id})")
-                continue
+                # Parse and normalize
+                match_row, maps_info, players_info = parse_and_normalize_match(html, match_id, url)
+                detected_match_type = match_row[3] if len(match_row) > 3 else None
             
-            # If user specified a match type, use it (unless it was SHOWMATCH, which we already filtered)
-            # Otherwise, use the auto-detected type
-            final_match_type = None
-            if effective_match_type and effective_match_type.upper() != 'SHOWMATCH':
-                # User specified a valid type (VCT/VCL/OFFSEASON)
-                final_match_type = normalize_match_type(effective_match_type)
-            elif detected_match_type and detected_match_type != 'SHOWMATCH':
-                # Use auto-detected type (already normalized)
-                final_match_type = detected_match_type
-            else:
-                # Fallback: default to VCT if unclear
-                final_match_type = 'VCT'
+                # ALWAYS skip showmatches, regardless of specified type
+                # Showmatches can exist within VCT/VCL tournaments but should be filtered
+                if detected_match_type == 'SHOWMATCH':
+                    skipped_count += 1
+                    skipped_ids.append(match_id)
+                    print(f"Skipping showmatch: {url} (match_id: {match_id})")
+                    record_hashes(conn, match_id, region_hash, None, changed=False)
+                    conn.commit()
+                    continue
+            
+                # If user specified a match type, use it (unless it was SHOWMATCH, which we already filtered)
+                # Otherwise, use the auto-detected type
+                final_match_type = None
+                if effective_match_type and effective_match_type.upper() != 'SHOWMATCH':
+                    # User specified a valid type (VCT/VCL/OFFSEASON)
+                    final_match_type = normalize_match_type(effective_match_type)
+                elif detected_match_type and detected_match_type != 'SHOWMATCH':
+                    # Use auto-detected type (already normalized)
+                    final_match_type = detected_match_type
+                else:
+                    # Fallback: default to VCT if unclear
+                    final_match_type = 'VCT'
             
-            # Update match row with final match type
-            match_row_list = list(match_row)
-            match_row_list[3] = final_match_type
-            match_row = tuple(match_row_list)
+                # Update match row with final match type
+                match_row_list = list(match_row)
+                match_row_list[3] = final_match_type
+                match_row = tuple(match_row_list)
             
-            # Validate if requested
-            if validate:
-                is_valid, match_warnings = validate_match_data(match_row, maps_info, players_info)
-                if match_warnings:
-                    warnings.extend([f"Match {match_id}: {w}" for w in match_warnings])
+                # Validate if requested
+                if validate:
+                    is_valid, match_warnings = validate_match_data(match_row, maps_info, players_info)
+                    if match_warnings:
+                        warnings.extend([f"Match {match_id}: {w}" for w in match_warnings])
             
-            # Insert into database
-            upsert_match(conn, match_row)
-            m_lookup = upsert_maps(conn, maps_info)
-            upsert_player_stats(conn, players_info, m_lookup)
-            conn.commit()
+                # Markup changed but the extracted data didn't: nothing to write
+                extracted_hash = data_hash(match_row, maps_info, players_info)
+                if can_skip and stored_data_hash == extracted_hash:
+                    unchanged_ids.append(match_id)
+                    record_hashes(conn, match_id, region_hash, extracted_hash, changed=False)
+                    conn.commit()
+                    continue
             
-            success_count += 1
+                # Insert into database
+                upsert_match(conn, match_row)
+                m_lookup = upsert_maps(conn, maps_info)
+                upsert_player_stats(conn, players_info, m_lookup)
+                record_hashes(conn, match_id, region_hash, extracted_hash, changed=True)
+                conn.commit()
             
-        except Exception as e:
-            error_count += 1
-            error_msg = f"Error ingesting {url}: {e}"
-            errors.append(error_msg)
-            print(error_msg)
-            import traceback
-            traceback.print_exc()
-            continue
+                success_count += 1
+                ingested_ids.append(match_id)
+            
+            except Exception as e:
+                error_count += 1
+                error_msg = f"Error ingesting {url}: {e}"
+                errors.append(error_msg)
+                print(error_msg)
+                import traceback
+                traceback.print_exc()
+                continue
     
-    conn.close()
+        # Keep the season aggregates in step with what this run wrote (the first
+        # refresh on a freshly migrated database builds them in full)
+        if ingested_ids or changelog.get_cursor(conn, AGGREGATES_CONSUMER) is None:
+            try:
+                refresh_aggregates(conn)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                warnings.append(f"Aggregate refresh failed (run `aggregates refresh`): {e}")
+    finally:
+        conn.close()
     
     if skipped_count > 0:
         print(f"Skipped {skipped_count} showmatch(es)")
+    if unchanged_ids:
+        print(f"Unchanged since last fetch (no writes): {len(unchanged_ids)}")
     
     return IngestionResult(
         success_count=success_count,
         error_count=error_count,
         skipped_count=skipped_count,
         warnings=warnings,
-        errors=errors
+        errors=errors,
+        ingested_ids=ingested_ids,
+        skipped_ids=skipped_ids,
+        complete_count=len(complete_ids),
+        complete_ids=complete_ids,
+        unchanged_ids=unchanged_ids,
     )
@@ -0,0 +1,85 @@
+"""
+Versioned schema migrations.
+
+The database schema is owned here: every table and index the loader, the
+Elo code and the frontend rely on is created by an ordered list of
+migrations (see versions.py). The applied version is tracked in
+PRAGMA user_version, so running migrations is cheap when the DB is current.
+
+Every migration is idempotent (CREATE ... IF NOT EXISTS, column checks
+before ALTER TABLE), so databases that were created by older ad-hoc code
+migrate cleanly from version 0.
+
+Run:
+  python -m loadDB.cli db migrate
+  python -m loadDB.cli db status
+  python -m loadDB.cli db explain
+"""
+import sqlite3
+from typing import Optional, Tuple
+
+from ..db_utils import get_conn
+from .versions import MIGRATIONS
+from .checks import HOT_QUERIES, explain_hot_queries
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in PRAGMA user_version."""
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: Optional[sqlite3.Connection] = None, verbose: bool = False) -> Tuple[int, int]:
+    """
+    Apply all pending migrations in order.
+
+    Each migration runs in its own transaction together with the user_version
+    bump, so an interrupted run resumes at the first unapplied migration.
+
+    Args:
+        conn: Optional open connection (default: new connection to DB_PATH)
+        verbose: Print each migration as it's applied
+
+    Returns:
+        (version_before, version_after)
+    """
+    own_conn = conn is None
+    conn = conn or get_conn()
+    try:
+        before = current_version(conn)
+        version = before
+        for number, migration in enumerate(MIGRATIONS, start=1):
+            if number <= version:
+                continue
+            if verbose:
+                print(f"  Applying {migration.__name__.lstrip('_')}...")
+            try:
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            version = number
+        return before, version
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Bring the schema up to date if needed (a single PRAGMA read when current)."""
+    if current_version(conn) < LATEST_VERSION:
+        migrate(conn)
+
+
+__all__ = [
+    "LATEST_VERSION",
+    "MIGRATIONS",
+    "HOT_QUERIES",
+    "current_version",
+    "migrate",
+    "ensure_schema",
+    "explain_hot_queries",
+]
@@ -0,0 +1,146 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot queries.
+
+Each entry pairs a representative query (same shape as the one in the CLI,
+Elo code or frontend) with the index it is expected to use. `vlr db explain`
+prints the plans and flags any query that fell back to a full table scan.
+"""
+import sqlite3
+from typing import Dict, List
+
+HOT_QUERIES: List[Dict] = [
+    {
+        "name": "team Elo history (display.team_history, elo --team)",
+        "sql": "SELECT h.match_id, h.post_rating FROM Elo_History h WHERE h.team_key = ? ORDER BY h.match_id",
+        "params": ("g2esports",),
+        "index": "idx_elo_history_fact_team",
+    },
+    {
+        "name": "player Elo history (display.player_history)",
+        "sql": "SELECT match_id, post_rating FROM Player_Elo_History WHERE LOWER(player) = LOWER(?) ORDER BY match_id",
+        "params": ("trent",),
+        "index": "idx_player_elo_history_fact_player",
+    },
+    {
+        "name": "matches in a date range",
+        "sql": "SELECT match_id FROM Matches WHERE match_date >= ? AND match_date <= ?",
+        "params": ("2025-01-01", "2025-12-31"),
+        "index": "idx_matches_match_date",
+    },
+    {
+        "name": "matches in an epoch range (elo date windows)",
+        "sql": "SELECT match_id FROM Matches WHERE match_epoch >= ? AND match_epoch < ?",
+        "params": (1735689600, 1767225600),
+        "index": "idx_matches_epoch",
+    },
+    {
+        "name": "matches in a season (elo snapshots)",
+        "sql": "SELECT match_id FROM Matches WHERE season = ? ORDER BY match_epoch",
+        "params": (2026,),
+        "index": "idx_matches_season_epoch",
+    },
+    {
+        "name": "team matches (frontend teams/activity)",
+        "sql": "SELECT match_id FROM Matches WHERE LOWER(team_a) = LOWER(?) OR LOWER(team_b) = LOWER(?)",
+        "params": ("g2 esports", "g2 esports"),
+        "index": "idx_matches_team_a_lower",
+    },
+    {
+        "name": "team matches by canonical key (frontend teams/activity)",
+        "sql": "SELECT match_id FROM Matches WHERE team_a_key IN (?) OR team_b_key IN (?)",
+        "params": ("g2esports", "g2esports"),
+        "index": "idx_matches_team_a_key",
+    },
+    {
+        "name": "team matches by exact name (frontend activity)",
+        "sql": "SELECT match_id FROM Matches m WHERE m.team_a = ? OR m.team_b = ?",
+        "params": ("G2 Esports", "G2 Esports"),
+        "index": "idx_matches_team_a",
+    },
+    {
+        "name": "player stat lines (frontend players)",
+        "sql": (
+            "SELECT ps.kills, m.match_id FROM Player_Stats ps "
+            "JOIN Maps mp ON ps.map_id = mp.id JOIN Matches m ON mp.match_id = m.match_id "
+            "WHERE ps.player = ?"
+        ),
+        "params": ("trent",),
+        "index": "idx_player_stats_player",
+    },
+    {
+        "name": "match scoreboard (frontend match/team pages)",
+        "sql": "SELECT ps.player FROM Player_Stats ps JOIN Maps mp ON ps.map_id = mp.id WHERE mp.match_id = ?",
+        "params": (0,),
+        "index": "idx_player_stats_map",
+    },
+    {
+        "name": "team roster lines by canonical key (frontend team page)",
+        "sql": "SELECT ps.player FROM Player_Stats ps WHERE ps.team_key IN (?)",
+        "params": ("g2esports",),
+        "index": "idx_player_stats_team_key",
+    },
+    {
+        "name": "team roster in a match (elo.get_team_roster)",
+        "sql": "SELECT DISTINCT player FROM Player_Stats WHERE match_id = ? AND team_key = ?",
+        "params": (0, "g2esports"),
+        "index": "idx_player_stats_match_team_key",
+    },
+    {
+        "name": "team ban/pick counts (frontend bans-picks)",
+        "sql": (
+            "SELECT v.action, LOWER(v.map), COUNT(*) FROM Vetoes v JOIN Matches mat ON mat.match_id = v.match_id "
+            "WHERE v.team_key = ? AND v.action IN ('ban', 'pick') AND mat.match_date >= ? AND mat.match_date < ? "
+            "GROUP BY v.action, LOWER(v.map)"
+        ),
+        "params": ("g2esports", "2026-01-01", "2027-01-01"),
+        "index": "idx_vetoes_team_action",
+    },
+    {
+        "name": "Elo top N for a date range (frontend elo API, show top-teams)",
+        "sql": "SELECT team, rating, matches FROM Elo_Snapshots WHERE date_range = ? ORDER BY rank LIMIT 20",
+        "params": ("2025",),
+        "index": "PRIMARY KEY",
+    },
+    {
+        "name": "team Elo timeline (frontend elo API ?team=)",
+        "sql": "SELECT match_id, pre, post, rank_after FROM Elo_Timeline WHERE team_key = ? ORDER BY match_epoch, match_id",
+        "params": ("g2esports",),
+        "index": "idx_elo_timeline_team_epoch",
+    },
+    {
+        "name": "head-to-head record (show head-to-head)",
+        "sql": "SELECT SUM(matches), SUM(wins_lo), SUM(wins_hi) FROM Head_To_Head WHERE team_key_lo = ? AND team_key_hi = ?",
+        "params": ("g2esports", "sentinels"),
+        "index": "PRIMARY KEY",
+    },
+    {
+        "name": "next upcoming match (ingest_next_completed)",
+        "sql": (
+            "SELECT match_id FROM Matches WHERE team_a_score IS NULL AND team_b_score IS NULL "
+            "AND match_ts_utc > ? ORDER BY match_ts_utc LIMIT 1"
+        ),
+        "params": ("2026-01-01T00:00:00Z",),
+        "index": "idx_matches_nullscore_ts",
+    },
+]
+
+
+def explain_hot_queries(conn: sqlite3.Connection) -> List[Dict]:
+    """
+    Run EXPLAIN QUERY PLAN for every hot query.
+
+    Returns:
+        List of dicts with name, plan (list of detail lines), index (expected)
+        and ok (True if the expected index appears in the plan)
+    """
+    results = []
+    for q in HOT_QUERIES:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {q['sql']}", q["params"]).fetchall()
+        plan = [r[3] for r in rows]
+        results.append({
+            "name": q["name"],
+            "plan": plan,
+            "index": q["index"],
+            "ok": any(q["index"] in line for line in plan),
+        })
+    return results
@@ -0,0 +1,740 @@
+"""
+Ordered schema migrations.
+
+Append new migrations to MIGRATIONS; never reorder or edit one that has
+shipped (its number is stored in PRAGMA user_version). Each migration must
+be idempotent so it can run against databases created by older code.
+"""
+import sqlite3
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _0001_core_tables(conn: sqlite3.Connection) -> None:
+    """Matches / Maps / Player_Stats and the Elo tables, plus columns added over time."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Matches (
+            match_id INTEGER PRIMARY KEY,
+            tournament TEXT,
+            stage TEXT,
+            match_type TEXT,
+            match_name TEXT,
+            team_a TEXT,
+            team_b TEXT,
+            team_a_score INTEGER,
+            team_b_score INTEGER,
+            match_result TEXT
+        )
+        """
+    )
+    _add_column(conn, "Matches", "match_ts_utc", "TEXT")
+    _add_column(conn, "Matches", "match_date", "TEXT")
+    _add_column(conn, "Matches", "bans_picks", "TEXT")
+    # Legacy DBs stored the classification in tournament_type (SQLite can't drop it)
+    cols = _columns(conn, "Matches")
+    if "tournament_type" in cols and "match_type" in cols:
+        cur.execute(
+            """
+            UPDATE Matches
+            SET match_type = tournament_type
+            WHERE (match_type IS NULL OR match_type = '' OR match_type NOT IN ('VCT', 'VCL', 'OFFSEASON', 'SHOWMATCH'))
+              AND tournament_type IS NOT NULL
+            """
+        )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Maps (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            game_id TEXT,
+            map TEXT,
+            team_a_score INTEGER,
+            team_b_score INTEGER,
+            UNIQUE(match_id, game_id)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Stats (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            map_id INTEGER,
+            game_id TEXT,
+            player TEXT,
+            team TEXT,
+            agent TEXT,
+            rating REAL,
+            acs INTEGER,
+            kills INTEGER,
+            deaths INTEGER,
+            assists INTEGER,
+            UNIQUE(match_id, map_id, player)
+        )
+        """
+    )
+    _add_column(conn, "Player_Stats", "first_kills", "INTEGER DEFAULT 0")
+    _add_column(conn, "Player_Stats", "first_deaths", "INTEGER DEFAULT 0")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Elo_History (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            team TEXT,
+            opponent TEXT,
+            pre_rating REAL,
+            post_rating REAL,
+            expected REAL,
+            actual REAL,
+            margin INTEGER,
+            k_used REAL,
+            importance REAL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Elo_Current (
+            team TEXT PRIMARY KEY,
+            rating REAL,
+            matches INTEGER,
+            last_match_id INTEGER
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Elo_History (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            player TEXT,
+            team TEXT,
+            opponent_team TEXT,
+            pre_rating REAL,
+            post_rating REAL,
+            expected REAL,
+            actual REAL,
+            margin REAL,
+            k_used REAL,
+            importance REAL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Elo_Current (
+            player TEXT PRIMARY KEY,
+            team TEXT,
+            rating REAL,
+            matches INTEGER,
+            last_match_id INTEGER
+        )
+        """
+    )
+
+
+def _0002_ingestion_state(conn: sqlite3.Connection) -> None:
+    """Pointer table and partial index used by ingest_next_completed."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS IngestionState (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """
+    )
+    # Earliest upcoming (null-score) match by timestamp
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_matches_nullscore_ts
+        ON Matches(match_ts_utc)
+        WHERE team_a_score IS NULL AND team_b_score IS NULL
+        """
+    )
+
+
+def _0003_hot_query_indexes(conn: sqlite3.Connection) -> None:
+    """Secondary indexes for the filters used by the CLI, Elo code and frontend (see checks.py)."""
+    statements = [
+        # Elo histories: per-team / per-player timelines and per-match lookups
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_team ON Elo_History(team, match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_team_lower ON Elo_History(LOWER(team))",
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_match ON Elo_History(match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_player_elo_history_player ON Player_Elo_History(player, match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_player_elo_history_player_lower ON Player_Elo_History(LOWER(player))",
+        "CREATE INDEX IF NOT EXISTS idx_player_elo_history_match ON Player_Elo_History(match_id)",
+        # Matches: date ranges and team filters (the frontend compares LOWER(team_x))
+        "CREATE INDEX IF NOT EXISTS idx_matches_match_date ON Matches(match_date)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_ts ON Matches(match_ts_utc)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_a ON Matches(team_a)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_b ON Matches(team_b)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_a_lower ON Matches(LOWER(team_a))",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_b_lower ON Matches(LOWER(team_b))",
+        # Player_Stats: player pages, map joins, team rosters
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_player ON Player_Stats(player)",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_map ON Player_Stats(map_id)",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_team_lower ON Player_Stats(LOWER(team))",
+    ]
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _0004_pipeline_state(conn: sqlite3.Connection) -> None:
+    """Crawler frontier, event watcher state, content hashes and the ingestion job queue."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS CrawlFrontier (
+            node_key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            url TEXT NOT NULL,
+            season INTEGER,
+            event_id TEXT,
+            name TEXT,
+            position INTEGER,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS CrawlMatches (
+            match_id INTEGER PRIMARY KEY,
+            event_id TEXT,
+            season INTEGER,
+            tournament TEXT,
+            position INTEGER,
+            completed INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS WatchedEvents (
+            event_id TEXT PRIMARY KEY,
+            event_url TEXT NOT NULL,
+            listing_url TEXT,
+            match_type TEXT,
+            last_checked TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS EventMatchState (
+            event_id TEXT NOT NULL,
+            match_id INTEGER NOT NULL,
+            status TEXT,
+            score_a INTEGER,
+            score_b INTEGER,
+            first_seen TEXT,
+            last_seen TEXT,
+            last_ingested TEXT,
+            PRIMARY KEY (event_id, match_id)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS MatchContentHashes (
+            match_id INTEGER PRIMARY KEY,
+            html_hash TEXT NOT NULL,
+            data_hash TEXT,
+            checked_at TEXT,
+            changed_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_content_hashes_changed ON MatchContentHashes(changed_at)"
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS IngestJobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            match_type TEXT,
+            priority INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            source TEXT,
+            validate INTEGER NOT NULL DEFAULT 1,
+            reparse INTEGER NOT NULL DEFAULT 0,
+            available_at TEXT NOT NULL DEFAULT (datetime('now')),
+            lease_expires TEXT,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ingestjobs_status ON IngestJobs(status, priority, job_id)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ingestjobs_match ON IngestJobs(match_id, status)")
+
+
+def _0005_team_keys(conn: sqlite3.Connection) -> None:
+    """Canonical team keys (normalizers.team.team_key) on Matches, Player_Stats and Elo_History."""
+    _add_column(conn, "Matches", "team_a_key", "TEXT")
+    _add_column(conn, "Matches", "team_b_key", "TEXT")
+    _add_column(conn, "Player_Stats", "team_key", "TEXT")
+    _add_column(conn, "Elo_History", "team_key", "TEXT")
+    statements = [
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_a_key ON Matches(team_a_key)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_b_key ON Matches(team_b_key)",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_team_key ON Player_Stats(team_key)",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_match_team_key ON Player_Stats(match_id, team_key)",
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_team_key ON Elo_History(team_key, match_id)",
+    ]
+    for sql in statements:
+        conn.execute(sql)
+    # Fill existing rows; ingestion writes the keys from here on
+    from ..db_utils import update_team_keys
+    update_team_keys(conn, only_missing=True)
+
+
+def _0006_match_epoch(conn: sqlite3.Connection) -> None:
+    """Integer match time (UTC epoch seconds) and season, for index range scans instead of date-string parsing."""
+    _add_column(conn, "Matches", "match_epoch", "INTEGER")
+    _add_column(conn, "Matches", "season", "INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_epoch ON Matches(match_epoch)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_season_epoch ON Matches(season, match_epoch)")
+    from ..db_utils import update_match_epochs
+    update_match_epochs(conn, only_missing=True)
+
+
+def _0007_dimensions(conn: sqlite3.Connection) -> None:
+    """Teams / Players / MapsDim / Agents with integer IDs, ID columns on the facts, ID-only Elo histories."""
+    from ..dimensions import DIMENSIONS, DimensionIds, sync_dimensions
+
+    cur = conn.cursor()
+    for table, id_col, key_col, name_col in DIMENSIONS.values():
+        cur.execute(f"CREATE TABLE IF NOT EXISTS {table} ({id_col} INTEGER PRIMARY KEY)")
+        # Older analytics code created Teams/Players without these columns
+        _add_column(conn, table, key_col, "TEXT")
+        _add_column(conn, table, name_col, "TEXT")
+        cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table.lower()}_key ON {table}({key_col})")
+
+    _add_column(conn, "Matches", "team_a_id", "INTEGER REFERENCES Teams(team_id)")
+    _add_column(conn, "Matches", "team_b_id", "INTEGER REFERENCES Teams(team_id)")
+    _add_column(conn, "Maps", "map_dim_id", "INTEGER REFERENCES MapsDim(map_dim_id)")
+    _add_column(conn, "Player_Stats", "player_id", "INTEGER REFERENCES Players(player_id)")
+    _add_column(conn, "Player_Stats", "team_id", "INTEGER REFERENCES Teams(team_id)")
+    _add_column(conn, "Player_Stats", "agent_id", "INTEGER REFERENCES Agents(agent_id)")
+    for sql in [
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_a_id ON Matches(team_a_id)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_team_b_id ON Matches(team_b_id)",
+        "CREATE INDEX IF NOT EXISTS idx_maps_map_dim ON Maps(map_dim_id)",
+        # team_id is 1:1 with team_key, so (match_id, team_key) already covers
+        # per-team lookups; the LOWER(team) index is superseded by the keys
+        "DROP INDEX IF EXISTS idx_player_stats_team_lower",
+        # display.player_history matches players case-insensitively
+        "CREATE INDEX IF NOT EXISTS idx_players_name_lower ON Players(LOWER(player_name))",
+    ]:
+        cur.execute(sql)
+    sync_dimensions(conn, only_missing=True)
+
+    # Elo histories are rewritten wholesale by compute_elo, so they store IDs
+    # only; same-named views keep the text columns for readers.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Elo_History_Fact (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            team_id INTEGER REFERENCES Teams(team_id),
+            opponent_id INTEGER REFERENCES Teams(team_id),
+            pre_rating REAL,
+            post_rating REAL,
+            expected REAL,
+            actual REAL,
+            margin INTEGER,
+            k_used REAL,
+            importance REAL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Elo_History_Fact (
+            id INTEGER PRIMARY KEY,
+            match_id INTEGER,
+            player_id INTEGER REFERENCES Players(player_id),
+            team_id INTEGER REFERENCES Teams(team_id),
+            opponent_id INTEGER REFERENCES Teams(team_id),
+            pre_rating REAL,
+            post_rating REAL,
+            expected REAL,
+            actual REAL,
+            margin REAL,
+            k_used REAL,
+            importance REAL
+        )
+        """
+    )
+    for sql in [
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_fact_team ON Elo_History_Fact(team_id, match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_elo_history_fact_match ON Elo_History_Fact(match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_player_elo_history_fact_player ON Player_Elo_History_Fact(player_id, match_id)",
+        "CREATE INDEX IF NOT EXISTS idx_player_elo_history_fact_match ON Player_Elo_History_Fact(match_id)",
+    ]:
+        cur.execute(sql)
+
+    kinds = {r[0]: r[1] for r in cur.execute("SELECT name, type FROM sqlite_master WHERE name IN ('Elo_History', 'Player_Elo_History')")}
+    ids = DimensionIds(conn)
+    if kinds.get("Elo_History") == "table":
+        rows = cur.execute(
+            "SELECT id, match_id, team, opponent, pre_rating, post_rating, expected, actual, margin, k_used, importance FROM Elo_History"
+        ).fetchall()
+        cur.executemany(
+            "INSERT INTO Elo_History_Fact VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(r[0], r[1], ids.team(r[2]), ids.team(r[3]), *r[4:]) for r in rows],
+        )
+        cur.execute("DROP TABLE Elo_History")
+    if kinds.get("Player_Elo_History") == "table":
+        rows = cur.execute(
+            "SELECT id, match_id, player, team, opponent_team, pre_rating, post_rating, expected, actual, margin, k_used, importance FROM Player_Elo_History"
+        ).fetchall()
+        cur.executemany(
+            "INSERT INTO Player_Elo_History_Fact VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(r[0], r[1], ids.player(r[2]), ids.team(r[3]), ids.team(r[4]), *r[5:]) for r in rows],
+        )
+        cur.execute("DROP TABLE Player_Elo_History")
+    cur.execute(
+        """
+        CREATE VIEW IF NOT EXISTS Elo_History AS
+        SELECT h.id, h.match_id, t.team_name AS team, o.team_name AS opponent,
+               h.pre_rating, h.post_rating, h.expected, h.actual, h.margin, h.k_used, h.importance,
+               t.team_key AS team_key, h.team_id, h.opponent_id
+        FROM Elo_History_Fact h
+        LEFT JOIN Teams t ON t.team_id = h.team_id
+        LEFT JOIN Teams o ON o.team_id = h.opponent_id
+        """
+    )
+    cur.execute(
+        """
+        CREATE VIEW IF NOT EXISTS Player_Elo_History AS
+        SELECT h.id, h.match_id, p.player_name AS player, t.team_name AS team, o.team_name AS opponent_team,
+               h.pre_rating, h.post_rating, h.expected, h.actual, h.margin, h.k_used, h.importance,
+               h.player_id, h.team_id, h.opponent_id
+        FROM Player_Elo_History_Fact h
+        JOIN Players p ON p.player_id = h.player_id
+        LEFT JOIN Teams t ON t.team_id = h.team_id
+        LEFT JOIN Teams o ON o.team_id = h.opponent_id
+        """
+    )
+
+
+def _0008_vetoes(conn: sqlite3.Connection) -> None:
+    """Vetoes parsed from Matches.bans_picks, indexed for per-team ban/pick counts."""
+    from ..vetoes import update_vetoes
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Vetoes (
+            match_id INTEGER NOT NULL REFERENCES Matches(match_id),
+            veto_order INTEGER NOT NULL,
+            team_key TEXT,
+            action TEXT NOT NULL,
+            map TEXT NOT NULL,
+            PRIMARY KEY (match_id, veto_order)
+        ) WITHOUT ROWID
+        """
+    )
+    # Covers the per-team GROUP BY (action, map); match_id comes with the primary key
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_vetoes_team_action ON Vetoes(team_key, action, map)")
+    update_vetoes(conn)
+
+
+def _0009_season_stats(conn: sqlite3.Connection) -> None:
+    """
+    Materialized per-season team and player aggregates (see loadDB.aggregates).
+
+    Tables only: the first refresh_aggregates() (no cursor yet) fills them.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Team_Season_Stats (
+            team_key TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            team_id INTEGER REFERENCES Teams(team_id),
+            team_name TEXT,
+            matches INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            losses INTEGER NOT NULL,
+            maps_won INTEGER NOT NULL,
+            maps_lost INTEGER NOT NULL,
+            rounds_won INTEGER NOT NULL,
+            rounds_lost INTEGER NOT NULL,
+            round_diff INTEGER NOT NULL,
+            avg_rating REAL,
+            avg_acs REAL,
+            avg_kills REAL,
+            avg_deaths REAL,
+            avg_assists REAL,
+            first_kills INTEGER NOT NULL,
+            first_deaths INTEGER NOT NULL,
+            last_match_date TEXT,
+            PRIMARY KEY (team_key, season)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Season_Stats (
+            player TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            player_id INTEGER REFERENCES Players(player_id),
+            primary_team_key TEXT,
+            latest_team_key TEXT,
+            matches INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            maps_played INTEGER NOT NULL,
+            avg_rating REAL,
+            avg_acs REAL,
+            avg_kills REAL,
+            avg_deaths REAL,
+            avg_assists REAL,
+            first_kills INTEGER NOT NULL,
+            first_deaths INTEGER NOT NULL,
+            last_match_date TEXT,
+            PRIMARY KEY (player, season)
+        ) WITHOUT ROWID
+        """
+    )
+    # Listing pages read one season at a time
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_team_season_stats_season ON Team_Season_Stats(season)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_player_season_stats_season ON Player_Season_Stats(season)")
+
+
+def _0010_map_comp_stats(conn: sqlite3.Connection) -> None:
+    """Materialized per-team map-pool and agent-composition aggregates."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Team_Map_Stats (
+            team_key TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            map TEXT NOT NULL,
+            played INTEGER NOT NULL,
+            won INTEGER NOT NULL,
+            round_diff INTEGER NOT NULL,
+            pick_count INTEGER NOT NULL,
+            PRIMARY KEY (team_key, season, map)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Team_Comp_Stats (
+            team_key TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            map TEXT NOT NULL,
+            comp_signature TEXT NOT NULL,
+            played INTEGER NOT NULL,
+            won INTEGER NOT NULL,
+            PRIMARY KEY (team_key, season, map, comp_signature)
+        ) WITHOUT ROWID
+        """
+    )
+    # "Most-played comp on a map" across teams
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_team_comp_stats_map ON Team_Comp_Stats(season, map, played)")
+
+
+def _0011_head_to_head(conn: sqlite3.Connection) -> None:
+    """Materialized head-to-head records keyed by the ordered canonical team pair."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Head_To_Head (
+            team_key_lo TEXT NOT NULL,
+            team_key_hi TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            matches INTEGER NOT NULL,
+            wins_lo INTEGER NOT NULL,
+            wins_hi INTEGER NOT NULL,
+            maps_lo INTEGER NOT NULL,
+            maps_hi INTEGER NOT NULL,
+            last_match_id INTEGER REFERENCES Matches(match_id),
+            PRIMARY KEY (team_key_lo, team_key_hi, season)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _0012_elo_timeline(conn: sqlite3.Connection) -> None:
+    """Per-match team rating timeline and per-date-range Elo snapshot tables."""
+    from ..elo_timeline import ALL_TIME, rebuild_timeline, write_snapshot
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Elo_Timeline (
+            team_key TEXT NOT NULL,
+            match_id INTEGER NOT NULL REFERENCES Matches(match_id),
+            match_epoch INTEGER,
+            pre REAL NOT NULL,
+            post REAL NOT NULL,
+            rank_after INTEGER NOT NULL,
+            PRIMARY KEY (team_key, match_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_elo_timeline_team_epoch ON Elo_Timeline(team_key, match_epoch)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_elo_timeline_match ON Elo_Timeline(match_id)")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Elo_Snapshots (
+            date_range TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            team_key TEXT NOT NULL,
+            team TEXT NOT NULL,
+            rating REAL NOT NULL,
+            matches INTEGER NOT NULL,
+            PRIMARY KEY (date_range, rank)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Player_Elo_Snapshots (
+            date_range TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            player TEXT NOT NULL,
+            team TEXT,
+            rating REAL NOT NULL,
+            matches INTEGER NOT NULL,
+            PRIMARY KEY (date_range, rank)
+        ) WITHOUT ROWID
+        """
+    )
+
+    # Carry over the current ratings and the per-year Elo_<year> tables written
+    # by earlier versions of compute_elo_snapshots, then drop the latter.
+    legacy = [
+        (ALL_TIME, "Elo_Current", "Player_Elo_Current"),
+        *(
+            (name[len("Elo_"):], name, f"Player_{name}")
+            for (name,) in cur.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'Elo_[0-9][0-9][0-9][0-9]'"
+            ).fetchall()
+        ),
+    ]
+    for window, team_table, player_table in legacy:
+        teams = cur.execute(f"SELECT team, rating, COALESCE(matches, 0) FROM {team_table} WHERE team IS NOT NULL").fetchall()
+        players = []
+        if cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (player_table,)).fetchone():
+            players = cur.execute(
+                f"SELECT player, team, rating, COALESCE(matches, 0) FROM {player_table} WHERE player IS NOT NULL"
+            ).fetchall()
+        write_snapshot(conn, window, teams, players)
+        if window != ALL_TIME:
+            cur.execute(f"DROP TABLE IF EXISTS {team_table}")
+            cur.execute(f"DROP TABLE IF EXISTS {player_table}")
+
+    rebuild_timeline(conn)
+
+
+def _0013_change_log(conn: sqlite3.Connection) -> None:
+    """ChangeLog filled by triggers on the scraped tables; aggregates read it instead of changed_at."""
+    from ..changelog import advance, install_triggers
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ChangeLog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            match_id INTEGER,
+            op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+            ts TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    install_triggers(conn)
+    # Aggregates were refreshed up to now through MatchContentHashes.changed_at
+    if cur.execute("SELECT 1 FROM IngestionState WHERE key = 'aggregates_changed_at'").fetchone():
+        advance(conn, "aggregates", 0)
+        cur.execute("DELETE FROM IngestionState WHERE key = 'aggregates_changed_at'")
+
+
+def _0014_matchup_probs(conn: sqlite3.Connection) -> None:
+    """Precomputed win probability per ordered team pair (`vlr predict matrix`)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Matchup_Probs (
+            team_a_key TEXT NOT NULL,
+            team_b_key TEXT NOT NULL,
+            p_team_a REAL NOT NULL,
+            elo_a REAL,
+            elo_b REAL,
+            model_version TEXT NOT NULL,
+            computed_at TEXT NOT NULL DEFAULT (datetime('now')),
+            PRIMARY KEY (team_a_key, team_b_key)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _0015_upcoming_predictions(conn: sqlite3.Connection) -> None:
+    """Win probabilities for upcoming matches, scored by the upcoming refresh."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Upcoming_Predictions (
+            match_id INTEGER PRIMARY KEY REFERENCES Matches(match_id),
+            team_a_key TEXT NOT NULL,
+            team_b_key TEXT NOT NULL,
+            p_team_a REAL NOT NULL,
+            p_elo REAL NOT NULL,
+            elo_a REAL,
+            elo_b REAL,
+            model_version TEXT NOT NULL,
+            computed_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+
+
+def _0016_change_log_prior_state(conn: sqlite3.Connection) -> None:
+    """Pre-change team keys, season and player on logged updates/deletes (see changelog.PRIOR_COLUMNS)."""
+    from ..changelog import install_triggers
+
+    _add_column(conn, "ChangeLog", "old_team_a_key", "TEXT")
+    _add_column(conn, "ChangeLog", "old_team_b_key", "TEXT")
+    _add_column(conn, "ChangeLog", "old_season", "INTEGER")
+    _add_column(conn, "ChangeLog", "old_player", "TEXT")
+    install_triggers(conn)
+
+
+MIGRATIONS = [
+    _0001_core_tables,
+    _0002_ingestion_state,
+    _0003_hot_query_indexes,
+    _0004_pipeline_state,
+    _0005_team_keys,
+    _0006_match_epoch,
+    _0007_dimensions,
+    _0008_vetoes,
+    _0009_season_stats,
+    _0010_map_comp_stats,
+    _0011_head_to_head,
+    _0012_elo_timeline,
+    _0013_change_log,
+    _0014_matchup_probs,
+    _0015_upcoming_predictions,
+    _0016_change_log_prior_state,
+]
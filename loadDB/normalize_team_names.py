@@ -111,6 +111,8 @@ def normalize_team_names():
         print("\n" + "="*80)
         print(f"Normalization complete! Updated {normalization_count} team variants")
         print("="*80)
+        if normalization_count:
+            print("Team names changed; refresh team keys with: python -m loadDB.cli backfill team-keys")
         
         # Verify results
         print("\nFinal teams in database:")
@@ -4,14 +4,17 @@ Normalizer modules for applying aliases to entity names.
 Each normalizer applies aliases from the unified alias system
 and provides additional normalization logic specific to that entity type.
 """
-from .team import normalize_team
+from .team import normalize_team, team_key
 from .map import normalize_map
 from .tournament import normalize_tournament
 from .match_type import normalize_match_type
+from .team_matcher import match_team
 
 __all__ = [
     "normalize_team",
+    "team_key",
     "normalize_map",
     "normalize_tournament",
     "normalize_match_type",
+    "match_team",
 ]
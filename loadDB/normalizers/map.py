@@ -4,7 +4,7 @@ Map name normalization.
 Applies map aliases and provides additional normalization logic.
 """
 import re
-from ..aliases import normalize_map as alias_normalize_map
+from ..aliases import get_normalizer, normalize_map as alias_normalize_map
 
 # Known map names for validation
 KNOWN_MAPS = [
@@ -12,6 +12,11 @@ KNOWN_MAPS = [
     'Lotus', 'Pearl', 'Split', 'Sunset', 'Abyss', 'Corrode'
 ]
 
+# One pass over the name for every known map
+_KNOWN_MAP_RE = re.compile(r"\b(" + "|".join(re.escape(m.lower()) for m in KNOWN_MAPS) + r")\b")
+_KNOWN_MAP_BY_LOWER = {m.lower(): m for m in KNOWN_MAPS}
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def normalize_map(name: str) -> str:
     """
@@ -25,19 +30,22 @@ def normalize_map(name: str) -> str:
     """
     if not name:
         return "Unknown"
-    
+    return _normalize_map(name)
+
+
+@get_normalizer("map").memoize
+def _normalize_map(name: str) -> str:
     # Apply aliases first
     normalized = alias_normalize_map(name)
     
     # If alias didn't match, try to find in known maps
     if normalized == name.strip():
-        name_lower = name.lower().strip()
-        for known_map in KNOWN_MAPS:
-            if re.search(rf"\b{re.escape(known_map.lower())}\b", name_lower):
-                return known_map
+        match = _KNOWN_MAP_RE.search(name.lower().strip())
+        if match:
+            return _KNOWN_MAP_BY_LOWER[match.group(1)]
         
         # Clean up the name: remove extra whitespace, dashes
-        cleaned = re.sub(r"\s+", " ", normalized).strip('- ').strip()
+        cleaned = _WHITESPACE_RE.sub(" ", normalized).strip('- ').strip()
         if cleaned:
             return cleaned
     
@@ -2,19 +2,26 @@
 Team name normalization.
 
 Applies team aliases and provides additional normalization logic.
-Optionally uses LLM for unknown team names.
+Unknown names can be matched locally (team_matcher), escalating only
+ambiguous ones to the LLM.
 """
 import os
-from ..aliases import normalize_team as alias_normalize_team
+from ..aliases import fold, get_normalizer, normalize_team as alias_normalize_team
+from .team_matcher import confident_match, match_team, needs_review
 
+_TEAM_ALIASES = get_normalizer("team")
 
-def normalize_team(name: str, use_llm: bool = False) -> str:
+
+def normalize_team(name: str, use_llm: bool = False, fuzzy: bool = False) -> str:
     """
     Normalize a team name using aliases.
     
     Args:
         name: Team name to normalize
-        use_llm: If True, use LLM to normalize unknown teams (requires ANTHROPIC_API_KEY)
+        use_llm: If True, names the local matcher can't settle (see
+                 team_matcher.needs_review) go to the LLM (requires ANTHROPIC_API_KEY)
+        fuzzy: If True, apply confident local fuzzy matches (see team_matcher)
+               to names without an alias
     
     Returns:
         Normalized team name
@@ -25,17 +32,54 @@ def normalize_team(name: str, use_llm: bool = False) -> str:
     # Apply aliases
     normalized = alias_normalize_team(name)
     
-    # If the name didn't change (no alias found) and LLM is enabled, try LLM normalization
-    if use_llm and normalized.lower() == name.lower() and os.environ.get("ANTHROPIC_API_KEY"):
-        try:
-            from ..llm_normalize import normalize_team_with_llm
-            from ..aliases.teams import TEAM_ALIASES
-            llm_normalized = normalize_team_with_llm(name, TEAM_ALIASES)
-            if llm_normalized and llm_normalized != name:
-                print(f"LLM normalized: '{name}' -> '{llm_normalized}'")
-                normalized = llm_normalized
-        except Exception as e:
-            print(f"LLM normalization skipped for '{name}': {e}")
+    # No alias found: rank known teams locally, escalate only ambiguous names to the LLM
+    if (fuzzy or use_llm) and normalized.lower() == name.strip().lower():
+        candidates = match_team(name)
+        best = confident_match(candidates)
+        if best:
+            normalized = best
+        elif use_llm and needs_review(candidates) and os.environ.get("ANTHROPIC_API_KEY"):
+            try:
+                from ..llm_normalize import normalize_team_with_llm
+                llm_normalized = normalize_team_with_llm(name, _llm_context(candidates))
+                if llm_normalized and llm_normalized != name:
+                    print(f"LLM normalized: '{name}' -> '{llm_normalized}'")
+                    normalized = llm_normalized
+            except Exception as e:
+                print(f"LLM normalization skipped for '{name}': {e}")
     
     # Additional normalization: trim whitespace
     return normalized.strip()
+
+
+def _llm_context(candidates) -> dict:
+    """Canonical name -> aliases for the LLM prompt, the matcher's candidates first."""
+    grouped = {canonical: [] for canonical, _ in candidates}
+    for variant, canonical in _TEAM_ALIASES.aliases.items():
+        grouped.setdefault(canonical, []).append(variant)
+    return grouped
+
+
+def team_key(name: str | None) -> str:
+    """
+    Canonical lookup key for a team name.
+    
+    Applies aliases, then lowercases, strips diacritics (e.g., ü -> u) and drops
+    non-alphanumerics, so spelling variants of the same team share one key.
+    Stored in Matches.team_a_key / team_b_key and Player_Stats.team_key.
+    Memoized; the memo is cleared when the team aliases reload.
+    
+    Args:
+        name: Team name (raw or normalized)
+    
+    Returns:
+        Key string ('' for empty names)
+    """
+    if not name:
+        return ''
+    return _team_key(name)
+
+
+@_TEAM_ALIASES.memoize
+def _team_key(name: str) -> str:
+    return ''.join(ch for ch in fold(normalize_team(name)) if ch.isalnum())
@@ -0,0 +1,182 @@
+"""
+Local fuzzy matching of unknown team names against the team aliases.
+
+Every canonical name and alias in aliases/teams.json is indexed by its
+character trigrams and its token set. A query is scored against the entries
+sharing at least one trigram; each canonical team gets its best entry's
+score, so candidates come back ranked in microseconds without a network call.
+
+Sponsor prefixes are stripped the way team_standardizer.standardize_with_heuristics
+handles them ("VISA KRÜ" is also tried as "KRÜ"), and generic words like
+"Esports" or "Gaming" don't count towards similarity.
+
+normalize_team(..., fuzzy=True) applies confident matches; with use_llm only
+the ambiguous ones are sent to the LLM (see needs_review).
+"""
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ..aliases import fold, get_normalizer
+
+# Leading words dropped as an extra query variant
+SPONSOR_PREFIXES = frozenset({"visa", "sponsor", "sponsored", "presented"})
+
+# Words that carry no identity ("KRÜ Esports" vs "KRÜ")
+GENERIC_TOKENS = frozenset({"esports", "esport", "gaming", "team", "club", "gg"})
+
+# Best score and lead over the runner-up a match needs to be applied automatically
+ACCEPT_SCORE = 0.85
+ACCEPT_MARGIN = 0.15
+
+# Below this the name is treated as a new team rather than escalated
+ESCALATE_MIN_SCORE = 0.35
+
+# Weight of trigram similarity vs token overlap in the score
+TRIGRAM_WEIGHT = 0.7
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+_TEAM_ALIASES = get_normalizer("team")
+
+
+def _tokens(name: str) -> Tuple[str, ...]:
+    """Folded alphanumeric tokens, without generic words unless nothing else is left."""
+    tokens = tuple(t for t in _NON_ALNUM_RE.split(fold(name)) if t)
+    core = tuple(t for t in tokens if t not in GENERIC_TOKENS)
+    return core or tokens
+
+
+def _trigrams(tokens: Tuple[str, ...]) -> FrozenSet[str]:
+    grams = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _variants(name: str) -> List[Tuple[str, ...]]:
+    """Token tuples to score: the name itself, and without a sponsor prefix."""
+    tokens = _tokens(name)
+    variants = [tokens] if tokens else []
+    stripped = tokens
+    while len(stripped) > 1 and stripped[0] in SPONSOR_PREFIXES:
+        stripped = stripped[1:]
+    if stripped != tokens:
+        variants.append(stripped)
+    return variants
+
+
+class TeamMatcher:
+    """Trigram/token index over canonical team names and their aliases."""
+
+    def __init__(self, aliases: Dict[str, str]):
+        """
+        Build the index.
+
+        Args:
+            aliases: Lowercase variant -> canonical name (AliasNormalizer.aliases)
+        """
+        self.aliases = aliases
+        names: Dict[Tuple[str, ...], str] = {}
+        for variant, canonical in aliases.items():
+            for name in (canonical, variant):
+                tokens = _tokens(name)
+                if tokens:
+                    names.setdefault(tokens, canonical)
+        self._canonical: List[str] = list(names.values())
+        self._token_sets: List[FrozenSet[str]] = [frozenset(t) for t in names]
+        self._gram_counts: List[int] = []
+        self._exact: Dict[str, str] = {}
+        self._postings: Dict[str, List[int]] = {}
+        for i, tokens in enumerate(names):
+            grams = _trigrams(tokens)
+            self._gram_counts.append(len(grams))
+            self._exact.setdefault("".join(tokens), names[tokens])
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def _score_variant(self, tokens: Tuple[str, ...], scores: Dict[str, float]) -> None:
+        exact = self._exact.get("".join(tokens))
+        if exact is not None:
+            scores[exact] = 1.0
+            return
+        grams = _trigrams(tokens)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        token_set = frozenset(tokens)
+        for i, n_shared in shared.items():
+            dice = 2.0 * n_shared / (len(grams) + self._gram_counts[i])
+            entry_tokens = self._token_sets[i]
+            overlap = len(token_set & entry_tokens) / len(token_set | entry_tokens)
+            score = TRIGRAM_WEIGHT * dice + (1.0 - TRIGRAM_WEIGHT) * overlap
+            canonical = self._canonical[i]
+            if score > scores.get(canonical, 0.0):
+                scores[canonical] = score
+
+    def match(self, name: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank known teams by similarity to a name.
+
+        Args:
+            name: Team name as scraped
+            limit: Maximum number of candidates
+
+        Returns:
+            (canonical name, score in [0, 1]) pairs, best first
+        """
+        scores: Dict[str, float] = {}
+        for tokens in _variants(name or ""):
+            self._score_variant(tokens, scores)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(canonical, round(score, 4)) for canonical, score in ranked[:limit]]
+
+
+_MATCHER: Optional[TeamMatcher] = None
+
+
+def get_matcher() -> TeamMatcher:
+    """The matcher for the current team aliases (rebuilt after they reload)."""
+    global _MATCHER
+    _TEAM_ALIASES.check_reload()
+    if _MATCHER is None or _MATCHER.aliases is not _TEAM_ALIASES.aliases:
+        _MATCHER = TeamMatcher(_TEAM_ALIASES.aliases)
+    return _MATCHER
+
+
+@_TEAM_ALIASES.memoize
+def _match_team(name: str, limit: int) -> Tuple[Tuple[str, float], ...]:
+    return tuple(get_matcher().match(name, limit))
+
+
+def match_team(name: str, limit: int = 5) -> List[Tuple[str, float]]:
+    """
+    Ranked candidate teams for a name (memoized until the aliases change).
+
+    Args:
+        name: Team name as scraped
+        limit: Maximum number of candidates
+
+    Returns:
+        (canonical name, score) pairs, best first ([] if nothing is similar)
+    """
+    if not name:
+        return []
+    return list(_match_team(name, limit))
+
+
+def confident_match(candidates: List[Tuple[str, float]]) -> Optional[str]:
+    """The best candidate if it scores ACCEPT_SCORE and leads the runner-up by ACCEPT_MARGIN, else None."""
+    if not candidates:
+        return None
+    best, score = candidates[0]
+    runner_up = candidates[1][1] if len(candidates) > 1 else 0.0
+    if score >= ACCEPT_SCORE and score - runner_up >= ACCEPT_MARGIN:
+        return best
+    return None
+
+
+def needs_review(candidates: List[Tuple[str, float]]) -> bool:
+    """True for ambiguous matches: similar to a known team, but not confidently."""
+    return bool(candidates) and confident_match(candidates) is None and candidates[0][1] >= ESCALATE_MIN_SCORE
@@ -4,7 +4,9 @@ Tournament/Event name normalization.
 Applies tournament aliases and provides additional normalization logic.
 """
 import re
-from ..aliases import normalize_tournament as alias_normalize_tournament
+from ..aliases import get_normalizer, normalize_tournament as alias_normalize_tournament
+
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def normalize_tournament(name: str) -> str:
@@ -19,11 +21,15 @@ def normalize_tournament(name: str) -> str:
     """
     if not name:
         return ""
-    
+    return _normalize_tournament(name)
+
+
+@get_normalizer("tournament").memoize
+def _normalize_tournament(name: str) -> str:
     # Apply aliases
     normalized = alias_normalize_tournament(name)
     
     # Additional normalization: clean up whitespace
-    normalized = re.sub(r"\s+", " ", normalized).strip()
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
     
     return normalized
@@ -0,0 +1,133 @@
+"""
+Shadow-table publishing for the Elo output tables.
+
+Writers fill `<table>__shadow` (same columns and indexes as the live table)
+and commit, then publish() swaps every shadow in with two renames per table
+inside one short transaction: live -> `<table>__prev`, shadow -> live. The
+replaced generation stays in `<table>__prev` until the next publish, and
+rollback() swaps it back. Readers see the old or the new generation, never a
+half-written table, and are only locked out for the renames.
+
+Renames run with PRAGMA legacy_alter_table=ON so views over a live table
+(Elo_History over Elo_History_Fact) keep selecting from whatever table holds
+the name instead of following the old generation to `__prev`.
+
+Index names are unique per database, so a shadow's indexes take the first of
+<name>, <name>__b, <name>__c that is free (live and previous generation hold
+the other two).
+"""
+import re
+import sqlite3
+from typing import Iterable, List
+
+SHADOW = "__shadow"
+PREV = "__prev"
+
+# Written by compute_elo(save=True)
+ELO_TABLES = ("Elo_History_Fact", "Player_Elo_History_Fact", "Elo_Current", "Player_Elo_Current", "Elo_Timeline")
+# Written by compute_elo(snapshot=...)
+SNAPSHOT_TABLES = ("Elo_Snapshots", "Player_Elo_Snapshots")
+
+_INDEX_SUFFIXES = ("", "__b", "__c")
+_INDEX_SUFFIX_RE = re.compile(r"__[bc]$")
+
+
+def shadow_name(table: str) -> str:
+    return table + SHADOW
+
+
+def _exists(conn: sqlite3.Connection, kind: str, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)).fetchone() is not None
+
+
+def _retarget(sql: str, table: str, new_table: str) -> str:
+    """Point a CREATE TABLE / CREATE INDEX statement at new_table."""
+    name = re.escape(table)
+    sql = re.sub(rf'^(CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?)"?{name}"?', rf'\g<1>"{new_table}"', sql, flags=re.I)
+    return re.sub(rf'(\sON\s+)"?{name}"?(\s*\()', rf'\g<1>"{new_table}"\g<2>', sql, flags=re.I)
+
+
+def create_shadow(conn: sqlite3.Connection, table: str, copy_rows: bool = False) -> str:
+    """
+    (Re)create the empty shadow of a live table with the same schema and indexes.
+
+    Args:
+        conn: Database connection
+        table: Live table name
+        copy_rows: Start the shadow as a copy of the live rows (for writers
+                   that replace only part of the table)
+
+    Returns:
+        Shadow table name
+    """
+    shadow = shadow_name(table)
+    conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+    (table_sql,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    conn.execute(_retarget(table_sql, table, shadow))
+    indexes = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+    ).fetchall()
+    for index, index_sql in indexes:
+        base = _INDEX_SUFFIX_RE.sub("", index)
+        free = next(base + s for s in _INDEX_SUFFIXES if not _exists(conn, "index", base + s))
+        index_sql = re.sub(rf'"?\b{re.escape(index)}\b"?', f'"{free}"', index_sql, count=1)
+        conn.execute(_retarget(index_sql, table, shadow))
+    if copy_rows:
+        conn.execute(f"INSERT INTO {shadow} SELECT * FROM {table}")
+    return shadow
+
+
+def _swap(conn: sqlite3.Connection, renames: List[tuple]) -> None:
+    """Run (from, to) renames in one immediate transaction (drops `to` first if it exists)."""
+    conn.commit()
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for old, new in renames:
+                if new.endswith(PREV):
+                    conn.execute(f"DROP TABLE IF EXISTS {new}")
+                conn.execute(f"ALTER TABLE {old} RENAME TO {new}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+
+
+def publish(conn: sqlite3.Connection, tables: Iterable[str]) -> None:
+    """
+    Swap the committed shadows of tables in, keeping the replaced tables as `__prev`.
+
+    Commits any open transaction first; the swap itself is one transaction.
+    """
+    renames = []
+    for table in tables:
+        if not _exists(conn, "table", shadow_name(table)):
+            raise RuntimeError(f"No shadow table to publish for {table}")
+        renames += [(table, table + PREV), (shadow_name(table), table)]
+    _swap(conn, renames)
+
+
+def rollback(conn: sqlite3.Connection, tables: Iterable[str]) -> List[str]:
+    """
+    Swap the previous generation back in for each table that has one.
+
+    The rolled-back generation becomes `__prev`, so a second rollback
+    restores it.
+
+    Returns:
+        Tables that were rolled back
+    """
+    tables = [t for t in tables if _exists(conn, "table", t + PREV)]
+    renames = []
+    for table in tables:
+        renames += [(table, shadow_name(table)), (table + PREV, table), (shadow_name(table), table + PREV)]
+    if tables:
+        for table in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {shadow_name(table)}")
+        _swap(conn, renames)
+    return tables
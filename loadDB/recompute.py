@@ -0,0 +1,128 @@
+"""
+Post-ingest recomputation (Elo snapshots) as one coalesced task.
+
+Ingestion leaves its writes in the ChangeLog; the recompute task is pending
+while the log has entries past the Elo consumer's cursor, which
+compute_elo_snapshots() advances. Any number of ingests therefore collapse
+into a single recomputation:
+
+- run_pending(): recompute once if anything is pending. Bulk commands call it
+  at the end; `vlr recompute` runs it by hand.
+- deferred(): ingests inside the block skip their own recomputation and one
+  run happens when the block exits.
+- run_pending(debounce=...): at most one run per debounce window (time of the
+  last run is kept in IngestionState). `worker --follow` checks on every poll,
+  so changes that landed inside a window are picked up once it expires.
+
+Each run also feeds the new matches to the online match model
+(analytics.online) when one has been trained.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from . import changelog
+from .config import REPO_ROOT
+from .db_utils import get_conn
+from .elo import ELO_CONSUMER, compute_elo_snapshots
+from .migrations import ensure_schema
+
+LAST_RUN_KEY = "recompute_last_run"
+
+# >0 while inside deferred()
+_defer_depth = 0
+
+
+def is_pending(conn) -> bool:
+    """True if the ChangeLog has entries the Elo snapshots haven't seen yet."""
+    cursor = changelog.get_cursor(conn, ELO_CONSUMER)
+    return cursor is None or changelog.latest_seq(conn) > cursor
+
+
+def run_pending(debounce: float = 0.0, force: bool = False) -> bool:
+    """
+    Recompute Elo snapshots if ingests changed anything since the last run.
+
+    Args:
+        debounce: Skip (leave pending) if the last run was less than this many
+                  seconds ago
+        force: Recompute even if nothing is pending (still debounced)
+
+    Returns:
+        True if the snapshots were recomputed
+    """
+    conn = get_conn()
+    try:
+        ensure_schema(conn)
+        pending = force or is_pending(conn)
+        row = conn.execute("SELECT value FROM IngestionState WHERE key = ?", (LAST_RUN_KEY,)).fetchone()
+    finally:
+        conn.close()
+    if not pending:
+        return False
+    since = time.time() - float(row[0]) if row else None
+    if debounce and since is not None and since < debounce:
+        print(f"Elo recompute pending (last run {since:.0f}s ago, debounce {debounce:.0f}s)")
+        return False
+
+    print("\nRecalculating ELO snapshots...")
+    started = time.time()
+    compute_elo_snapshots()
+    conn = get_conn()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO IngestionState (key, value) VALUES (?, ?)", (LAST_RUN_KEY, str(started))
+        )
+        conn.commit()
+        db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    finally:
+        conn.close()
+    _update_online_model(db_path)
+    return True
+
+
+def _update_online_model(db_path: str) -> None:
+    """partial_fit the online match model on new matches (needs fresh Elo; no-op if never trained)."""
+    models_dir = os.path.join(REPO_ROOT, "models")
+    if not os.path.exists(os.path.join(models_dir, "match_online.pkl")):
+        return
+    try:
+        from analytics import online
+    except ImportError as e:
+        print(f"Online model update skipped: {e}")
+        return
+    n = online.update(db_path=db_path, models_dir=models_dir)
+    if n:
+        print(f"Online match model updated with {n} new match(es).")
+
+
+def after_ingest(debounce: float = 0.0) -> Optional[bool]:
+    """
+    Called by ingest entry points once their writes are committed.
+
+    Returns:
+        None inside deferred() (the block's exit runs it), else run_pending()'s result
+    """
+    if _defer_depth:
+        return None
+    return run_pending(debounce=debounce)
+
+
+@contextmanager
+def deferred(debounce: float = 0.0) -> Iterator[None]:
+    """
+    Hold back per-ingest recomputation; run it once when the block exits normally.
+
+    Args:
+        debounce: Passed to run_pending() on exit (e.g. RECOMPUTE_DEBOUNCE_SECONDS
+                  for scheduled runs, so frequent invocations coalesce)
+    """
+    global _defer_depth
+    _defer_depth += 1
+    try:
+        yield
+    finally:
+        _defer_depth -= 1
+    if not _defer_depth:
+        run_pending(debounce=debounce)
@@ -7,8 +7,9 @@ import os
 import sqlite3
 from datetime import datetime
 from .vct_scraper import scrape_all_vct_matches, classify_matches, detect_showmatch
-from .vlr_ingest import ingest
 from .db_utils import get_conn
+from .recompute import run_pending
+from .ingest_jobs import ingest_via_queue
 from .config import DB_PATH
 
 
@@ -31,13 +32,19 @@ def clear_database(db_path: str = None):
     cur = con.cursor()
     
     tables_to_clear = [
-        'Elo_History',
-        'Player_Elo_History',
+        'Elo_History_Fact',
+        'Player_Elo_History_Fact',
         'Elo_Current',
         'Player_Elo_Current',
+        'Elo_Timeline',
+        'Elo_Snapshots',
+        'Player_Elo_Snapshots',
         'Player_Stats',
         'Maps',
+        'Vetoes',
         'Matches',
+        # Content hashes would make the re-scrape skip every unchanged page
+        'MatchContentHashes',
     ]
     
     print("Clearing database tables...")
@@ -63,13 +70,26 @@ def clear_database(db_path: str = None):
     print("[OK] Database cleared")
 
 
-async def main(confirm: bool = True):
+async def main(confirm: bool = True, keep_existing: bool = False, force: bool = False):
+    """
+    Scrape and ingest all VCT 2024 and 2025 matches.
+    
+    Args:
+        confirm: Ask for confirmation before starting
+        keep_existing: Don't backup/clear the DB; re-runs skip matches that are
+                       already completely ingested, so they only fetch what's missing
+        force: With keep_existing, refetch and rewrite every match even if it's
+               complete or its page is unchanged
+    """
     print("=" * 70)
     print("VCT 2024 & 2025 COMPLETE SCRAPE")
     print("=" * 70)
     print("\nThis script will:")
-    print("  1. Backup the current database")
-    print("  2. Clear all existing data")
+    if keep_existing:
+        print("  1-2. Keep existing data (skipping already-complete matches)")
+    else:
+        print("  1. Backup the current database")
+        print("  2. Clear all existing data")
     print("  3. Scrape all VCT 2024 tournaments")
     print("  4. Scrape all VCT 2025 tournaments")
     print("  5. Classify matches (VCT vs SHOWMATCH)")
@@ -88,17 +108,18 @@ async def main(confirm: bool = True):
     else:
         print("Proceeding automatically (non-interactive mode)...")
     
-    # Step 1: Backup database
-    print("\n" + "=" * 70)
-    print("STEP 1: Backing up database...")
-    print("=" * 70)
-    backup_database()
-    
-    # Step 2: Clear database
-    print("\n" + "=" * 70)
-    print("STEP 2: Clearing database...")
-    print("=" * 70)
-    clear_database()
+    if not keep_existing:
+        # Step 1: Backup database
+        print("\n" + "=" * 70)
+        print("STEP 1: Backing up database...")
+        print("=" * 70)
+        backup_database()
+        
+        # Step 2: Clear database
+        print("\n" + "=" * 70)
+        print("STEP 2: Clearing database...")
+        print("=" * 70)
+        clear_database()
     
     # Step 3 & 4: Scrape all tournaments
     print("\n" + "=" * 70)
@@ -121,22 +142,19 @@ async def main(confirm: bool = True):
     print(f"\nIngesting {len(all_match_ids)} matches...")
     print("(Matches will be auto-classified as VCT or SHOWMATCH during ingestion)")
     
-    # Process in batches to avoid overwhelming the system
-    batch_size = 50
-    total_batches = (len(all_match_ids) + batch_size - 1) // batch_size
-    
-    for i in range(0, len(all_match_ids), batch_size):
-        batch = all_match_ids[i:i+batch_size]
-        batch_num = i//batch_size + 1
-        print(f"  Processing batch {batch_num}/{total_batches} ({len(batch)} matches)...")
-        try:
-            # Pass None to let auto-detection work
-            ingest(batch, match_type=None)
-            print(f"    [OK] Ingested {len(batch)} matches")
-        except Exception as e:
-            print(f"    [ERROR] Error ingesting batch: {e}")
-            import traceback
-            traceback.print_exc()
+    # Work goes through the durable job queue: if this run is interrupted,
+    # `python -m loadDB.cli worker` finishes the remaining matches.
+    # With keep_existing, complete matches are dropped before anything is fetched.
+    result = await ingest_via_queue(
+        all_match_ids,
+        match_type=None,  # let auto-detection work
+        source="scrape-all-vct",
+        reparse=force,
+        skip_complete=keep_existing and not force,
+    )
+    print(f"  [OK] Ingested {result.success_count} matches ({result.error_count} failed)")
+    if result.success_count > 0:
+        run_pending()
     
     print("\n" + "=" * 70)
     print("SCRAPING COMPLETE!")
@@ -2,14 +2,16 @@
 Scraper modules for extracting data from VLR.gg.
 
 Each scraper module handles extraction of specific data types:
-- base: Common utilities (HTTP fetching, URL parsing)
+- base: Common utilities (HTTP fetching, rate limiting, URL parsing)
 - match: Match metadata extraction
 - maps: Map data extraction
 - players: Player statistics extraction
 """
-from .base import fetch_html, match_id_from_url
+from .base import fetch_html, match_id_from_url, RateLimiter, get_rate_limiter
 
 __all__ = [
     "fetch_html",
     "match_id_from_url",
+    "RateLimiter",
+    "get_rate_limiter",
 ]
@@ -3,13 +3,80 @@ Base scraping utilities for VLR.gg.
 
 Provides common functionality for all scrapers:
 - HTTP fetching with retry logic
+- Shared rate limiting for all requests against vlr.gg
 - URL parsing and validation
 """
 import re
+import time
+import weakref
 import aiohttp
 import asyncio
 from typing import Optional
 
+from ..config import HTTP_CONCURRENCY, HTTP_RATE_PER_SEC, HTTP_429_COOLDOWN
+
+
+class RateLimiter:
+    """
+    Bound concurrency and request rate across every coroutine that fetches from vlr.gg.
+
+    - At most `concurrency` requests are in flight at once
+    - Request starts are spaced at least 1/`rate_per_sec` seconds apart
+    - `cooldown()` pushes the next free slot back for everyone (used on HTTP 429)
+
+    asyncio primitives are bound to an event loop, so state is kept per loop; the same
+    limiter can be reused across separate `asyncio.run()` calls.
+    """
+
+    def __init__(self, concurrency: int = HTTP_CONCURRENCY, rate_per_sec: float = HTTP_RATE_PER_SEC):
+        self.concurrency = max(1, int(concurrency))
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._next_slot = 0.0
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> tuple[asyncio.Semaphore, asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.concurrency), asyncio.Lock())
+            self._loop_state[loop] = state
+        return state
+
+    async def _wait_for_slot(self, lock: asyncio.Lock) -> None:
+        async with lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def cooldown(self, seconds: float) -> None:
+        """Delay all subsequent request starts by at least `seconds`."""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+    async def __aenter__(self) -> "RateLimiter":
+        sem, lock = self._state()
+        await sem.acquire()
+        try:
+            await self._wait_for_slot(lock)
+        except BaseException:
+            sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        sem, _ = self._state()
+        sem.release()
+
+
+# Single limiter shared by every scraper in the process
+_SHARED_LIMITER = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter used by fetch_html."""
+    return _SHARED_LIMITER
+
 
 def match_id_from_url(url: str) -> Optional[int]:
     """
@@ -29,15 +96,22 @@ def match_id_from_url(url: str) -> Optional[int]:
     return int(m.group(1)) if m else None
 
 
-async def fetch_html(session: aiohttp.ClientSession, url: str, max_retries: int = 3) -> str:
+async def fetch_html(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_retries: int = 3,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
     """
     Fetch HTML from a URL with proper headers to mimic browser requests.
-    Includes retry logic for transient failures.
+    Includes retry logic for transient failures. Every attempt goes through the
+    shared rate limiter so concurrent callers cannot flood vlr.gg.
     
     Args:
         session: aiohttp client session
         url: URL to fetch
         max_retries: Maximum number of retry attempts (default: 3)
+        limiter: Optional rate limiter (default: the shared process-wide limiter)
     
     Returns:
         HTML content as string
@@ -55,18 +129,23 @@ async def fetch_html(session: aiohttp.ClientSession, url: str, max_retries: int
         'Upgrade-Insecure-Requests': '1'
     }
     
+    limiter = limiter or _SHARED_LIMITER
     last_error = None
     for attempt in range(max_retries):
         try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30), headers=headers) as resp:
-                # Handle rate limiting
-                if resp.status == 429:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    await asyncio.sleep(wait_time)
-                    continue
-                
-                resp.raise_for_status()
-                return await resp.text()
+            async with limiter:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30), headers=headers) as resp:
+                    if resp.status != 429:
+                        resp.raise_for_status()
+                        return await resp.text()
+                    last_error = aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=429, message="Too Many Requests"
+                    )
+            # Handle rate limiting: slow down every caller, not just this one
+            limiter.cooldown(HTTP_429_COOLDOWN)
+            wait_time = 2 ** attempt  # Exponential backoff
+            await asyncio.sleep(wait_time)
+            continue
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             last_error = e
             if attempt < max_retries - 1:
@@ -96,6 +96,37 @@ def standardize_with_heuristics(team_names: List[str]) -> Dict[str, str]:
     return mappings
 
 
+def standardize_with_matcher(team_names: List[str]) -> Dict[str, str]:
+    """
+    Map team names without an alias to known teams with the local fuzzy matcher.
+    
+    Only confident matches are returned (see normalizers.team_matcher); names
+    that need review are printed with their top candidates.
+    
+    Args:
+        team_names: List of all team names to standardize
+    
+    Returns:
+        Dictionary mapping variant names to canonical names
+    """
+    from .aliases import get_team_alias
+    from .normalizers.team_matcher import confident_match, match_team, needs_review
+    
+    mappings = {}
+    for name in team_names:
+        if get_team_alias(name):
+            continue
+        candidates = match_team(name, limit=3)
+        best = confident_match(candidates)
+        if best and best != name:
+            mappings[name] = best
+        elif needs_review(candidates):
+            options = ", ".join(f"{canonical} ({score:.2f})" for canonical, score in candidates)
+            print(f"  review: {name} -> {options}")
+    
+    return mappings
+
+
 def standardize_with_llm(team_names: List[str], api_key: str | None = None) -> Dict[str, str]:
     """
     Use LLM to identify duplicate team names and generate standardization mappings.
@@ -279,7 +310,7 @@ def standardize_teams(provider: str = "openai", api_key: str | None = None, save
     Main function to standardize team names using LLM or heuristics.
     
     Args:
-        provider: LLM provider ("openai", "anthropic", or "heuristics")
+        provider: LLM provider ("openai", "anthropic"), "heuristics" or "fuzzy"
         api_key: Optional API key (uses environment variable if None)
         save: If True, save results to aliases.json
         use_heuristics: If True and LLM fails, fall back to heuristics
@@ -296,6 +327,9 @@ def standardize_teams(provider: str = "openai", api_key: str | None = None, save
     if provider == "heuristics":
         print("\nUsing heuristics to identify duplicate team names...")
         new_mappings = standardize_with_heuristics(team_names)
+    elif provider == "fuzzy":
+        print("\nUsing the local fuzzy matcher to identify duplicate team names...")
+        new_mappings = standardize_with_matcher(team_names)
     else:
         print(f"\nUsing {provider} to identify duplicate team names...")
         try:
@@ -304,7 +338,7 @@ def standardize_teams(provider: str = "openai", api_key: str | None = None, save
             elif provider == "anthropic":
                 new_mappings = standardize_with_anthropic(team_names, api_key)
             else:
-                raise ValueError(f"Unknown provider: {provider}. Use 'openai', 'anthropic', or 'heuristics'")
+                raise ValueError(f"Unknown provider: {provider}. Use 'openai', 'anthropic', 'heuristics' or 'fuzzy'")
         except Exception as e:
             if use_heuristics:
                 print(f"\nLLM failed ({e}), falling back to heuristics...")
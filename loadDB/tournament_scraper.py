@@ -1,9 +1,11 @@
 import re
 import aiohttp
-import asyncio
 from bs4 import BeautifulSoup
 from typing import List
 
+# Re-exported for callers that historically imported fetch_html from here
+from .scrapers.base import fetch_html
+
 
 def extract_event_id_from_url(url: str) -> str | None:
     """Extract event ID from a tournament URL like https://www.vlr.gg/event/2792"""
@@ -25,76 +27,71 @@ def extract_tournament_slug_from_url(url: str) -> str | None:
     return m.group(1) if m else None
 
 
-async def fetch_html(session: aiohttp.ClientSession, url: str, max_retries: int = 3) -> str:
+def resolve_tournament_matches_url(event_url: str, html: str) -> str:
     """
-    Fetch HTML from a URL with proper headers to mimic browser requests.
-    Includes retry logic for transient failures.
+    Build the matches URL for a tournament from its already-fetched event page.
+    
+    Attempts multiple strategies to construct the matches URL:
+    1. Find existing matches link on the event page
+    2. Extract slug from the event URL
+    3. Generate slug from page title
+    4. Fallback to simple URL pattern
     
     Args:
-        session: aiohttp client session
-        url: URL to fetch
-        max_retries: Maximum number of retry attempts (default: 3)
+        event_url: Tournament event URL (e.g., https://www.vlr.gg/event/2792)
+        html: HTML of the event page
     
     Returns:
-        HTML content as string
+        Full URL to the tournament matches page with series_id=all parameter
     
     Raises:
-        aiohttp.ClientError: If the request fails after all retries
+        ValueError: If event ID cannot be extracted from URL
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
-        'Referer': 'https://www.vlr.gg/',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
-    
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30), headers=headers) as resp:
-                # Handle rate limiting
-                if resp.status == 429:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    await asyncio.sleep(wait_time)
-                    continue
-                
-                resp.raise_for_status()
-                return await resp.text()
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                wait_time = 2 ** attempt  # Exponential backoff
-                await asyncio.sleep(wait_time)
-            else:
-                raise
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                await asyncio.sleep(1)
-            else:
-                raise
-    
-    # Should never reach here, but just in case
-    if last_error:
-        raise last_error
-    raise aiohttp.ClientError(f"Failed to fetch {url} after {max_retries} attempts")
+    event_id = extract_event_id_from_url(event_url)
+    if not event_id:
+        raise ValueError(f"Could not extract event ID from URL: {event_url}")
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    matches_links = soup.find_all('a', href=re.compile(r'/event/matches/' + event_id))
+    for matches_link in matches_links:
+        href = matches_link.get('href', '')
+        if href:
+            if href.startswith('http'):
+                if 'series_id=all' not in href:
+                    href += '&series_id=all' if '?' in href else '?series_id=all'
+                return href
+            elif href.startswith('/'):
+                full_url = f"https://www.vlr.gg{href}"
+                if 'series_id=all' not in full_url:
+                    full_url += '&series_id=all' if '?' in full_url else '?series_id=all'
+                return full_url
+    
+    slug_match = re.search(r'/event/\d+/([^/?]+)', event_url)
+    if slug_match:
+        slug = slug_match.group(1)
+        return f"https://www.vlr.gg/event/matches/{event_id}/{slug}/?series_id=all"
+    
+    title_elem = soup.find('h1') or soup.find('title')
+    if title_elem:
+        title_text = title_elem.get_text(strip=True)
+        slug = re.sub(r'[^a-z0-9\s-]+', '', title_text.lower())
+        slug = re.sub(r'\s+', '-', slug).strip('-')
+        if slug and len(slug) > 3:
+            return f"https://www.vlr.gg/event/matches/{event_id}/{slug}/?series_id=all"
+    
+    return f"https://www.vlr.gg/event/matches/{event_id}/?series_id=all"
 
 
-async def get_tournament_matches_url(event_url: str) -> str:
+async def get_tournament_matches_url(event_url: str, session: aiohttp.ClientSession | None = None) -> str:
     """
-    Build the matches URL for a tournament event page.
+    Fetch a tournament event page and build its matches URL.
     
-    Attempts multiple strategies to construct the matches URL:
-    1. Find existing matches link on the event page
-    2. Extract slug from the event URL
-    3. Generate slug from page title
-    4. Fallback to simple URL pattern
+    See resolve_tournament_matches_url for the resolution strategies.
     
     Args:
         event_url: Tournament event URL (e.g., https://www.vlr.gg/event/2792)
+        session: Optional shared aiohttp session (a new one is opened if omitted)
     
     Returns:
         Full URL to the tournament matches page with series_id=all parameter
@@ -102,47 +99,48 @@ async def get_tournament_matches_url(event_url: str) -> str:
     Raises:
         ValueError: If event ID cannot be extracted from URL
     """
-    event_id = extract_event_id_from_url(event_url)
-    if not event_id:
+    if not extract_event_id_from_url(event_url):
         raise ValueError(f"Could not extract event ID from URL: {event_url}")
     
-    async with aiohttp.ClientSession() as session:
+    if session is not None:
         html = await fetch_html(session, event_url)
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        matches_links = soup.find_all('a', href=re.compile(r'/event/matches/' + event_id))
-        for matches_link in matches_links:
-            href = matches_link.get('href', '')
-            if href:
-                if href.startswith('http'):
-                    if 'series_id=all' not in href:
-                        href += '&series_id=all' if '?' in href else '?series_id=all'
-                    return href
-                elif href.startswith('/'):
-                    full_url = f"https://www.vlr.gg{href}"
-                    if 'series_id=all' not in full_url:
-                        full_url += '&series_id=all' if '?' in full_url else '?series_id=all'
-                    return full_url
-        
-        slug_match = re.search(r'/event/\d+/([^/?]+)', event_url)
-        if slug_match:
-            slug = slug_match.group(1)
-            return f"https://www.vlr.gg/event/matches/{event_id}/{slug}/?series_id=all"
-        
-        title_elem = soup.find('h1') or soup.find('title')
-        if title_elem:
-            title_text = title_elem.get_text(strip=True)
-            slug = re.sub(r'[^a-z0-9\s-]+', '', title_text.lower())
-            slug = re.sub(r'\s+', '-', slug).strip('-')
-            if slug and len(slug) > 3:
-                return f"https://www.vlr.gg/event/matches/{event_id}/{slug}/?series_id=all"
-        
-        return f"https://www.vlr.gg/event/matches/{event_id}/?series_id=all"
+    else:
+        async with aiohttp.ClientSession() as own_session:
+            html = await fetch_html(own_session, event_url)
+    return resolve_tournament_matches_url(event_url, html)
+
+
+async def scrape_tournament_match_ids(
+    event_url: str,
+    completed_only: bool = True,
+    session: aiohttp.ClientSession | None = None,
+) -> List[int]:
+    """
+    Scrape all match IDs from a tournament matches page.
+    
+    Fetches the event page and its matches listing, then parses the listing with
+    parse_tournament_match_ids.
+    
+    Args:
+        event_url: Tournament event URL (e.g., https://www.vlr.gg/event/2792)
+        completed_only: If True, only return matches that are completed (have scores)
+        session: Optional shared aiohttp session (a new one is opened if omitted)
+    
+    Returns:
+        List of unique match IDs (integers), preserving order
+    """
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await scrape_tournament_match_ids(event_url, completed_only, session=own_session)
+    
+    matches_url = await get_tournament_matches_url(event_url, session=session)
+    html = await fetch_html(session, matches_url)
+    return parse_tournament_match_ids(html, completed_only=completed_only)
 
 
-async def scrape_tournament_match_ids(event_url: str, completed_only: bool = True) -> List[int]:
+def parse_tournament_match_ids(html: str, completed_only: bool = True) -> List[int]:
     """
-    Scrape all match IDs from a tournament matches page with multiple fallback strategies.
+    Parse match IDs from a tournament matches page with multiple fallback strategies.
     
     Uses multiple strategies to find matches:
     1. Direct match links (pattern: /number/match-name)
@@ -154,17 +152,12 @@ async def scrape_tournament_match_ids(event_url: str, completed_only: bool = Tru
     More lenient detection to catch all completed matches.
     
     Args:
-        event_url: Tournament event URL (e.g., https://www.vlr.gg/event/2792)
+        html: HTML of the tournament matches page
         completed_only: If True, only return matches that are completed (have scores)
     
     Returns:
         List of unique match IDs (integers), preserving order
     """
-    matches_url = await get_tournament_matches_url(event_url)
-    
-    async with aiohttp.ClientSession() as session:
-        html = await fetch_html(session, matches_url)
-    
     soup = BeautifulSoup(html, 'html.parser')
     match_ids: List[int] = []
     seen_ids = set()
@@ -320,6 +313,76 @@ async def scrape_tournament_match_ids(event_url: str, completed_only: bool = Tru
     return match_ids
 
 
+def _score_or_none(text: str) -> int | None:
+    text = (text or '').strip()
+    return int(text) if text.isdigit() else None
+
+
+def parse_event_listing(html: str) -> List[dict]:
+    """
+    Parse a tournament matches page into per-match listing entries with status and score.
+    
+    Reads VLR match cards (a.match-item) for the status label and both team scores.
+    If the page has no match cards, falls back to parse_tournament_match_ids and
+    derives the status from its completed-match heuristics (scores unknown).
+    
+    Args:
+        html: HTML of the tournament matches page
+    
+    Returns:
+        List of dicts (listing order) with keys:
+        match_id, status ('completed', 'live' or 'upcoming'), score_a, score_b
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    entries: List[dict] = []
+    seen = set()
+    
+    for item in soup.select('a.match-item'):
+        parts = (item.get('href') or '').split('/')
+        if len(parts) < 2 or not parts[1].isdigit():
+            continue
+        match_id = int(parts[1])
+        if match_id in seen or not (1000 <= match_id <= 9999999):
+            continue
+        seen.add(match_id)
+        
+        status_el = item.select_one('.ml-status')
+        status_text = status_el.get_text(' ', strip=True).lower() if status_el else ''
+        scores = [_score_or_none(el.get_text()) for el in item.select('.match-item-vs-team-score')]
+        score_a = scores[0] if len(scores) > 0 else None
+        score_b = scores[1] if len(scores) > 1 else None
+        
+        if 'live' in status_text:
+            status = 'live'
+        elif 'completed' in status_text or 'final' in status_text:
+            status = 'completed'
+        elif score_a is not None and score_b is not None and max(score_a, score_b) > 0 and not status_text:
+            status = 'completed'
+        else:
+            status = 'upcoming'
+        
+        entries.append({
+            'match_id': match_id,
+            'status': status,
+            'score_a': score_a,
+            'score_b': score_b,
+        })
+    
+    if entries:
+        return entries
+    
+    # Fallback for pages without match cards
+    completed = set(parse_tournament_match_ids(html, completed_only=True))
+    for match_id in dict.fromkeys(parse_tournament_match_ids(html, completed_only=False) + list(completed)):
+        entries.append({
+            'match_id': match_id,
+            'status': 'completed' if match_id in completed else 'upcoming',
+            'score_a': None,
+            'score_b': None,
+        })
+    return entries
+
+
 def save_match_ids_to_file(match_ids: List[int], filename: str) -> None:
     """
     Save match IDs to a text file, one per line.
@@ -15,6 +15,7 @@ Populate next upcoming matches (IDs + projected start time) for VCT 2026 Kickoff
   - Upsert into Matches with `match_ts_utc` (and `match_date` as YYYY-MM-DD)
   - Insert team names; if unknown, store "TBD"
   - Limit to 20 soonest matches across all 4 events
+  - Score every upcoming match into Upcoming_Predictions (see predict_upcoming)
 
 Run:
   python -m loadDB.upcoming
@@ -24,12 +25,14 @@ This is idempotent: re-running will upsert the same `match_id` rows.
 from __future__ import annotations
 
 import asyncio
+import os
 from datetime import datetime, timezone
 from typing import List, Dict, Any
 
 import aiohttp
 from bs4 import BeautifulSoup
 
+from .config import REPO_ROOT
 from .db_utils import get_conn, ensure_matches_columns, upsert_match
 from .tournament_scraper import scrape_tournament_match_ids, get_tournament_matches_url
 from .scrapers.base import fetch_html
@@ -215,12 +218,97 @@ def upsert_upcoming(rows: List[Dict[str, Any]]) -> int:
     return count
 
 
+def predict_upcoming(conn) -> int:
+    """
+    Score every upcoming match (no scores yet, both teams known) in one batch.
+
+    p_elo is the Elo expected score; p_team_a is the trained match model's
+    probability when one is present (analytics.predict), else p_elo. A stored
+    prediction is rewritten only if the matchup, either rating or the model
+    version changed since it was computed. Caller commits.
+
+    Rows of matches that have since been played are kept on purpose, frozen
+    at their last pre-match values: they are the record of what was predicted
+    before the result, for checking calibration against the outcome. Only a
+    match that is still unplayed and goes back to TBD loses its row.
+
+    Args:
+        conn: Database connection (schema current)
+
+    Returns:
+        Number of predictions written
+    """
+    import numpy as np
+    from analytics.features import START_ELO
+    from analytics.predict import Predictor, elo_expected
+
+    cur = conn.cursor()
+    # Matches that got TBD teams again lose their prediction
+    cur.execute(
+        """
+        DELETE FROM Upcoming_Predictions
+        WHERE match_id IN (
+            SELECT match_id FROM Matches
+            WHERE team_a_score IS NULL AND team_b_score IS NULL
+              AND (team_a = 'TBD' OR team_b = 'TBD' OR COALESCE(team_a_key, '') = '' OR COALESCE(team_b_key, '') = '')
+        )
+        """
+    )
+    matches = cur.execute(
+        """
+        SELECT m.match_id, m.team_a_key, m.team_b_key,
+               p.team_a_key, p.team_b_key, p.elo_a, p.elo_b, p.model_version
+        FROM Matches m
+        LEFT JOIN Upcoming_Predictions p ON p.match_id = m.match_id
+        WHERE m.team_a_score IS NULL AND m.team_b_score IS NULL
+          AND m.team_a != 'TBD' AND m.team_b != 'TBD'
+          AND COALESCE(m.team_a_key, '') != '' AND COALESCE(m.team_b_key, '') != ''
+        """
+    ).fetchall()
+    if not matches:
+        return 0
+
+    db_path = cur.execute("PRAGMA database_list").fetchone()[2]
+    predictor = Predictor(db_path=db_path, models_dir=os.path.join(REPO_ROOT, "models"))
+    probs = predictor.match_probs([m[1] for m in matches], [m[2] for m in matches])
+    elo_a = probs["elo_a"].fillna(START_ELO).to_numpy()
+    elo_b = probs["elo_b"].fillna(START_ELO).to_numpy()
+    p_elo = elo_expected(elo_a, elo_b)
+    # NaN where a team is unrated or there is no model
+    p_team_a = np.where(probs["p_team_a"].isna(), p_elo, probs["p_team_a"].to_numpy())
+    version = predictor.model_version
+
+    rows = []
+    for i, (match_id, key_a, key_b, old_a, old_b, old_elo_a, old_elo_b, old_version) in enumerate(matches):
+        if (old_a, old_b, old_version) == (key_a, key_b, version) and old_elo_a is not None \
+                and abs(old_elo_a - elo_a[i]) < 1e-9 and abs(old_elo_b - elo_b[i]) < 1e-9:
+            continue
+        rows.append((match_id, key_a, key_b, float(p_team_a[i]), float(p_elo[i]), float(elo_a[i]), float(elo_b[i]), version))
+    cur.executemany(
+        """
+        INSERT OR REPLACE INTO Upcoming_Predictions
+            (match_id, team_a_key, team_b_key, p_team_a, p_elo, elo_a, elo_b, model_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
+
+
 async def main() -> None:
     print("Collecting upcoming matches for VCT 2026 Kickoff events...")
     rows = await collect_upcoming_matches()
     print(f"Found {len(rows)} upcoming matches (pre-limit={UPCOMING_LIMIT})")
     n = upsert_upcoming(rows)
     print(f"Upserted {n} upcoming matches into DB.")
+    conn = get_conn()
+    try:
+        ensure_matches_columns(conn)
+        scored = predict_upcoming(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"Updated {scored} upcoming match predictions.")
 
 
 if __name__ == "__main__":
@@ -7,149 +7,128 @@ Usage examples (from repo root):
 """
 
 import argparse
+import asyncio
 from typing import List, Dict
 
 from .db_utils import get_conn
-from .vlr_ingest import ingest
+from .recompute import run_pending
+from .config import HTTP_CONCURRENCY
+from .ingest_jobs import ingest_via_queue
+
+
+# Problem buckets, in report order
+PROBLEM_BUCKETS = (
+    "no_maps",
+    "maps_missing_scores",
+    "no_player_stats",
+    "maps_no_player_stats",
+    "bad_match_scores",
+)
+
+# One pass over Matches with per-match Maps / Player_Stats aggregates; each
+# bucket is a 0/1 column and only matches with at least one problem come back.
+_SCAN_SQL = """
+WITH map_agg AS (
+    SELECT
+        match_id,
+        COUNT(*) AS map_count,
+        SUM(team_a_score IS NULL OR team_b_score IS NULL) AS missing_scores,
+        -- Impossible map-level scores (maps with both scores only):
+        --  - very low totals (1, 4)
+        --  - low draws (< 10); 12-12 / 13-13+ can be legitimate overtime states
+        MAX(
+            team_a_score IS NOT NULL AND team_b_score IS NOT NULL
+            AND (
+                team_a_score + team_b_score IN (1, 4)
+                OR (team_a_score = team_b_score AND team_a_score > 0 AND team_a_score < 10)
+            )
+        ) AS bad_map_score,
+        SUM(team_a_score IS NOT NULL AND team_b_score IS NOT NULL AND team_a_score > team_b_score) AS a_wins,
+        SUM(team_a_score IS NOT NULL AND team_b_score IS NOT NULL AND team_b_score > team_a_score) AS b_wins
+    FROM Maps
+    GROUP BY match_id
+),
+ps_agg AS (
+    SELECT match_id, COUNT(*) AS ps_count
+    FROM Player_Stats
+    GROUP BY match_id
+),
+scan AS (
+    SELECT
+        m.match_id,
+        COALESCE(mp.map_count, 0) AS map_count,
+        COALESCE(mp.missing_scores, 0) AS missing_scores,
+        COALESCE(ps.ps_count, 0) AS ps_count,
+        -- Treat NULL series scores as 0
+        COALESCE(m.team_a_score, 0) AS a_score,
+        COALESCE(m.team_b_score, 0) AS b_score,
+        COALESCE(mp.bad_map_score, 0) AS bad_map_score,
+        COALESCE(mp.a_wins, 0) AS a_wins,
+        COALESCE(mp.b_wins, 0) AS b_wins,
+        (
+            UPPER(COALESCE(m.match_type, '')) = 'SHOWMATCH'
+            OR COALESCE(m.match_name, '') LIKE '%showmatch%'
+            OR COALESCE(m.tournament, '') LIKE '%showmatch%'
+        ) AS is_showmatch
+    FROM Matches m
+    LEFT JOIN map_agg mp ON mp.match_id = m.match_id
+    LEFT JOIN ps_agg ps ON ps.match_id = m.match_id
+),
+flags AS (
+    SELECT
+        match_id,
+        map_count = 0 AS no_maps,
+        missing_scores > 0 AS maps_missing_scores,
+        ps_count = 0 AS no_player_stats,
+        map_count > 0 AND ps_count = 0 AS maps_no_player_stats,
+        (
+            -- VCT series never end in a (non-zero) draw
+            (a_score = b_score AND a_score > 0)
+            -- Winners can't take a series with a single map, except showmatches (BO1)
+            OR (MAX(a_score, b_score) > 0 AND MAX(a_score, b_score) < 2 AND NOT is_showmatch)
+            OR (map_count > 0 AND bad_map_score)
+            -- If the maps look sane, the series score should equal the map wins
+            OR (
+                map_count > 0 AND NOT bad_map_score
+                AND a_wins + b_wins >= 2
+                AND (a_wins != a_score OR b_wins != b_score)
+            )
+        ) AS bad_match_scores
+    FROM scan
+)
+SELECT match_id, no_maps, maps_missing_scores, no_player_stats, maps_no_player_stats, bad_match_scores
+FROM flags
+WHERE no_maps OR maps_missing_scores OR no_player_stats OR maps_no_player_stats OR bad_match_scores
+ORDER BY match_id
+"""
 
 
 def find_incomplete_matches() -> Dict[str, List[int]]:
     """
     Scan the database for matches that are missing core data.
 
-    Returns a dict with:
+    All checks run as one grouped query (see _SCAN_SQL) rather than a handful
+    of queries per match.
+
+    Returns a dict with (match IDs ascending, each listed once per bucket):
       - 'no_maps': Matches with zero Maps rows
       - 'maps_missing_scores': Maps rows with NULL/empty scores
       - 'no_player_stats': Matches with zero Player_Stats rows
       - 'maps_no_player_stats': Matches with maps but zero Player_Stats rows
+      - 'bad_match_scores': Non-zero draws, single-map wins outside showmatches,
+        impossible map scores, or series scores that disagree with map wins
     """
     conn = get_conn()
-    cur = conn.cursor()
-
-    problems = {
-        "no_maps": [],
-        "maps_missing_scores": [],
-        "no_player_stats": [],
-        "maps_no_player_stats": [],
-        "bad_match_scores": [],  # e.g. 1–1 series or mismatch vs map wins
-    }
-
-    # All match_ids in DB
-    cur.execute("SELECT match_id FROM Matches")
-    all_match_ids = [row[0] for row in cur.fetchall()]
-
-    for mid in all_match_ids:
-        # Maps existence
-        cur.execute("SELECT COUNT(*) FROM Maps WHERE match_id = ?", (mid,))
-        map_count = cur.fetchone()[0] or 0
-
-        # Player stats existence
-        cur.execute("SELECT COUNT(*) FROM Player_Stats WHERE match_id = ?", (mid,))
-        ps_count = cur.fetchone()[0] or 0
-
-        # Maps with missing scores
-        cur.execute(
-            """
-            SELECT COUNT(*) 
-            FROM Maps 
-            WHERE match_id = ? 
-              AND (team_a_score IS NULL OR team_b_score IS NULL)
-            """,
-            (mid,),
-        )
-        maps_missing_scores = cur.fetchone()[0] or 0
-
-        if map_count == 0:
-            problems["no_maps"].append(mid)
-        if maps_missing_scores > 0:
-            problems["maps_missing_scores"].append(mid)
-        if ps_count == 0:
-            problems["no_player_stats"].append(mid)
-        if map_count > 0 and ps_count == 0:
-            problems["maps_no_player_stats"].append(mid)
-
-        # Check for obviously bad match scores:
-        #  - series cannot end 1–1 (or any non-zero draw)
-        #  - winners should not have only 1 map (user requirement: teams cannot win by 1 or 0 maps)
-        #  - series total rounds can't realistically sum to 1 or 4
-        #  - series score should generally equal number of map wins
-        cur.execute(
-            "SELECT team_a_score, team_b_score FROM Matches WHERE match_id = ?", (mid,)
-        )
-        row = cur.fetchone()
-        if row:
-            a_score, b_score = row
-            # Treat NULL as 0 for this check
-            a_score = a_score or 0
-            b_score = b_score or 0
-
-            # Flag ALL non-zero draws as bad - VCT matches never end in draws
-            # Every match is played to completion (2-0, 2-1, 3-0, 3-1, 3-2, etc.)
-            if a_score == b_score and a_score > 0:
-                problems["bad_match_scores"].append(mid)
-
-            # Flag any series where the winner has only 1 map as wrong
-            # EXCEPT for showmatches, which are typically only 1 map (BO1)
-            max_score = max(a_score, b_score)
-            if max_score > 0 and max_score < 2:
-                # Check if this is a showmatch - check match_type field first, then fallback to name/tournament
-                cur.execute("SELECT match_name, tournament, match_type FROM Matches WHERE match_id = ?", (mid,))
-                match_info = cur.fetchone()
-                if match_info:
-                    match_type = (match_info[2] or '').upper() if len(match_info) > 2 else ''
-                    # Check match_type field first (most reliable)
-                    is_showmatch = match_type == 'SHOWMATCH'
-                    if not is_showmatch:
-                        # Fallback: check match_name and tournament fields
-                        match_name = (match_info[0] or '').lower()
-                        tournament = (match_info[1] or '').lower()
-                        is_showmatch = 'showmatch' in match_name or 'showmatch' in tournament
-                    if not is_showmatch:
-                        problems["bad_match_scores"].append(mid)
-                else:
-                    problems["bad_match_scores"].append(mid)
-
-            # Compare against map wins if we have maps with scores
-            if map_count > 0:
-                cur.execute(
-                    """
-                    SELECT team_a_score, team_b_score
-                    FROM Maps
-                    WHERE match_id = ?
-                      AND team_a_score IS NOT NULL
-                      AND team_b_score IS NOT NULL
-                    """,
-                    (mid,),
-                )
-                map_rows = cur.fetchall()
-                if map_rows:
-                    # Check for impossible map-level scores
-                    # Note: 12-12 is an intermediate overtime score, not a final score
-                    # Final scores in overtime will be higher (e.g., 15-17)
-                    bad_map_score = False
-                    for ta, tb in map_rows:
-                        ta = ta or 0
-                        tb = tb or 0
-                        total = ta + tb
-                        # Only flag clearly invalid scores:
-                        # - Very low totals (1, 4) that are impossible
-                        # - Low draws (< 10) that are invalid (but allow 12-12 and 13-13+ which can be legitimate)
-                        # Note: 12-12 might be valid in some edge cases, so we're more lenient
-                        if total in (1, 4) or (ta == tb and ta > 0 and ta < 10):
-                            bad_map_score = True
-                            break
-
-                    if bad_map_score:
-                        problems["bad_match_scores"].append(mid)
-                    else:
-                        # Only compare aggregate series score vs map wins if individual maps look sane
-                        a_wins = sum(1 for ta, tb in map_rows if (ta or 0) > (tb or 0))
-                        b_wins = sum(1 for ta, tb in map_rows if (tb or 0) > (ta or 0))
-                        if a_wins + b_wins >= 2:
-                            if a_wins != a_score or b_wins != b_score:
-                                problems["bad_match_scores"].append(mid)
-
-    conn.close()
+    try:
+        rows = conn.execute(_SCAN_SQL).fetchall()
+    finally:
+        conn.close()
+
+    problems: Dict[str, List[int]] = {bucket: [] for bucket in PROBLEM_BUCKETS}
+    for mid, *flags in rows:
+        for bucket, flagged in zip(PROBLEM_BUCKETS, flags):
+            if flagged:
+                problems[bucket].append(mid)
     return problems
 
 
@@ -189,11 +168,16 @@ def print_report(problems: Dict[str, List[int]]) -> None:
     preview("Bad match scores", problems["bad_match_scores"])
 
 
-def rescrape_matches(match_ids: List[int], batch_size: int = 25) -> None:
+def rescrape_matches(match_ids: List[int], concurrency: int = HTTP_CONCURRENCY) -> None:
     """
-    Rescrape a list of match_ids using the existing ingest() pipeline.
+    Rescrape a list of match_ids through the ingestion job queue.
 
-    This will re-fetch each match page and upsert Maps + Player_Stats.
+    This will re-fetch each match page and upsert Maps + Player_Stats. Jobs are
+    durable, so an interrupted run can be finished with `python -m loadDB.cli worker`.
+
+    Args:
+        match_ids: Matches to rescrape
+        concurrency: Jobs fetched and parsed at once
     """
     if not match_ids:
         print("No matches to rescrape.")
@@ -203,17 +187,16 @@ def rescrape_matches(match_ids: List[int], batch_size: int = 25) -> None:
     print(f"RESCRAPING {len(match_ids)} MATCHES")
     print("=" * 70)
 
-    total_batches = (len(match_ids) + batch_size - 1) // batch_size
-    for i in range(0, len(match_ids), batch_size):
-        batch = match_ids[i : i + batch_size]
-        batch_num = i // batch_size + 1
-        print(f"  Batch {batch_num}/{total_batches}: {len(batch)} matches -> {batch}")
-        try:
-            # match_type=None so vlr_ingest auto-detects VCT / SHOWMATCH
-            ingest(batch, match_type=None)
-            print("    [OK] Ingested batch")
-        except Exception as e:
-            print(f"    [ERROR] Failed to ingest batch: {e}")
+    # match_type=None so the pipeline auto-detects VCT / SHOWMATCH.
+    # The DB rows are what's broken, so rewrite even if the page is unchanged.
+    result = asyncio.run(
+        ingest_via_queue(match_ids, match_type=None, source="validate_and_rescrape", reparse=True, concurrency=concurrency)
+    )
+    print(f"  [OK] Rescraped {result.success_count} matches ({result.error_count} failed)")
+    for error in result.errors[:5]:
+        print(f"    - {error}")
+    if result.success_count > 0:
+        run_pending()
 
 
 def main():
@@ -231,6 +214,12 @@ def main():
         default=0,
         help="Optional limit on number of bad matches to rescrape (0 = no limit).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=HTTP_CONCURRENCY,
+        help="Matches rescraped concurrently (default: HTTP_CONCURRENCY).",
+    )
     args = parser.parse_args()
 
     problems = find_incomplete_matches()
@@ -260,7 +249,7 @@ def main():
         print("No incomplete matches found. Nothing to fix.")
         return
 
-    rescrape_matches(all_bad)
+    rescrape_matches(all_bad, concurrency=args.concurrency)
 
 
 if __name__ == "__main__":
@@ -94,10 +94,28 @@ def classify_vct_tournament(name: str, year: int) -> Optional[Dict[str, str]]:
     }
 
 
-async def scrape_vct_tournaments(vct_url: str) -> List[Dict[str, str]]:
+async def scrape_vct_tournaments(vct_url: str, session: Optional[aiohttp.ClientSession] = None) -> List[Dict[str, str]]:
     """
     Scrape all tournament event URLs from a VCT year page (e.g., vct-2024, vct-2025).
     
+    Args:
+        vct_url: VCT hub URL
+        session: Optional shared aiohttp session (a new one is opened if omitted)
+    
+    Returns list of dicts with 'name', 'url', 'event_id'
+    """
+    if session is not None:
+        html = await fetch_html(session, vct_url)
+    else:
+        async with aiohttp.ClientSession() as own_session:
+            html = await fetch_html(own_session, vct_url)
+    return parse_vct_tournaments(html)
+
+
+def parse_vct_tournaments(html: str) -> List[Dict[str, str]]:
+    """
+    Parse all tournament event links from a VCT year page.
+    
     Uses multiple strategies to find all tournament links, including:
     - Direct event links
     - Links in event cards/containers
@@ -105,9 +123,6 @@ async def scrape_vct_tournaments(vct_url: str) -> List[Dict[str, str]]:
     
     Returns list of dicts with 'name', 'url', 'event_id'
     """
-    async with aiohttp.ClientSession() as session:
-        html = await fetch_html(session, vct_url)
-    
     soup = BeautifulSoup(html, 'html.parser')
     tournaments = []
     seen_event_ids = set()
@@ -231,11 +246,16 @@ async def get_vct_target_events() -> List[Dict[str, object]]:
       - expected_matches / expected_showmatches (if known, else None)
     """
     targets: List[Dict[str, object]] = []
+    hubs = [(2024, "https://www.vlr.gg/vct-2024"), (2025, "https://www.vlr.gg/vct-2025")]
+
+    # Fetch both hubs concurrently over one session
+    async with aiohttp.ClientSession() as session:
+        hub_tournaments = await asyncio.gather(
+            *(scrape_vct_tournaments(vct_url, session=session) for _, vct_url in hubs)
+        )
 
-    for year, vct_url in [(2024, "https://www.vlr.gg/vct-2024"), (2025, "https://www.vlr.gg/vct-2025")]:
-        print(f"Discovering VCT {year} tournaments from {vct_url}...")
-        tournaments = await scrape_vct_tournaments(vct_url)
-        print(f"  Found {len(tournaments)} tournaments in VCT {year}")
+    for (year, vct_url), tournaments in zip(hubs, hub_tournaments):
+        print(f"Discovered {len(tournaments)} tournaments in VCT {year} from {vct_url}")
 
         for t in tournaments:
             cls = classify_vct_tournament(t["name"], year)
@@ -303,16 +323,26 @@ def detect_showmatch(match_name: str, tournament_name: str = '') -> bool:
 
 
 async def scrape_all_vct_matches(vct_2024_url: str = "https://www.vlr.gg/vct-2024",
-                                 vct_2025_url: str = "https://www.vlr.gg/vct-2025") -> Dict[str, List[Tuple[int, str]]]:
+                                 vct_2025_url: str = "https://www.vlr.gg/vct-2025",
+                                 restart: bool = False) -> Dict[str, List[Tuple[int, str]]]:
     """
     Scrape all match IDs from all tournaments in VCT 2024 and 2025.
     
+    Uses the concurrent frontier crawler (crawler.SeasonCrawler): hubs, events and
+    listings are fetched in parallel through the shared rate limiter, events and
+    matches are deduplicated, and an interrupted crawl resumes where it stopped.
+    
+    Args:
+        vct_2024_url: VCT 2024 hub URL
+        vct_2025_url: VCT 2025 hub URL
+        restart: Ignore persisted crawl progress and start from the hubs
+    
     Returns dict with keys:
     - 'vct_2024': List of (match_id, tournament_name) tuples
     - 'vct_2025': List of (match_id, tournament_name) tuples
     - 'showmatches': List of (match_id, tournament_name) tuples
     """
-    from .tournament_scraper import scrape_tournament_match_ids
+    from .crawler import SeasonCrawler
     
     results = {
         'vct_2024': [],
@@ -320,61 +350,30 @@ async def scrape_all_vct_matches(vct_2024_url: str = "https://www.vlr.gg/vct-202
         'showmatches': []
     }
     
-    # Scrape VCT 2024 tournaments
-    print(f"Scraping VCT 2024 tournaments from {vct_2024_url}...")
-    vct_2024_tournaments = await scrape_vct_tournaments(vct_2024_url)
-    print(f"Found {len(vct_2024_tournaments)} tournaments in VCT 2024")
+    print(f"Crawling VCT hubs: {vct_2024_url}, {vct_2025_url}...")
+    crawl = await SeasonCrawler({2024: vct_2024_url, 2025: vct_2025_url}).crawl(restart=restart)
+    print(f"Found {len(crawl.events)} tournaments ({crawl.fetched} page fetch(es) this run)")
     
-    for i, tournament in enumerate(vct_2024_tournaments, 1):
-        print(f"  [{i}/{len(vct_2024_tournaments)}] Scraping {tournament['name']}...")
-        try:
-            # Try scraping with completed_only first
-            match_ids = await scrape_tournament_match_ids(tournament['url'], completed_only=True)
-            
-            # Also try without completed_only filter to catch any we might have missed
-            # (but only add new ones)
-            all_match_ids = await scrape_tournament_match_ids(tournament['url'], completed_only=False)
-            additional = [mid for mid in all_match_ids if mid not in match_ids]
-            if additional:
-                print(f"    Found {len(additional)} additional matches (checking if completed)...")
-                # Verify these are actually completed by checking a sample
-                # For now, include them but they'll be filtered during ingestion if not completed
-                match_ids.extend(additional[:10])  # Limit to avoid too many false positives
-            
-            for match_id in match_ids:
-                results['vct_2024'].append((match_id, tournament['name']))
-            print(f"    Found {len(match_ids)} matches")
-        except Exception as e:
-            print(f"    Error: {e}")
-            import traceback
-            traceback.print_exc()
+    by_event: Dict[str, List[Dict[str, object]]] = {}
+    for m in crawl.matches:
+        by_event.setdefault(m['event_id'], []).append(m)
     
-    # Scrape VCT 2025 tournaments
-    print(f"\nScraping VCT 2025 tournaments from {vct_2025_url}...")
-    vct_2025_tournaments = await scrape_vct_tournaments(vct_2025_url)
-    print(f"Found {len(vct_2025_tournaments)} tournaments in VCT 2025")
+    for event in crawl.events:
+        matches = by_event.get(event['event_id'], [])
+        match_ids = [m['match_id'] for m in matches if m['completed']]
+        # Listing entries without a detected score may still be completed; include a
+        # bounded number (they'll be filtered during ingestion if not completed)
+        additional = [m['match_id'] for m in matches if not m['completed']]
+        match_ids.extend(additional[:10])  # Limit to avoid too many false positives
+        key = f"vct_{event['season']}"
+        if key not in results:
+            continue
+        for match_id in match_ids:
+            results[key].append((match_id, event['name']))
+        print(f"  {event['season']} {event['name']}: {len(match_ids)} matches")
     
-    for i, tournament in enumerate(vct_2025_tournaments, 1):
-        print(f"  [{i}/{len(vct_2025_tournaments)}] Scraping {tournament['name']}...")
-        try:
-            # Try scraping with completed_only first
-            match_ids = await scrape_tournament_match_ids(tournament['url'], completed_only=True)
-            
-            # Also try without completed_only filter to catch any we might have missed
-            all_match_ids = await scrape_tournament_match_ids(tournament['url'], completed_only=False)
-            additional = [mid for mid in all_match_ids if mid not in match_ids]
-            if additional:
-                print(f"    Found {len(additional)} additional matches (checking if completed)...")
-                # Include additional matches (will be verified during ingestion)
-                match_ids.extend(additional[:10])  # Limit to avoid too many false positives
-            
-            for match_id in match_ids:
-                results['vct_2025'].append((match_id, tournament['name']))
-            print(f"    Found {len(match_ids)} matches")
-        except Exception as e:
-            print(f"    Error: {e}")
-            import traceback
-            traceback.print_exc()
+    for err in crawl.errors:
+        print(f"    Error: {err}")
     
     return results
 
@@ -0,0 +1,120 @@
+"""
+Map veto parsing.
+
+VLR's match header note holds the veto as one string, stored verbatim in
+Matches.bans_picks:
+
+    "FUR ban Sunset; NRG ban Bind; FUR pick Breeze; NRG pick Ascent; ...; Split remains"
+
+Ingestion parses it once into Vetoes(match_id, veto_order, team_key, action,
+map), one row per step, so per-team ban/pick counts are an indexed GROUP BY
+on (team_key, action) instead of re-parsing every string per request.
+
+- action: "ban", "pick" or "decider" (the "<map> remains" step, team_key NULL)
+- team_key: canonical key of the team (normalizers.team.team_key). Veto
+  strings use short tags ("FUR", "100T"); a tag that doesn't resolve to
+  either team of the match is assigned the team the other tag didn't take.
+- map: normalized map name (normalize_map)
+"""
+import re
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from .normalizers.map import normalize_map
+from .normalizers.team import team_key
+
+_STEP_RE = re.compile(r"^(?P<team>.+?)\s+(?P<action>ban|pick)\s+(?P<map>.+)$", re.IGNORECASE)
+_DECIDER_RE = re.compile(r"^(?P<map>.+?)\s+remains$", re.IGNORECASE)
+
+
+def parse_bans_picks(text: Optional[str]) -> List[Tuple[Optional[str], str, str]]:
+    """
+    Split a veto string into (team tag, action, map) steps, in order.
+
+    Unrecognized steps are skipped; the decider has a None team.
+    """
+    steps: List[Tuple[Optional[str], str, str]] = []
+    for part in (text or "").split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        m = _DECIDER_RE.match(part)
+        if m:
+            steps.append((None, "decider", normalize_map(m.group("map"))))
+            continue
+        m = _STEP_RE.match(part)
+        if m:
+            steps.append((m.group("team").strip(), m.group("action").lower(), normalize_map(m.group("map"))))
+    return steps
+
+
+def resolve_team_keys(
+    tags: Iterable[Optional[str]],
+    team_a: Optional[str],
+    team_b: Optional[str],
+) -> dict:
+    """
+    Map each veto tag to a canonical team key, using the match's two teams.
+
+    Returns:
+        Dictionary tag -> team key (tags whose key is unknown map to their own key)
+    """
+    match_keys = [k for k in (team_key(team_a), team_key(team_b)) if k]
+    resolved = {tag: team_key(tag) for tag in tags if tag}
+    unresolved = [tag for tag, key in resolved.items() if key not in match_keys]
+    taken = {key for key in resolved.values() if key in match_keys}
+    if len(unresolved) == 1 and len(match_keys) == 2 and len(taken) == 1:
+        resolved[unresolved[0]] = next(k for k in match_keys if k not in taken)
+    return resolved
+
+
+def replace_vetoes(
+    conn: sqlite3.Connection,
+    match_id: int,
+    bans_picks: Optional[str],
+    team_a: Optional[str],
+    team_b: Optional[str],
+) -> int:
+    """
+    Replace a match's Vetoes rows with the parsed veto string (caller commits).
+
+    Returns:
+        Number of veto rows written
+    """
+    steps = parse_bans_picks(bans_picks)
+    keys = resolve_team_keys((tag for tag, _, _ in steps), team_a, team_b)
+    conn.execute("DELETE FROM Vetoes WHERE match_id = ?", (match_id,))
+    conn.executemany(
+        "INSERT INTO Vetoes (match_id, veto_order, team_key, action, map) VALUES (?, ?, ?, ?, ?)",
+        [
+            (match_id, order, keys.get(tag) or None, action, map_name)
+            for order, (tag, action, map_name) in enumerate(steps, start=1)
+        ],
+    )
+    return len(steps)
+
+
+def update_vetoes(conn: sqlite3.Connection, match_ids: Optional[List[int]] = None) -> int:
+    """
+    Re-parse Matches.bans_picks into Vetoes (caller commits).
+
+    Args:
+        conn: Database connection
+        match_ids: Optional subset of matches (default: every match with a veto string)
+
+    Returns:
+        Number of matches whose vetoes were rebuilt
+    """
+    sql = (
+        "SELECT match_id, bans_picks, team_a, team_b FROM Matches "
+        "WHERE bans_picks IS NOT NULL AND bans_picks != ''"
+    )
+    rows = conn.execute(sql).fetchall()
+    if match_ids is None:
+        conn.execute("DELETE FROM Vetoes")
+    else:
+        wanted = set(match_ids)
+        rows = [r for r in rows if r[0] in wanted]
+    for match_id, text, team_a, team_b in rows:
+        replace_vetoes(conn, match_id, text, team_a, team_b)
+    return len(rows)
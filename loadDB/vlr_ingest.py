@@ -41,7 +41,9 @@ async def scrape_match(match_id_or_url: str | int):
 async def ingest_matches(
     ids_or_urls: List[str | int],
     match_type: Optional[str] = None,
-    validate: bool = True
+    validate: bool = True,
+    skip_complete: bool = False,
+    skip_unchanged: bool = True
 ) -> None:
     """
     Ingest matches from vlr.gg into the database (backward compatibility wrapper).
@@ -53,6 +55,8 @@ async def ingest_matches(
         match_type: Optional match type classification (VCT, VCL, OFFSEASON)
                    Note: SHOWMATCH is not allowed - showmatches are automatically skipped
         validate: If True, validate data before inserting (default: True)
+        skip_complete: If True, don't refetch matches that are already completely ingested
+        skip_unchanged: If True, don't re-parse/rewrite refetched pages whose content hash is unchanged
     """
     # Reject SHOWMATCH match type
     if match_type and match_type.upper() == 'SHOWMATCH':
@@ -70,26 +74,45 @@ async def ingest_matches(
             urls.append(str(item))
     
     # Use new pipeline (automatically skips showmatches)
-    result = await _ingest_from_urls(urls, validate=validate, match_type=match_type)
+    result = await _ingest_from_urls(
+        urls,
+        validate=validate,
+        match_type=match_type,
+        skip_complete=skip_complete,
+        skip_unchanged=skip_unchanged,
+    )
     
     # Print results for backward compatibility
     if result.success_count > 0 or result.error_count > 0:
         print(f"Ingestion complete: {result.success_count} successful, {result.error_count} errors")
+    if result.complete_count > 0:
+        print(f"Already complete (fetch avoided): {result.complete_count}")
     
-    # Automatically recalculate ELO snapshots for 2026 and all-time after ingestion
+    # Recalculate ELO snapshots after ingestion (once per deferred() block, see recompute)
     if result.success_count > 0:
-        print("\nRecalculating ELO snapshots...")
-        from .elo import compute_elo_snapshots
-        compute_elo_snapshots()
+        from .recompute import after_ingest
+        after_ingest()
 
 
 # Backward compatibility: provide synchronous ingest function
-def ingest(ids_or_urls: List[str | int], match_type: Optional[str] = None) -> None:
+def ingest(
+    ids_or_urls: List[str | int],
+    match_type: Optional[str] = None,
+    skip_complete: bool = False,
+    skip_unchanged: bool = True,
+) -> None:
     """
     Synchronous wrapper for ingest_matches (backward compatibility).
     
     Args:
         ids_or_urls: List of match IDs (integers) or URLs (strings)
         match_type: Optional match type classification (VCT, VCL, OFFSEASON, SHOWMATCH)
+        skip_complete: If True, don't refetch matches that are already completely ingested
+        skip_unchanged: If True, don't re-parse/rewrite refetched pages whose content hash is unchanged
     """
-    asyncio.run(ingest_matches(ids_or_urls, match_type))
+    asyncio.run(ingest_matches(
+        ids_or_urls,
+        match_type,
+        skip_complete=skip_complete,
+        skip_unchanged=skip_unchanged,
+    ))
@@ -35,7 +35,7 @@ def main():
     args = Args()
     
     # Import and run the remove-showmatches logic
-    from loadDB.db_utils import get_conn
+    from loadDB.db_utils import get_conn, ensure_matches_columns
     from loadDB.normalizers.team import normalize_team
     import sqlite3
     
@@ -73,6 +73,7 @@ def main():
         return False
     
     conn = get_conn()
+    ensure_matches_columns(conn)
     cur = conn.cursor()
     
     # Comprehensive showmatch detection
@@ -118,6 +119,8 @@ def main():
         cur.execute(f"DELETE FROM Maps WHERE match_id IN ({placeholders})", match_ids_list)
         maps_deleted = cur.rowcount
         
+        cur.execute(f"DELETE FROM Vetoes WHERE match_id IN ({placeholders})", match_ids_list)
+        
         cur.execute(f"DELETE FROM Matches WHERE match_id IN ({placeholders})", match_ids_list)
         matches_deleted = cur.rowcount
         
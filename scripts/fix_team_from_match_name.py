@@ -57,6 +57,8 @@ def main():
     conn.close()
 
     print(f"Processed {len(rows)} candidate matches; relabeled {len(updates)}")
+    if updates:
+        print("Team names changed; refresh team keys with: python -m loadDB.cli backfill team-keys")
     if updates:
         print("Sample updates (match_id, old_a, old_b, new_a, new_b):")
         for item in updates[:10]:
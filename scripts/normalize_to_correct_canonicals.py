@@ -64,6 +64,7 @@ def normalize_team_names():
     
     db.close()
     print("\nNormalization complete!")
+    print("Team names changed; refresh team keys with: python -m loadDB.cli backfill team-keys")
 
 if __name__ == "__main__":
     normalize_team_names()
@@ -124,6 +124,7 @@ def main():
     conn.commit()
     conn.close()
     print("Relabel complete.")
+    print("Team names changed; refresh team keys with: python -m loadDB.cli backfill team-keys")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 """Re-scrape matches to update scores, maps, and player stats"""
 import asyncio
 import sqlite3
-from loadDB.db_utils import get_conn, upsert_match, upsert_maps, upsert_player_stats
+from loadDB.db_utils import get_conn, ensure_matches_columns, upsert_match, upsert_maps, upsert_player_stats
 from loadDB.vlr_ingest import scrape_match
 
 async def update_match_scores():
     """Re-scrape matches that have 0-0 scores to get actual scores"""
     conn = get_conn()
+    ensure_matches_columns(conn)
     cur = conn.cursor()
     
     # Find matches with 0-0 scores